@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark das estatísticas de agendamentos e serviços
+
+Popula um banco SQLite temporário com N agendamentos (1k a 1M) e mede a
+latência de get_agendamentos_estatisticas() e get_servicos_estatisticas().
+Os totais por status vêm da tabela de contadores e os de hoje/semana de uma
+busca por intervalo no índice de data, então o tempo não cresce com N.
+Com --antes, mede também a abordagem anterior (carregar todos os objetos),
+apenas até 100k linhas.
+
+Uso: python benchmarks/bench_estatisticas.py [--tamanhos 1000,10000] [--antes]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+from src.model.migrations import aplicar_migracoes, init_migrate
+from src.model.models import db, Agendamento, Servico
+
+STATUS = ['Agendado', 'Confirmado', 'Em Andamento', 'Concluído', 'Cancelado']
+CATEGORIAS = ['Banho', 'Tosa', 'Veterinário', 'Hospedagem', 'Outros']
+LOTE = 50000
+
+def criar_app(caminho):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{caminho}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    init_migrate(app, db)
+    return app
+
+def popular(total):
+    """Insere serviços e agendamentos em lote (executemany), espalhados em ±1 ano"""
+    rnd = random.Random(42)
+    db.session.execute(insert(Servico), [
+        {'nome': f'Serviço {i}', 'categoria': CATEGORIAS[i % len(CATEGORIAS)],
+         'preco': 50.0, 'duracao_estimada': 60, 'ativo': i % 7 != 0}
+        for i in range(200)
+    ])
+    agora = datetime.now().replace(minute=0, second=0, microsecond=0)
+    for inicio in range(0, total, LOTE):
+        db.session.execute(insert(Agendamento), [
+            {'data_agendamento': agora + timedelta(hours=rnd.randint(-8760, 8760)),
+             'status': rnd.choice(STATUS), 'cliente_id': 1, 'pet_id': 1,
+             'servico_id': rnd.randint(1, 200)}
+            for _ in range(min(LOTE, total - inicio))
+        ])
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+def estatisticas_antes():
+    """Abordagem anterior: carrega todos os agendamentos para contar em Python"""
+    agendamentos = Agendamento.query.all()
+    contagem = {}
+    for agendamento in agendamentos:
+        contagem[agendamento.status] = contagem.get(agendamento.status, 0) + 1
+    db.session.expunge_all()
+    return len(agendamentos), contagem
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default='1000,10000,100000,1000000')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--antes', action='store_true')
+    args = parser.parse_args()
+
+    from src.model.services.agendamento_service import AgendamentoService
+    from src.model.services.servico_service import ServicoService
+
+    print(f"{'linhas':>10} {'agendamentos (ms)':>18} {'serviços (ms)':>14} {'antes (ms)':>11}")
+    for total in (int(valor) for valor in args.tamanhos.split(',')):
+        with tempfile.TemporaryDirectory() as pasta:
+            app = criar_app(os.path.join(pasta, 'bench.db'))
+            with app.app_context():
+                db.create_all()
+                # Triggers criados antes da carga: as inserções já atualizam os contadores
+                aplicar_migracoes()
+                popular(total)
+
+                agendamentos_ms = medir(AgendamentoService().get_agendamentos_estatisticas, args.repeticoes)
+                servicos_ms = medir(ServicoService().get_servicos_estatisticas, args.repeticoes)
+                antes = '-'
+                if args.antes and total <= 100000:
+                    antes = f'{medir(estatisticas_antes, 1):.1f}'
+                print(f'{total:>10} {agendamentos_ms:>18.2f} {servicos_ms:>14.2f} {antes:>11}')
+                db.session.remove()
+                db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
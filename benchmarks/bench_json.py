@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização JSON de respostas com muitas linhas
+
+Carrega N agendamentos de um banco SQLite temporário e mede o tempo para
+montar a resposta JSON (sem a consulta) de três formas:
+  antes       to_dict() de cada objeto + provider padrão do Flask (json)
+  json        serializer do modelo + JSONProvider sem orjson (fallback)
+  orjson      serializer do modelo + JSONProvider com orjson
+
+Uso: python benchmarks/bench_json.py [--tamanhos 1000,10000] [--repeticoes 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from bench_estatisticas import criar_app, popular
+from src.controller import json_provider
+from src.controller.json_provider import JSONProvider
+from src.model.models import db, Agendamento
+from src.model.serializers import serialize
+
+def medir(funcao, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resposta = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, len(resposta.get_data())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default='1000,10000')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    orjson = json_provider.orjson
+    if orjson is None:
+        print('orjson não instalado: a linha orjson repete o fallback')
+
+    print(f"{'linhas':>8} {'forma':>8} {'tempo (ms)':>11} {'bytes':>10}")
+    for total in (int(valor) for valor in args.tamanhos.split(',')):
+        with tempfile.TemporaryDirectory() as pasta:
+            app = criar_app(os.path.join(pasta, 'bench.db'))
+            with app.test_request_context():
+                db.create_all()
+                popular(total)
+                agendamentos = Agendamento.query.order_by(Agendamento.data_agendamento, Agendamento.id).all()
+
+                padrao, provider = DefaultJSONProvider(app), JSONProvider(app)
+                formas = {
+                    'antes': lambda: padrao.response([a.to_dict() for a in agendamentos]),
+                    'json': lambda: provider.response([serialize(a) for a in agendamentos]),
+                    'orjson': lambda: provider.response([serialize(a) for a in agendamentos]),
+                }
+                for nome, funcao in formas.items():
+                    json_provider.orjson = None if nome == 'json' else orjson
+                    tempo, tamanho = medir(funcao, args.repeticoes)
+                    print(f'{total:>8} {nome:>8} {tempo:>11.1f} {tamanho:>10}')
+                json_provider.orjson = orjson
+                db.session.remove()
+                db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark das listagens da API: objetos do ORM x DTOs de um select() Core
+
+Popula um banco SQLite temporário com N agendamentos e N pets e monta uma
+página de N linhas de /api/agendamentos e de /api/pets (consulta +
+serialização + JSON) de duas formas:
+  orm   Query do ORM com keyset_page, como antes (identity map, estado)
+  dto   get_page() dos repositórios: apenas as colunas, em AgendamentoDTO/PetDTO
+Mostra o melhor tempo e a memória alocada por linha ao carregar a página
+(tracemalloc, com a sessão ainda aberta como durante a requisição).
+
+Uso: python benchmarks/bench_listagem_dto.py [--tamanhos 1000,10000] [--repeticoes 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from bench_estatisticas import criar_app, popular
+from src.controller.json_provider import JSONProvider
+from src.model.models import db, Agendamento, Cliente, Pet
+from src.model.repositories.agendamento_repository import AgendamentoRepository, PAGE_KEYS as CHAVES_AGENDAMENTO
+from src.model.repositories.pet_repository import PetRepository, PAGE_KEYS as CHAVES_PET
+from src.model.repositories.query_spec import keyset_page
+from src.model.serializers import serialize
+
+def popular_pets(total):
+    db.session.execute(insert(Cliente), [{'nome': 'Cliente', 'cpf': '000.000.000-00', 'telefone': '0'}])
+    db.session.execute(insert(Pet), [
+        {'nome': f'Pet {i}', 'especie': 'Cão', 'raca': 'SRD', 'sexo': 'Macho', 'peso': 10.5, 'cliente_id': 1}
+        for i in range(total)
+    ])
+    db.session.commit()
+
+def medir(carregar, provider, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        itens, _ = carregar()
+        provider.response([serialize(item) for item in itens])
+        melhor = min(melhor, time.perf_counter() - inicio)
+        db.session.remove()
+
+    tracemalloc.start()
+    itens, _ = carregar()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    db.session.remove()
+    return melhor * 1000, memoria / len(itens)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default='1000,10000')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} {'listagem':>13} {'forma':>6} {'tempo (ms)':>11} {'bytes/linha':>12}")
+    for total in (int(valor) for valor in args.tamanhos.split(',')):
+        with tempfile.TemporaryDirectory() as pasta:
+            app = criar_app(os.path.join(pasta, 'bench.db'))
+            with app.test_request_context():
+                db.create_all()
+                popular(total)
+                popular_pets(total)
+                provider = JSONProvider(app)
+                formas = {
+                    ('agendamentos', 'orm'): lambda: keyset_page(Agendamento.query, CHAVES_AGENDAMENTO, None, total),
+                    ('agendamentos', 'dto'): lambda: AgendamentoRepository().get_page(limit=total),
+                    ('pets', 'orm'): lambda: keyset_page(Pet.query, CHAVES_PET, None, total),
+                    ('pets', 'dto'): lambda: PetRepository().get_page(limit=total),
+                }
+                for (listagem, forma), carregar in formas.items():
+                    tempo, por_linha = medir(carregar, provider, args.repeticoes)
+                    print(f'{total:>8} {listagem:>13} {forma:>6} {tempo:>11.1f} {por_linha:>12.0f}')
+                db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
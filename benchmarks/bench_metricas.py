@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark do custo das métricas por requisição (/metrics)
+
+Mede, em microssegundos, quanto a instrumentação de src/controller/metrics.py
+acrescenta:
+  requisicao   hooks before/after/teardown de uma requisição (inclui registrar)
+  sql          listeners before/after_cursor_execute de um comando, fora e
+               dentro de uma requisição
+Os hooks e listeners são chamados diretamente, sem o test client nem o
+banco: o custo de uma requisição completa no Flask (~200 µs) ou de um
+SELECT varia mais do que a instrumentação.
+
+Uso: python benchmarks/bench_metricas.py [--repeticoes 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.controller import metrics
+from src.controller.metrics import init_metrics
+
+def por_chamada(funcao, repeticoes):
+    """Melhor média de 3 rodadas, em microssegundos"""
+    melhor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            funcao()
+        melhor = min(melhor, (time.perf_counter() - inicio) / repeticoes)
+    return melhor * 1e6
+
+def app_simples():
+    app = Flask(__name__)
+    init_metrics(app)
+    app.add_url_rule('/ping', 'ping', lambda: 'ok')
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticoes', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = app_simples()
+    hooks_antes = app.before_request_funcs[None]
+    hooks_depois = app.after_request_funcs[None]
+    hooks_fim = app.teardown_request_funcs[None]
+    with app.test_request_context('/ping'):
+        resposta = app.make_response('ok')
+
+        def requisicao():
+            for hook in hooks_antes:
+                hook()
+            for hook in hooks_depois:
+                hook(resposta)
+            for hook in hooks_fim:
+                hook(None)
+        custo_requisicao = por_chamada(requisicao, args.repeticoes)
+
+    # Os listeners recebem a conexão; só conn.info é usado
+    conexao = SimpleNamespace(info={})
+
+    def sql():
+        metrics._antes_do_sql(conexao, None, 'SELECT 1', (), None, False)
+        metrics._depois_do_sql(conexao, None, 'SELECT 1', (), None, False)
+    fora = por_chamada(sql, args.repeticoes)
+    metrics._requisicao.set([time.perf_counter(), 0, 0.0])
+    dentro = por_chamada(sql, args.repeticoes)
+    metrics._requisicao.set(None)
+
+    print(f"{'medida':>24} {'custo (µs)':>11}")
+    print(f"{'requisicao':>24} {custo_requisicao:>11.2f}")
+    print(f"{'sql (fora de requisição)':>24} {fora:>11.2f}")
+    print(f"{'sql (na requisição)':>24} {dentro:>11.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark de leituras e escritas concorrentes no SQLite: antes x depois dos PRAGMAs
+
+Roda leitores e escritores em threads sobre o mesmo banco temporário por
+alguns segundos, primeiro com o padrão do SQLite (journal de rollback,
+synchronous=FULL, pool padrão) e depois com a configuração de
+src/config.py (WAL, synchronous=NORMAL, busy_timeout, cache e mmap, pool
+maior). No modo de rollback as leituras esperam cada escrita terminar; em
+WAL leitores e o escritor não se bloqueiam.
+
+Uso: python benchmarks/bench_sqlite_concorrencia.py [--leitores 8] [--escritores 2] [--segundos 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.exc import OperationalError
+from src.config import Config
+from src.model.engine import aplicar_pragmas
+from src.model.models import db, Agendamento, Cliente, Pet, Servico
+
+LINHAS_INICIAIS = 20000
+
+PERFIS = {
+    'antes': ({}, {}),
+    'depois': (Config.SQLALCHEMY_ENGINE_OPTIONS, Config.SQLITE_PRAGMAS),
+}
+
+def preparar(engine):
+    db.metadata.create_all(engine)
+    agora = datetime.now().replace(minute=0, second=0, microsecond=0)
+    with engine.begin() as conn:
+        conn.execute(insert(Cliente), {'nome': 'Cliente', 'cpf': '000.000.000-00', 'telefone': '0'})
+        conn.execute(insert(Pet), {'nome': 'Pet', 'especie': 'Cão', 'sexo': 'Macho', 'cliente_id': 1})
+        conn.execute(insert(Servico), {'nome': 'Banho', 'categoria': 'Banho', 'preco': 50.0})
+        conn.execute(insert(Agendamento), [
+            {'data_agendamento': agora + timedelta(hours=i), 'status': 'Agendado',
+             'cliente_id': 1, 'pet_id': 1, 'servico_id': 1}
+            for i in range(LINHAS_INICIAIS)
+        ])
+
+def executar(engine, leitores, escritores, segundos):
+    fim = time.perf_counter() + segundos
+    latencias, escritas, erros = [], [0], [0]
+    lock = threading.Lock()
+    agora = datetime.now()
+
+    def ler():
+        consulta = select(func.count()).select_from(Agendamento).where(Agendamento.data_agendamento >= agora)
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(consulta).scalar()
+            except OperationalError:
+                with lock:
+                    erros[0] += 1
+                continue
+            with lock:
+                latencias.append(time.perf_counter() - inicio)
+
+    def escrever():
+        while time.perf_counter() < fim:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(Agendamento), {'data_agendamento': agora, 'status': 'Agendado',
+                                                      'cliente_id': 1, 'pet_id': 1, 'servico_id': 1})
+            except OperationalError:
+                with lock:
+                    erros[0] += 1
+                continue
+            with lock:
+                escritas[0] += 1
+
+    threads = [threading.Thread(target=ler) for _ in range(leitores)] + \
+              [threading.Thread(target=escrever) for _ in range(escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    p95 = statistics.quantiles(latencias, n=20)[-1] * 1000 if len(latencias) > 1 else float('nan')
+    return len(latencias) / segundos, escritas[0] / segundos, p95, erros[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--leitores', type=int, default=8)
+    parser.add_argument('--escritores', type=int, default=2)
+    parser.add_argument('--segundos', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{'perfil':>8} {'leituras/s':>11} {'escritas/s':>11} {'p95 leitura (ms)':>17} {'erros':>6}")
+    for nome, (opcoes, pragmas) in PERFIS.items():
+        with tempfile.TemporaryDirectory() as pasta:
+            engine = create_engine(f"sqlite:///{os.path.join(pasta, 'bench.db')}", **opcoes)
+            aplicar_pragmas(engine, pragmas)
+            preparar(engine)
+            leituras, escritas, p95, erros = executar(engine, args.leitores, args.escritores, args.segundos)
+            print(f'{nome:>8} {leituras:>11.0f} {escritas:>11.0f} {p95:>17.2f} {erros:>6}')
+            engine.dispose()
+
+if __name__ == '__main__':
+    main()
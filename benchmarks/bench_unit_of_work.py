@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escritas em série: commit por chamada x unit_of_work()
+
+Cria N clientes com um pet cada pelos services, em um banco SQLite
+temporário, primeiro com o commit de cada chamada de repositório e depois
+dentro de um único unit_of_work() (um commit no fim). A diferença é o custo
+do commit (fsync) pago a cada escrita.
+
+Uso: python benchmarks/bench_unit_of_work.py [--tamanhos 100,1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_estatisticas import criar_app
+from src.model.models import db
+
+def criar(inicio, total, agrupar):
+    from src.model.repositories.unit_of_work import unit_of_work
+    from src.model.services.cliente_service import ClienteService
+    from src.model.services.pet_service import PetService
+
+    clientes, pets = ClienteService(), PetService()
+    tempo = time.perf_counter()
+    with unit_of_work() if agrupar else nullcontext():
+        for i in range(inicio, inicio + total):
+            cliente = clientes.create_cliente(nome=f'Cliente {i}', cpf=f'{i:011d}', telefone='(11) 99999-0000',
+                                              email=None, endereco=None)
+            pets.create_pet(nome=f'Pet {i}', especie='Cão', cliente_id=cliente.id, sexo='Macho')
+    return time.perf_counter() - tempo
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', default='100,1000')
+    args = parser.parse_args()
+
+    print(f"{'clientes':>10} {'commit por chamada (s)':>23} {'unit_of_work (s)':>17} {'ganho':>7}")
+    for total in (int(valor) for valor in args.tamanhos.split(',')):
+        with tempfile.TemporaryDirectory() as pasta:
+            app = criar_app(os.path.join(pasta, 'bench.db'))
+            with app.app_context():
+                db.create_all()
+                separado = criar(0, total, agrupar=False)
+                agrupado = criar(total, total, agrupar=True)
+                print(f'{total:>10} {separado:>23.2f} {agrupado:>17.2f} {separado / agrupado:>6.1f}x')
+                db.session.remove()
+                db.engine.dispose()
+
+if __name__ == '__main__':
+    main()
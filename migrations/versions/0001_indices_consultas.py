@@ -0,0 +1,55 @@
+"""Índices para os caminhos de consulta mais usados
+
+Revision ID: 0001_indices_consultas
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+Cada índice é criado em sua própria transação (autocommit_block), de forma
+que no SQLite o lock de escrita dura apenas a construção de um índice por
+vez e leitores em modo WAL não são bloqueados. No PostgreSQL os índices são
+criados com CREATE INDEX CONCURRENTLY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_indices_consultas'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_agendamentos_funcionario_data_status', 'agendamentos', ['funcionario_id', 'data_agendamento', 'status']),
+    ('ix_agendamentos_cliente_data', 'agendamentos', ['cliente_id', 'data_agendamento']),
+    ('ix_agendamentos_pet_id', 'agendamentos', ['pet_id']),
+    ('ix_agendamentos_servico_id', 'agendamentos', ['servico_id']),
+    ('ix_agendamentos_status_data', 'agendamentos', ['status', 'data_agendamento']),
+    ('ix_agendamentos_data_id', 'agendamentos', ['data_agendamento', 'id']),
+    ('ix_pets_cliente_nome', 'pets', ['cliente_id', 'nome']),
+    ('ix_pets_ativo', 'pets', ['ativo']),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        # Esperar por locks em vez de falhar e manter leitores ativos durante a criação
+        op.execute('PRAGMA busy_timeout = 5000')
+        with op.get_context().autocommit_block():
+            op.execute('PRAGMA journal_mode = WAL')
+
+    for nome, tabela, colunas in INDICES:
+        with op.get_context().autocommit_block():
+            op.create_index(nome, tabela, colunas, if_not_exists=True, postgresql_concurrently=True)
+
+    # Atualizar as estatísticas do planejador para que os novos índices sejam usados
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.get_context().autocommit_block():
+            op.execute('ANALYZE')
+
+
+def downgrade():
+    for nome, tabela, _ in reversed(INDICES):
+        with op.get_context().autocommit_block():
+            op.drop_index(nome, table_name=tabela, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,76 @@
+"""Contadores de agendamentos por status mantidos por triggers
+
+Revision ID: 0002_contagem_status
+Revises: 0001_indices_consultas
+Create Date: 2026-10-18 14:00:00.000000
+
+A tabela agendamentos_por_status guarda o total de agendamentos de cada
+status, atualizado por triggers a cada INSERT/UPDATE/DELETE, para que as
+estatísticas não precisem varrer a tabela de agendamentos. Os triggers são
+específicos do SQLite; nos demais bancos a tabela é criada, mas a aplicação
+continua contando com GROUP BY.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_contagem_status'
+down_revision = '0001_indices_consultas'
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS = {
+    'trg_agendamentos_status_insert': """
+        CREATE TRIGGER IF NOT EXISTS trg_agendamentos_status_insert AFTER INSERT ON agendamentos
+        BEGIN
+            INSERT INTO agendamentos_por_status (status, total) VALUES (coalesce(NEW.status, ''), 1)
+            ON CONFLICT(status) DO UPDATE SET total = total + 1;
+        END
+    """,
+    'trg_agendamentos_status_delete': """
+        CREATE TRIGGER IF NOT EXISTS trg_agendamentos_status_delete AFTER DELETE ON agendamentos
+        BEGIN
+            UPDATE agendamentos_por_status SET total = total - 1 WHERE status = coalesce(OLD.status, '');
+        END
+    """,
+    'trg_agendamentos_status_update': """
+        CREATE TRIGGER IF NOT EXISTS trg_agendamentos_status_update AFTER UPDATE OF status ON agendamentos
+        WHEN coalesce(OLD.status, '') <> coalesce(NEW.status, '')
+        BEGIN
+            UPDATE agendamentos_por_status SET total = total - 1 WHERE status = coalesce(OLD.status, '');
+            INSERT INTO agendamentos_por_status (status, total) VALUES (coalesce(NEW.status, ''), 1)
+            ON CONFLICT(status) DO UPDATE SET total = total + 1;
+        END
+    """,
+}
+
+
+def upgrade():
+    op.create_table(
+        'agendamentos_por_status',
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('status'),
+        if_not_exists=True,
+    )
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # Triggers e carga inicial na mesma transação: nenhuma escrita fica de fora
+    for sql in TRIGGERS.values():
+        op.execute(sql)
+    op.execute("DELETE FROM agendamentos_por_status")
+    op.execute("""
+        INSERT INTO agendamentos_por_status (status, total)
+        SELECT coalesce(status, ''), count(*) FROM agendamentos GROUP BY 1
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for nome in reversed(list(TRIGGERS)):
+            op.execute(f'DROP TRIGGER IF EXISTS {nome}')
+    op.drop_table('agendamentos_por_status', if_exists=True)
@@ -0,0 +1,61 @@
+"""Horário de término dos agendamentos para detectar sobreposição
+
+Revision ID: 0003_data_fim_agendamento
+Revises: 0002_contagem_status
+Create Date: 2026-10-18 16:00:00.000000
+
+data_fim = data_agendamento + tempo_estimado (ou a duração do serviço, ou
+60 minutos). A verificação de conflito usa o índice
+(funcionario_id, data_fim, data_agendamento) para ler apenas os
+agendamentos que terminam depois do início pedido.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_data_fim_agendamento'
+down_revision = '0002_contagem_status'
+branch_labels = None
+depends_on = None
+
+
+DURACAO_PADRAO = 60
+
+
+def upgrade():
+    bind = op.get_bind()
+    colunas = {coluna['name'] for coluna in sa.inspect(bind).get_columns('agendamentos')}
+    if 'data_fim' not in colunas:
+        op.add_column('agendamentos', sa.Column('data_fim', sa.DateTime(), nullable=True))
+
+    duracao = ("coalesce(tempo_estimado, (SELECT duracao_estimada FROM servicos "
+               f"WHERE servicos.id = agendamentos.servico_id), {DURACAO_PADRAO})")
+    if bind.dialect.name == 'sqlite':
+        # Mesmo formato de texto usado pelo SQLAlchemy, para comparações corretas
+        op.execute(f"""
+            UPDATE agendamentos SET data_fim = strftime('%Y-%m-%d %H:%M:%S', data_agendamento,
+                '+' || {duracao} || ' minutes') || '.000000'
+            WHERE data_fim IS NULL
+        """)
+    else:
+        op.execute(f"""
+            UPDATE agendamentos SET data_fim = data_agendamento + {duracao} * interval '1 minute'
+            WHERE data_fim IS NULL
+        """)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_agendamentos_funcionario_fim', 'agendamentos',
+                        ['funcionario_id', 'data_fim', 'data_agendamento'],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_agendamentos_funcionario_fim', table_name='agendamentos',
+                      if_exists=True, postgresql_concurrently=True)
+    if op.get_bind().dialect.name == 'sqlite':
+        # DROP COLUMN nativo (SQLite 3.35+): recriar a tabela descartaria os triggers de 0002
+        op.execute('ALTER TABLE agendamentos DROP COLUMN data_fim')
+    else:
+        op.drop_column('agendamentos', 'data_fim')
@@ -0,0 +1,33 @@
+"""Versões das tabelas para as ETags da API
+
+Revision ID: 0004_versoes_tabelas
+Revises: 0003_data_fim_agendamento
+Create Date: 2026-10-18 18:00:00.000000
+
+A aplicação incrementa a versão de cada tabela alterada na mesma transação
+da escrita (VersaoRepository), para que todos os processos calculem a
+mesma ETag e vejam a mudança assim que ela for confirmada.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_versoes_tabelas'
+down_revision = '0003_data_fim_agendamento'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'versoes_tabelas',
+        sa.Column('tabela', sa.String(length=64), nullable=False),
+        sa.Column('versao', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tabela'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('versoes_tabelas', if_exists=True)
@@ -0,0 +1,57 @@
+"""CPF dos clientes no formato 000.000.000-00
+
+Revision ID: 0005_normalizar_cpf
+Revises: 0004_versoes_tabelas
+Create Date: 2026-10-18 19:00:00.000000
+
+Cadastro, edição, importação e busca por CPF normalizam o valor antes de
+gravar ou comparar (formatar_cpf em cliente_service). Esta migração aplica
+a mesma regra aos clientes gravados antes disso, só com dígitos ou com
+outra pontuação. Se dois clientes passarem a ter o mesmo CPF, ela falha
+listando os ids, sem alterar nada: a duplicidade precisa ser resolvida à mão.
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_normalizar_cpf'
+down_revision = '0004_versoes_tabelas'
+branch_labels = None
+depends_on = None
+
+
+def formatar_cpf(cpf):
+    # Cópia de src.model.services.cliente_service.formatar_cpf: a migração não
+    # pode mudar de comportamento se a aplicação mudar
+    digitos = re.sub(r'\D', '', cpf)
+    if len(digitos) != 11:
+        return cpf
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
+
+
+def upgrade():
+    bind = op.get_bind()
+    clientes = sa.table('clientes', sa.column('id', sa.Integer), sa.column('cpf', sa.String))
+    linhas = bind.execute(sa.select(clientes.c.id, clientes.c.cpf)).all()
+
+    ids_por_cpf = {}
+    for cliente_id, cpf in linhas:
+        ids_por_cpf.setdefault(formatar_cpf(cpf), []).append(cliente_id)
+    colisoes = {cpf: ids for cpf, ids in ids_por_cpf.items() if len(ids) > 1}
+    if colisoes:
+        detalhes = '; '.join(f'{cpf}: clientes {", ".join(map(str, sorted(ids)))}'
+                             for cpf, ids in sorted(colisoes.items()))
+        raise RuntimeError(f'CPFs duplicados depois da normalização ({detalhes})')
+
+    alteracoes = [{'cliente_id': cliente_id, 'novo_cpf': formatar_cpf(cpf)}
+                  for cliente_id, cpf in linhas if formatar_cpf(cpf) != cpf]
+    if alteracoes:
+        bind.execute(clientes.update().where(clientes.c.id == sa.bindparam('cliente_id'))
+                     .values(cpf=sa.bindparam('novo_cpf')), alteracoes)
+
+
+def downgrade():
+    # A forma original de cada CPF não é guardada: os valores continuam normalizados
+    pass
@@ -0,0 +1,40 @@
+"""Pets desativados junto com o cliente
+
+Revision ID: 0006_pets_desativados_com_cliente
+Revises: 0005_normalizar_cpf
+Create Date: 2026-10-18 20:00:00.000000
+
+Desativar um cliente desativa os pets ativos dele e registra quais foram
+nesta tabela; reativar o cliente reativa exatamente esses pets. Clientes
+desativados antes desta revisão não têm registro: os pets deles continuam
+inativos ao reativá-los.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_pets_desativados_com_cliente'
+down_revision = '0005_normalizar_cpf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'pets_desativados_com_cliente',
+        sa.Column('pet_id', sa.Integer(), nullable=False),
+        sa.Column('cliente_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['pet_id'], ['pets.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('pet_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_pets_desativados_com_cliente_cliente_id', 'pets_desativados_com_cliente',
+                    ['cliente_id'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_pets_desativados_com_cliente_cliente_id', table_name='pets_desativados_com_cliente',
+                  if_exists=True)
+    op.drop_table('pets_desativados_com_cliente', if_exists=True)
@@ -0,0 +1,66 @@
+"""Índice de busca textual (SQLite FTS5)
+
+Revision ID: 0007_indice_busca
+Revises: 0006_pets_desativados_com_cliente
+Create Date: 2026-10-18 21:00:00.000000
+
+Tabela virtual busca_fts com um documento por cliente, pet, serviço e
+agendamento com observações, populada aqui na primeira vez. Depois disso a
+aplicação a mantém em dia (eventos do ORM em BuscaRepository). Nos demais
+bancos a busca global usa LIKE e nada é criado.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_indice_busca'
+down_revision = '0006_pets_desativados_com_cliente'
+branch_labels = None
+depends_on = None
+
+
+CREATE_FTS = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS busca_fts USING fts5(
+        tipo UNINDEXED,
+        ref_id UNINDEXED,
+        rotulo UNINDEXED,
+        subtitulo UNINDEXED,
+        titulo,
+        conteudo,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+"""
+
+# Cópia dos documentos de src.model.repositories.busca_repository no momento
+# desta revisão (rowid = id * 8 + código do tipo)
+DOCUMENTOS = (
+    """SELECT id * 8 + 1, 'cliente', id, nome, cpf, nome,
+              cpf || ' ' || replace(replace(cpf, '.', ''), '-', '') || ' ' || coalesce(email, '')
+       FROM clientes""",
+    """SELECT id * 8 + 2, 'pet', id, nome, especie || coalesce(' - ' || raca, ''), nome,
+              coalesce(raca, '') || ' ' || especie
+       FROM pets""",
+    """SELECT id * 8 + 3, 'servico', id, nome, categoria, nome,
+              categoria || ' ' || coalesce(descricao, '')
+       FROM servicos""",
+    """SELECT id * 8 + 4, 'agendamento', id, 'Agendamento #' || id, data_agendamento, '', observacoes
+       FROM agendamentos
+       WHERE observacoes IS NOT NULL AND observacoes <> ''""",
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    existia = sa.inspect(bind).has_table('busca_fts')
+    op.execute(CREATE_FTS)
+    if not existia:
+        for sql in DOCUMENTOS:
+            op.execute(f'INSERT INTO busca_fts (rowid, tipo, ref_id, rotulo, subtitulo, titulo, conteudo) {sql}')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS busca_fts')
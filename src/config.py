@@ -8,13 +8,60 @@ class Config:
     
     # Configuração do banco de dados
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
-        f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+        f"sqlite:///{os.path.join(os.path.dirname(__file__), 'model', 'database', 'app.db')}"
+
+    # Pool de conexões: pre_ping descarta conexões derrubadas pelo servidor
+    # antes de entregá-las; recycle evita conexões mais velhas que o timeout dele
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+    }
+
+    # PRAGMAs aplicados a cada conexão SQLite (ignorados em outros bancos).
+    # WAL permite leituras durante uma escrita; synchronous=NORMAL é seguro
+    # em WAL e evita um fsync por commit; busy_timeout faz a escrita esperar
+    # pelo lock em vez de falhar com "database is locked".
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+        'cache_size': -16000,  # 16 MB por conexão
+        'mmap_size': 268435456,  # 256 MB
+        'temp_store': 'MEMORY',
+    }
+
+    # Réplica de leitura (opcional): os métodos de service marcados com
+    # @read_only consultam o bind 'replica'; escritas e leituras depois de uma
+    # escrita na mesma requisição vão para o banco principal. Com dois arquivos
+    # SQLite a réplica é copiada do principal pela API de backup a cada
+    # REPLICA_INTERVALO segundos (0: apenas na inicialização).
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_INTERVALO = int(os.environ.get('REPLICA_INTERVALO', 5))
     
     # Configurações de CORS
     CORS_ORIGINS = ["*"]
     
     # Configurações de paginação
     ITEMS_PER_PAGE = 20
+
+    # Respostas de texto menores que isso (bytes) não são comprimidas
+    COMPRESSAO_MINIMO = 1024
+
+    # Métricas em /metrics (Prometheus): token exigido no cabeçalho
+    # Authorization: Bearer <token>, quando definido. SERVER_TIMING adiciona
+    # o cabeçalho Server-Timing (tempo total e de SQL) às respostas.
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '').lower() in ('1', 'true')
+
+    # Orçamento de comandos SQL (@query_budget) e detecção de N+1 por requisição:
+    # 'raise' levanta QueryBudgetExceeded, 'warn' registra o relatório no log e
+    # None desativa a contagem (produção)
+    QUERY_BUDGET = os.environ.get('QUERY_BUDGET') or None
     
     # Configurações de data/hora
     TIMEZONE = 'America/Sao_Paulo'
@@ -23,6 +70,7 @@ class DevelopmentConfig(Config):
     """Configurações para desenvolvimento"""
     DEBUG = True
     SQLALCHEMY_ECHO = False  # Set to True to see SQL queries
+    QUERY_BUDGET = os.environ.get('QUERY_BUDGET', 'warn')
 
 class ProductionConfig(Config):
     """Configurações para produção"""
@@ -33,8 +81,12 @@ class TestingConfig(Config):
     """Configurações para testes"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # Banco em memória usa uma única conexão (StaticPool): sem opções de pool
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLITE_PRAGMAS = {'foreign_keys': 'ON'}
+    QUERY_BUDGET = 'raise'
 
-# Configurações disponíveis
+# Configurações disponíveis (selecionada por FLASK_CONFIG)
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
@@ -7,6 +7,10 @@ from .pet import pet_bp
 from .funcionario import funcionario_bp
 from .servico import servico_bp
 from .agendamento import agendamento_bp
+from .busca import busca_bp
+from .disponibilidade import disponibilidade_bp
+from .importacao import importacao_bp
+from .exportacao import exportacao_bp
 
 __all__ = [
     'cliente_bp',
@@ -14,5 +18,9 @@ __all__ = [
     'pet_bp',
     'funcionario_bp',
     'servico_bp',
-    'agendamento_bp'
+    'agendamento_bp',
+    'busca_bp',
+    'disponibilidade_bp',
+    'importacao_bp',
+    'exportacao_bp'
 ]
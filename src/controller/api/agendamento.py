@@ -1,44 +1,70 @@
 from flask import Blueprint, jsonify, request
 from src.model.models import db, Agendamento, Cliente, Pet, Servico, Funcionario
+from src.model.dto import AgendamentoDTO
+from src.model.query_budget import query_budget
+from src.model.repositories.agendamento_repository import load_options, PAGE_KEYS, RELACOES, STATUS_ATIVOS
+from src.model.services.agendamento_service import AgendamentoService
+from src.controller.api.fieldsets import get_fieldset_args
+from src.controller.api.multi_get import get_ids_arg, multi_get_response
+from src.controller.api.pagination import get_page_args, paginated_response
 from datetime import datetime, timedelta
 
 agendamento_bp = Blueprint('agendamento', __name__)
+agendamento_service = AgendamentoService()
 
 @agendamento_bp.route('/agendamentos', methods=['GET'])
+@query_budget(5)  # a página + uma consulta por relação de ?include=
 def get_agendamentos():
-    """Listar todos os agendamentos"""
+    """Listar agendamentos (paginação por cursor em (data_agendamento, id): ?cursor=&limit=)
+
+    ?fields=status,data_agendamento seleciona só essas colunas (id sempre vem);
+    ?include=cliente,pet,servico,funcionario embute as relações, com
+    ?fields[cliente]=nome,telefone para escolher os campos de cada uma.
+    ?ids=1,2,3 busca vários agendamentos por id (sem paginação nem filtros).
+    """
     try:
+        try:
+            ids = get_ids_arg()
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
+        if ids is not None:
+            return multi_get_response(*agendamento_service.get_agendamentos_by_ids(ids)), 200
+        
         # Filtros opcionais
         data_inicio = request.args.get('data_inicio')
         data_fim = request.args.get('data_fim')
         status = request.args.get('status')
         funcionario_id = request.args.get('funcionario_id')
         
-        query = Agendamento.query
-        
-        # Aplicar filtros
+        # Validar filtros de data
+        data_inicio_dt = data_fim_dt = None
         if data_inicio:
             try:
                 data_inicio_dt = datetime.strptime(data_inicio, '%Y-%m-%d')
-                query = query.filter(Agendamento.data_agendamento >= data_inicio_dt)
             except ValueError:
                 return jsonify({'erro': 'Formato de data_inicio inválido. Use YYYY-MM-DD'}), 400
         
         if data_fim:
             try:
                 data_fim_dt = datetime.strptime(data_fim, '%Y-%m-%d') + timedelta(days=1)
-                query = query.filter(Agendamento.data_agendamento < data_fim_dt)
             except ValueError:
                 return jsonify({'erro': 'Formato de data_fim inválido. Use YYYY-MM-DD'}), 400
         
-        if status:
-            query = query.filter(Agendamento.status == status)
-        
-        if funcionario_id:
-            query = query.filter(Agendamento.funcionario_id == funcionario_id)
+        try:
+            after, limit = get_page_args(PAGE_KEYS)
+            fieldset = get_fieldset_args(AgendamentoDTO, RELACOES)
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
         
-        agendamentos = query.order_by(Agendamento.data_agendamento).all()
-        return jsonify([agendamento.to_dict() for agendamento in agendamentos]), 200
+        # Linhas como AgendamentoDTO (SELECT só das colunas, sem objetos do ORM);
+        # com ?fields=, só as colunas pedidas
+        agendamentos, has_more = agendamento_service.get_agendamentos_page(
+            after=after, limit=limit, data_inicio=data_inicio_dt, data_fim=data_fim_dt,
+            status=status, funcionario_id=funcionario_id, campos=fieldset.colunas(PAGE_KEYS))
+        # Relações de ?include=: uma consulta IN por relação, para a página inteira
+        incluidos = agendamento_service.get_relacionados(agendamentos, fieldset.include)
+        return paginated_response(agendamentos, PAGE_KEYS, has_more, limit,
+                                  serialize=fieldset.serializer(incluidos)), 200
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
@@ -77,6 +103,12 @@ def create_agendamento():
             funcionario = Funcionario.query.get(funcionario_id)
             if not funcionario:
                 return jsonify({'erro': 'Funcionário não encontrado'}), 404
+
+        # Verificar serviço se informado (a duração dele vale quando não há tempo_estimado)
+        if data.get('servico_id'):
+            servico = Servico.query.get(data['servico_id'])
+            if not servico or not servico.ativo:
+                return jsonify({'erro': 'Serviço não encontrado ou inativo'}), 404
         
         # Converter data de agendamento
         try:
@@ -88,16 +120,13 @@ def create_agendamento():
         if data_agendamento < datetime.now():
             return jsonify({'erro': 'Não é possível agendar para uma data no passado'}), 400
         
-        # Verificar conflitos de horário (se funcionário informado)
-        if funcionario_id:
-            conflito = Agendamento.query.filter(
-                Agendamento.funcionario_id == funcionario_id,
-                Agendamento.data_agendamento == data_agendamento,
-                Agendamento.status.in_(['Agendado', 'Confirmado', 'Em Andamento'])
-            ).first()
-            
-            if conflito:
-                return jsonify({'erro': 'Funcionário já possui agendamento neste horário'}), 400
+        tempo_estimado = data.get('tempo_estimado', servico.duracao_estimada)
+        
+        # Verificar sobreposição de horários (se funcionário informado)
+        try:
+            agendamento_service.verificar_conflito(funcionario_id, data_agendamento, tempo_estimado)
+        except ValueError as e:
+            return jsonify({'erro': str(e)}), 400
         
         agendamento = Agendamento(
             cliente_id=data['cliente_id'],
@@ -107,7 +136,7 @@ def create_agendamento():
             data_agendamento=data_agendamento,
             observacoes=data.get('observacoes'),
             valor_estimado=data.get('valor_estimado', servico.preco),
-            tempo_estimado=data.get('tempo_estimado', servico.duracao_estimada)
+            tempo_estimado=tempo_estimado
         )
         
         db.session.add(agendamento)
@@ -118,11 +147,48 @@ def create_agendamento():
         db.session.rollback()
         return jsonify({'erro': str(e)}), 500
 
+@agendamento_bp.route('/agendamentos/lote', methods=['POST'])
+def create_agendamentos_lote():
+    """Criar uma série de agendamentos a partir de uma regra de recorrência
+
+    Corpo: os campos de POST /agendamentos mais
+    "recorrencia": {"frequencia": "diaria|semanal|mensal", "intervalo": 2, "ocorrencias": 13 ou "ate": "YYYY-MM-DD"}
+    """
+    try:
+        data = request.json or {}
+        
+        try:
+            data_agendamento = datetime.strptime(data.get('data_agendamento') or '', '%Y-%m-%d %H:%M')
+        except ValueError:
+            return jsonify({'erro': 'Formato de data_agendamento inválido. Use YYYY-MM-DD HH:MM'}), 400
+        
+        resultado = agendamento_service.create_agendamentos_recorrentes(
+            cliente_id=data.get('cliente_id'),
+            pet_id=data.get('pet_id'),
+            servico_id=data.get('servico_id'),
+            data_agendamento=data_agendamento,
+            recorrencia=data.get('recorrencia'),
+            funcionario_id=data.get('funcionario_id'),
+            observacoes=data.get('observacoes'),
+            valor_estimado=data.get('valor_estimado'),
+            tempo_estimado=data.get('tempo_estimado')
+        )
+        
+        if not resultado['criados']:
+            return jsonify({'erro': 'Nenhuma ocorrência pôde ser agendada', **resultado}), 400
+        return jsonify(resultado), 201
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'erro': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'erro': str(e)}), 500
+
 @agendamento_bp.route('/agendamentos/<int:agendamento_id>', methods=['GET'])
 def get_agendamento(agendamento_id):
     """Buscar agendamento por ID"""
     try:
-        agendamento = Agendamento.query.get_or_404(agendamento_id)
+        agendamento = Agendamento.query.options(*load_options('api')).get_or_404(agendamento_id)
         return jsonify(agendamento.to_dict()), 200
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
@@ -145,6 +211,7 @@ def update_agendamento(agendamento_id):
                 return jsonify({'erro': 'Funcionário não encontrado'}), 404
         
         # Converter data de agendamento se fornecida
+        data_agendamento = agendamento.data_agendamento
         if data.get('data_agendamento'):
             try:
                 data_agendamento = datetime.strptime(data['data_agendamento'], '%Y-%m-%d %H:%M')
@@ -152,26 +219,27 @@ def update_agendamento(agendamento_id):
                 # Verificar se a data não é no passado
                 if data_agendamento < datetime.now():
                     return jsonify({'erro': 'Não é possível agendar para uma data no passado'}), 400
-                
-                # Verificar conflitos de horário
-                funcionario_id = data.get('funcionario_id', agendamento.funcionario_id)
-                if funcionario_id:
-                    conflito = Agendamento.query.filter(
-                        Agendamento.funcionario_id == funcionario_id,
-                        Agendamento.data_agendamento == data_agendamento,
-                        Agendamento.status.in_(['Agendado', 'Confirmado', 'Em Andamento']),
-                        Agendamento.id != agendamento_id
-                    ).first()
-                    
-                    if conflito:
-                        return jsonify({'erro': 'Funcionário já possui agendamento neste horário'}), 400
-                
-                agendamento.data_agendamento = data_agendamento
             except ValueError:
                 return jsonify({'erro': 'Formato de data_agendamento inválido. Use YYYY-MM-DD HH:MM'}), 400
         
+        # Verificar sobreposição com o horário resultante da alteração
+        status = data.get('status', agendamento.status)
+        if status in STATUS_ATIVOS:
+            try:
+                agendamento_service.verificar_conflito(
+                    data.get('funcionario_id', agendamento.funcionario_id),
+                    data_agendamento,
+                    data.get('tempo_estimado', agendamento.tempo_estimado),
+                    ignorar_id=agendamento.id,
+                    servico_id=data.get('servico_id', agendamento.servico_id)
+                )
+            except ValueError as e:
+                return jsonify({'erro': str(e)}), 400
+        
         # Atualizar campos
+        agendamento.data_agendamento = data_agendamento
         agendamento.funcionario_id = data.get('funcionario_id', agendamento.funcionario_id)
+        agendamento.servico_id = data.get('servico_id') or agendamento.servico_id
         agendamento.observacoes = data.get('observacoes', agendamento.observacoes)
         agendamento.valor_estimado = data.get('valor_estimado', agendamento.valor_estimado)
         agendamento.tempo_estimado = data.get('tempo_estimado', agendamento.tempo_estimado)
@@ -198,6 +266,15 @@ def update_status_agendamento(agendamento_id):
         if data['status'] not in status_validos:
             return jsonify({'erro': f'Status deve ser um dos seguintes: {", ".join(status_validos)}'}), 400
         
+        # Reativar um agendamento volta a ocupar o horário do funcionário
+        if data['status'] in STATUS_ATIVOS and agendamento.status not in STATUS_ATIVOS:
+            try:
+                agendamento_service.verificar_conflito(agendamento.funcionario_id, agendamento.data_agendamento,
+                                                       agendamento.tempo_estimado, ignorar_id=agendamento.id,
+                                                       servico_id=agendamento.servico_id)
+            except ValueError as e:
+                return jsonify({'erro': str(e)}), 400
+        
         agendamento.status = data['status']
         db.session.commit()
         
@@ -223,7 +300,7 @@ def delete_agendamento(agendamento_id):
 def get_agendamentos_by_cliente(cliente_id):
     """Listar agendamentos de um cliente"""
     try:
-        agendamentos = Agendamento.query.filter_by(cliente_id=cliente_id).order_by(Agendamento.data_agendamento.desc()).all()
+        agendamentos = Agendamento.query.options(*load_options('api')).filter_by(cliente_id=cliente_id).order_by(Agendamento.data_agendamento.desc()).all()
         return jsonify([agendamento.to_dict() for agendamento in agendamentos]), 200
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
@@ -232,7 +309,7 @@ def get_agendamentos_by_cliente(cliente_id):
 def get_agendamentos_by_funcionario(funcionario_id):
     """Listar agendamentos de um funcionário"""
     try:
-        agendamentos = Agendamento.query.filter_by(funcionario_id=funcionario_id).order_by(Agendamento.data_agendamento).all()
+        agendamentos = Agendamento.query.options(*load_options('api')).filter_by(funcionario_id=funcionario_id).order_by(Agendamento.data_agendamento).all()
         return jsonify([agendamento.to_dict() for agendamento in agendamentos]), 200
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify, request
+from src.model.services.busca_service import BuscaService
+
+busca_bp = Blueprint("busca_api", __name__)
+busca_service = BuscaService()
+
+@busca_bp.route("/busca", methods=["GET"])
+def buscar():
+    """Busca global (sem acentos) em clientes, pets, serviços e agendamentos"""
+    try:
+        termo = request.args.get("q", "")
+        limit = request.args.get("limit", 20, type=int)
+        if limit < 1:
+            raise ValueError("limit deve ser maior que zero")  # LIMIT -1 no SQLite seria sem limite
+        limit = min(limit, 100)
+        tipos = [tipo for tipo in request.args.get("tipos", "").split(",") if tipo]
+
+        resultados = busca_service.buscar(termo, tipos=tipos or None, limit=limit)
+        return jsonify({"q": termo, "resultados": resultados}), 200
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
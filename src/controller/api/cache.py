@@ -0,0 +1,46 @@
+import hashlib
+from functools import wraps
+from flask import make_response, request
+from src.model.repositories.versao_repository import VersaoRepository
+
+# Políticas de Cache-Control. Os dados exigem login, então nada é público.
+# Catálogos (serviços, funcionários) mudam raramente: o navegador pode
+# reutilizar a resposta por um minuto e depois revalida com If-None-Match.
+CATALOGO = 'private, max-age=60, must-revalidate'
+# Demais listagens: revalidar sempre (a resposta 304 só lê as versões das tabelas)
+REVALIDAR = 'private, no-cache'
+
+def calcular_etag(tabelas):
+    """ETag fraca a partir das versões das tabelas, do caminho e dos parâmetros da requisição"""
+    versoes = VersaoRepository().get_versoes(tabelas)
+    partes = [request.path]
+    partes += [f'{tabela}={versao}' for tabela, versao in sorted(versoes.items())]
+    partes += [f'{chave}={valor}' for chave, valor in sorted(request.args.items(multi=True))]
+    return hashlib.sha1('\n'.join(partes).encode()).hexdigest()[:20]
+
+def conditional_get(*tabelas, cache_control=REVALIDAR):
+    """Responde 304 Not Modified, sem executar a view, quando If-None-Match ainda vale
+
+        @servico_bp.route('/servicos', methods=['GET'])
+        @conditional_get('servicos', cache_control=CATALOGO)
+        def get_servicos(): ...
+
+    `tabelas` são todas as tabelas lidas pela view. A ETag é calculada antes
+    da consulta: uma escrita concorrente pode no máximo gerar uma ETag que
+    não volta a coincidir, nunca uma ETag nova com dados antigos.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = calcular_etag(tabelas)
+            if request.if_none_match.contains_weak(etag):
+                resposta = make_response('', 304)
+            else:
+                resposta = make_response(view(*args, **kwargs))
+                if resposta.status_code != 200:
+                    return resposta
+            resposta.set_etag(etag, weak=True)
+            resposta.headers['Cache-Control'] = cache_control
+            return resposta
+        return wrapper
+    return decorator
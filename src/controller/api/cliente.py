@@ -1,15 +1,26 @@
 from flask import Blueprint, jsonify, request
 from src.model.services.cliente_service import ClienteService
+from src.model.repositories.cliente_repository import PAGE_KEYS
+from src.controller.api.pagination import get_page_args, paginated_response
+from src.controller.api.cache import conditional_get
+from src.controller.api.multi_get import get_ids_arg, multi_get_response
+from src.model.serializers import serialize
 
 cliente_bp = Blueprint("cliente_api", __name__)
 cliente_service = ClienteService()
 
 @cliente_bp.route("/clientes", methods=["GET"])
 def get_clientes():
-    """Listar todos os clientes"""
+    """Listar clientes (paginação por cursor: ?cursor=&limit=) ou buscar vários por ?ids=1,2,3"""
     try:
-        clientes = cliente_service.get_all_clientes()
-        return jsonify([cliente.to_dict() for cliente in clientes]), 200
+        ids = get_ids_arg()
+        if ids is not None:
+            return multi_get_response(*cliente_service.get_clientes_by_ids(ids)), 200
+        after, limit = get_page_args(PAGE_KEYS)
+        clientes, has_more = cliente_service.get_clientes_page(after=after, limit=limit)
+        return paginated_response(clientes, PAGE_KEYS, has_more, limit), 200
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
@@ -87,14 +98,30 @@ def activate_cliente(cliente_id):
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
+@cliente_bp.route("/clientes/pets", methods=["GET"])
+def get_clientes_pets():
+    """Pets ativos de vários clientes (?ids=1,2,3), agrupados por cliente na ordem dos ids"""
+    try:
+        ids = get_ids_arg()
+        if ids is None:
+            return jsonify({"erro": "ids é obrigatório"}), 400
+        grupos, nao_encontrados = cliente_service.get_pets_by_cliente_ids(ids)
+        itens = [{"cliente_id": cliente_id, "pets": pets} for cliente_id, pets in grupos.items()]
+        return multi_get_response(itens, nao_encontrados), 200
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
 @cliente_bp.route("/clientes/<int:cliente_id>/pets", methods=["GET"])
+@conditional_get("clientes", "pets")
 def get_cliente_pets(cliente_id):
     """Listar pets de um cliente"""
     try:
         pets = cliente_service.get_pets_by_cliente_id(cliente_id)
         if pets is None:
             return jsonify({"erro": "Cliente não encontrado"}), 404
-        return jsonify([pet.to_dict() for pet in pets]), 200
+        return jsonify([serialize(pet) for pet in pets]), 200
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
@@ -0,0 +1,21 @@
+from flask import Blueprint, jsonify, request
+from src.model.services.disponibilidade_service import DisponibilidadeService
+
+disponibilidade_bp = Blueprint("disponibilidade_api", __name__)
+disponibilidade_service = DisponibilidadeService()
+
+@disponibilidade_bp.route("/disponibilidade", methods=["GET"])
+def get_disponibilidade():
+    """Horários livres em que o serviço cabe (?servico_id=&data_inicio=&data_fim=&funcionario_id=)"""
+    try:
+        disponibilidade = disponibilidade_service.get_disponibilidade(
+            servico_id=request.args.get("servico_id", type=int),
+            data_inicio=request.args.get("data_inicio"),
+            data_fim=request.args.get("data_fim"),
+            funcionario_id=request.args.get("funcionario_id", type=int)
+        )
+        return jsonify(disponibilidade), 200
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
@@ -0,0 +1,61 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from src.model.services.exportacao_service import ExportacaoService
+
+exportacao_bp = Blueprint("exportacao_api", __name__)
+exportacao_service = ExportacaoService()
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def _resposta(nome, formato, linhas):
+    """Resposta enviada à medida que as linhas são lidas do banco"""
+    return Response(stream_with_context(linhas), mimetype=MIMETYPES[formato],
+                    headers={"Content-Disposition": f"attachment; filename={nome}.{formato}"})
+
+@exportacao_bp.route("/export/agendamentos", methods=["GET"])
+def exportar_agendamentos():
+    """Exportar agendamentos (?formato=csv|ndjson&data_inicio=&data_fim=&status=)"""
+    try:
+        formato = request.args.get("formato", "csv")
+        linhas = exportacao_service.exportar_agendamentos(
+            formato=formato,
+            data_inicio=request.args.get("data_inicio"),
+            data_fim=request.args.get("data_fim"),
+            status=request.args.get("status")
+        )
+        return _resposta("agendamentos", formato, linhas)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+@exportacao_bp.route("/export/clientes", methods=["GET"])
+def exportar_clientes():
+    """Exportar clientes (?formato=csv|ndjson&status=true|false)"""
+    try:
+        formato = request.args.get("formato", "csv")
+        linhas = exportacao_service.exportar_clientes(formato=formato, status=request.args.get("status"))
+        return _resposta("clientes", formato, linhas)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
+
+@exportacao_bp.route("/export/pets", methods=["GET"])
+def exportar_pets():
+    """Exportar pets (?formato=csv|ndjson&status=&especie=&cliente_id=)"""
+    try:
+        formato = request.args.get("formato", "csv")
+        linhas = exportacao_service.exportar_pets(
+            formato=formato,
+            status=request.args.get("status"),
+            especie=request.args.get("especie"),
+            cliente_id=request.args.get("cliente_id", type=int)
+        )
+        return _resposta("pets", formato, linhas)
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        return jsonify({"erro": str(e)}), 500
@@ -0,0 +1,82 @@
+from flask import request
+from src.model.serializers import serialize, serializer_for
+
+class Fieldset:
+    """Campos (?fields=) e relações embutidas (?include=) pedidos em uma listagem da API
+
+    campos é a tupla de campos do item (sempre com id) ou None para todos;
+    include mapeia cada relação pedida para os seus campos.
+    """
+
+    def __init__(self, campos, include, relacoes):
+        self.campos = campos
+        self.include = include
+        self.chaves = {nome: relacoes[nome][1].key for nome in include}
+
+    def colunas(self, page_keys):
+        """Colunas a selecionar: os campos, as chaves do cursor e as chaves estrangeiras das relações
+
+        None quando ?fields= não foi informado (todas as colunas, como DTO).
+        """
+        if self.campos is None:
+            return None
+        return tuple(dict.fromkeys((*self.campos, *(coluna.key for coluna in page_keys), *self.chaves.values())))
+
+    def serializer(self, incluidos):
+        """Função de serialização para paginated_response com as relações já carregadas
+
+        incluidos é o retorno de load_relations ({relação: {id: dict}});
+        relação ausente (chave estrangeira nula) vira None.
+        """
+        campos, chaves = self.campos, self.chaves
+        if campos is None and not chaves:
+            return serialize
+
+        def serializar(item):
+            if campos is None:
+                dados = serialize(item)
+            else:
+                dados = {campo: getattr(item, campo) for campo in campos}
+            for nome, chave in chaves.items():
+                dados[nome] = incluidos[nome].get(getattr(item, chave))
+            return dados
+        return serializar
+
+def _lista(valor):
+    return [nome.strip() for nome in valor.split(',') if nome.strip()]
+
+def _validar(campos, permitidos, onde):
+    invalidos = [campo for campo in campos if campo not in permitidos]
+    if invalidos:
+        raise ValueError(f"Campo(s) inválido(s) em {onde}: {', '.join(invalidos)}")
+    return tuple(dict.fromkeys(('id', *campos)))
+
+def get_fieldset_args(dto, relacoes):
+    """Lê ?fields=, ?include= e ?fields[relação]= da requisição
+
+        /api/agendamentos?fields=data_agendamento,status&include=cliente,pet&fields[cliente]=nome,telefone
+
+    dto define os campos do item; relacoes, as relações que podem ser
+    embutidas ({nome: (modelo, chave estrangeira)}). Sem fields[relação],
+    a relação vem com todos os campos de to_dict(). Nomes desconhecidos
+    levantam ValueError.
+    """
+    campos = request.args.get('fields')
+    if campos is not None:
+        campos = _validar(_lista(campos), serializer_for(dto).campos, 'fields')
+
+    include = {}
+    for nome in _lista(request.args.get('include', '')):
+        if nome not in relacoes:
+            raise ValueError(f"Relação inválida em include: {nome}. Use: {', '.join(relacoes)}")
+        include[nome] = serializer_for(relacoes[nome][0]).campos
+
+    for parametro, valor in request.args.items():
+        if not (parametro.startswith('fields[') and parametro.endswith(']')):
+            continue
+        nome = parametro[len('fields['):-1]
+        if nome not in include:
+            raise ValueError(f'{parametro} exige include={nome}')
+        include[nome] = _validar(_lista(valor), include[nome], parametro)
+
+    return Fieldset(campos, include, relacoes)
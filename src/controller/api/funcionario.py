@@ -1,15 +1,29 @@
 from flask import Blueprint, jsonify, request
 from src.model.models import db, Funcionario
+from src.model.repositories.funcionario_repository import PAGE_KEYS
+from src.model.repositories.query_spec import keyset_page
+from src.controller.api.pagination import get_page_args, paginated_response
+from src.controller.api.cache import conditional_get, CATALOGO
+from src.controller.api.multi_get import get_ids_arg, multi_get_response
+from src.model.services.funcionario_service import FuncionarioService
 from datetime import datetime
 
 funcionario_bp = Blueprint('funcionario', __name__)
+funcionario_service = FuncionarioService()
 
 @funcionario_bp.route('/funcionarios', methods=['GET'])
+@conditional_get('funcionarios', cache_control=CATALOGO)
 def get_funcionarios():
-    """Listar todos os funcionários"""
+    """Listar funcionários ativos (paginação por cursor: ?cursor=&limit=) ou buscar vários por ?ids=1,2,3"""
     try:
-        funcionarios = Funcionario.query.filter_by(ativo=True).all()
-        return jsonify([funcionario.to_dict() for funcionario in funcionarios]), 200
+        ids = get_ids_arg()
+        if ids is not None:
+            return multi_get_response(*funcionario_service.get_funcionarios_by_ids(ids)), 200
+        after, limit = get_page_args(PAGE_KEYS)
+        funcionarios, has_more = keyset_page(Funcionario.query.filter_by(ativo=True), PAGE_KEYS, after, limit)
+        return paginated_response(funcionarios, PAGE_KEYS, has_more, limit), 200
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
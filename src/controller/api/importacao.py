@@ -0,0 +1,60 @@
+import io
+import tempfile
+from flask import Blueprint, jsonify, request, send_file
+from src.model.models import db
+from src.model.services.importacao_service import ImportacaoService, formato_do_arquivo
+
+importacao_bp = Blueprint("importacao_api", __name__)
+importacao_service = ImportacaoService()
+
+# Content-Type do corpo quando o arquivo é enviado sem multipart
+FORMATOS_POR_TIPO = {
+    "text/csv": "csv",
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+}
+
+def _arquivo_enviado():
+    """Arquivo do campo multipart "arquivo" ou o próprio corpo da requisição, lido em fluxo"""
+    if "arquivo" in request.files:
+        arquivo = request.files["arquivo"]
+        formato = formato_do_arquivo(arquivo.filename)
+        stream = arquivo.stream
+    else:
+        formato = FORMATOS_POR_TIPO.get(request.mimetype, "csv")
+        stream = request.stream
+    return stream, request.args.get("formato") or formato
+
+def _importar(importar):
+    try:
+        stream, formato = _arquivo_enviado()
+        if request.args.get("relatorio") != "csv":
+            return jsonify(importar(stream, formato)), 200
+
+        # Relatório completo das rejeições em arquivo temporário (memória constante)
+        relatorio = tempfile.TemporaryFile()
+        texto = io.TextIOWrapper(relatorio, encoding="utf-8", newline="")
+        resumo = importar(stream, formato, rejeitados=texto)
+        texto.detach()
+        relatorio.seek(0)
+        response = send_file(relatorio, mimetype="text/csv", as_attachment=True,
+                             download_name="rejeitados.csv")
+        response.headers["X-Importados"] = str(resumo["importados"])
+        response.headers["X-Rejeitados"] = str(resumo["rejeitados"])
+        return response
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"erro": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"erro": str(e)}), 500
+
+@importacao_bp.route("/import/clientes", methods=["POST"])
+def importar_clientes():
+    """Importar clientes em massa (CSV, JSON ou NDJSON; ?relatorio=csv devolve as linhas rejeitadas)"""
+    return _importar(importacao_service.importar_clientes)
+
+@importacao_bp.route("/import/pets", methods=["POST"])
+def importar_pets():
+    """Importar pets em massa; o dono é informado por cliente_id ou cliente_cpf"""
+    return _importar(importacao_service.importar_pets)
@@ -0,0 +1,24 @@
+from flask import jsonify, request
+from src.controller.api.pagination import MAX_LIMIT
+
+# Ids por requisição em ?ids= (o mesmo teto de itens de uma página)
+MAX_IDS = MAX_LIMIT
+
+def get_ids_arg():
+    """Ids de ?ids=1,2,3 na ordem recebida, ou None quando o parâmetro não foi informado"""
+    valor = request.args.get("ids")
+    if valor is None:
+        return None
+    try:
+        ids = [int(parte) for parte in valor.split(",") if parte.strip()]
+    except ValueError:
+        raise ValueError("ids deve ser uma lista de inteiros separados por vírgula")
+    if not ids:
+        raise ValueError("Informe ao menos um id em ids")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"No máximo {MAX_IDS} ids por requisição")
+    return ids
+
+def multi_get_response(itens, nao_encontrados):
+    """Resposta de ?ids=: os itens na ordem dos ids pedidos e os ids que não existem"""
+    return jsonify({"itens": itens, "nao_encontrados": nao_encontrados})
@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import jsonify, request, url_for
+from src.model.serializers import serialize as serialize_model
+
+# Limites de itens por página nas listagens da API
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+def encode_cursor(values):
+    """Codifica os valores da chave de ordenação em um cursor opaco"""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor, keys):
+    """Decodifica o cursor convertendo cada valor para o tipo da coluna correspondente"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(keys):
+            raise ValueError
+        values = []
+        for column, value in zip(keys, payload):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            else:
+                value = python_type(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValueError("Cursor inválido")
+
+def get_page_args(keys):
+    """Lê os parâmetros cursor e limit da requisição"""
+    limit = request.args.get("limit", DEFAULT_LIMIT, type=int)
+    if limit < 1:
+        raise ValueError("limit deve ser maior que zero")
+    limit = min(limit, MAX_LIMIT)
+
+    cursor = request.args.get("cursor")
+    after = decode_cursor(cursor, keys) if cursor else None
+    return after, limit
+
+def paginated_response(itens, keys, has_more, limit, serialize=serialize_model):
+    """Resposta JSON (lista) com o próximo cursor nos cabeçalhos Link e X-Next-Cursor"""
+    response = jsonify([serialize(item) for item in itens])
+    if has_more and itens:
+        next_cursor = encode_cursor([getattr(itens[-1], column.key) for column in keys])
+        args = request.args.to_dict()
+        args.update(cursor=next_cursor, limit=limit)
+        next_url = url_for(request.endpoint, **(request.view_args or {}), **args, _external=True)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
@@ -1,5 +1,10 @@
 from flask import Blueprint, jsonify, request
 from src.model.services.pet_service import PetService
+from src.model.dto import PetDTO
+from src.model.repositories.pet_repository import PAGE_KEYS, RELACOES
+from src.controller.api.fieldsets import get_fieldset_args
+from src.controller.api.multi_get import get_ids_arg, multi_get_response
+from src.controller.api.pagination import get_page_args, paginated_response
 from datetime import datetime
 
 pet_bp = Blueprint("pet_api", __name__)
@@ -7,14 +12,20 @@ pet_service = PetService()
 
 @pet_bp.route("/pets", methods=["GET"])
 def get_pets():
-    """Listar todos os pets"""
+    """Listar pets (paginação por cursor: ?cursor=&limit=; ?fields= e ?include=cliente) ou buscar vários por ?ids="""
     try:
+        ids = get_ids_arg()
+        if ids is not None:
+            return multi_get_response(*pet_service.get_pets_by_ids(ids)), 200
         cliente_id = request.args.get("cliente_id", type=int)
-        if cliente_id:
-            pets = pet_service.get_pets_by_cliente_id(cliente_id)
-        else:
-            pets = pet_service.get_all_pets()
-        return jsonify([pet.to_dict() for pet in pets]), 200
+        after, limit = get_page_args(PAGE_KEYS)
+        fieldset = get_fieldset_args(PetDTO, RELACOES)
+        pets, has_more = pet_service.get_pets_page(after=after, limit=limit, cliente_id=cliente_id,
+                                                   campos=fieldset.colunas(PAGE_KEYS))
+        incluidos = pet_service.get_relacionados(pets, fieldset.include)
+        return paginated_response(pets, PAGE_KEYS, has_more, limit, serialize=fieldset.serializer(incluidos)), 200
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
 
@@ -1,14 +1,28 @@
 from flask import Blueprint, jsonify, request
 from src.model.models import db, Servico
+from src.model.repositories.servico_repository import PAGE_KEYS
+from src.model.repositories.query_spec import keyset_page
+from src.controller.api.pagination import get_page_args, paginated_response
+from src.controller.api.cache import conditional_get, CATALOGO
+from src.controller.api.multi_get import get_ids_arg, multi_get_response
+from src.model.services.servico_service import ServicoService
 
 servico_bp = Blueprint('servico', __name__)
+servico_service = ServicoService()
 
 @servico_bp.route('/servicos', methods=['GET'])
+@conditional_get('servicos', cache_control=CATALOGO)
 def get_servicos():
-    """Listar todos os serviços"""
+    """Listar serviços ativos (paginação por cursor: ?cursor=&limit=) ou buscar vários por ?ids=1,2,3"""
     try:
-        servicos = Servico.query.filter_by(ativo=True).all()
-        return jsonify([servico.to_dict() for servico in servicos]), 200
+        ids = get_ids_arg()
+        if ids is not None:
+            return multi_get_response(*servico_service.get_servicos_by_ids(ids)), 200
+        after, limit = get_page_args(PAGE_KEYS)
+        servicos, has_more = keyset_page(Servico.query.filter_by(ativo=True), PAGE_KEYS, after, limit)
+        return paginated_response(servicos, PAGE_KEYS, has_more, limit), 200
+    except ValueError as e:
+        return jsonify({'erro': str(e)}), 400
     except Exception as e:
         return jsonify({'erro': str(e)}), 500
 
@@ -102,6 +116,7 @@ def delete_servico(servico_id):
         return jsonify({'erro': str(e)}), 500
 
 @servico_bp.route('/servicos/categoria/<categoria>', methods=['GET'])
+@conditional_get('servicos', cache_control=CATALOGO)
 def get_servicos_by_categoria(categoria):
     """Listar serviços por categoria"""
     try:
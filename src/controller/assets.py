@@ -0,0 +1,108 @@
+import hashlib
+import mimetypes
+import os
+from flask import Response, abort, request, send_from_directory
+from src.controller.compression import COMPRIMIVEIS, CODIFICACOES, comprimir, codificacao_aceita
+
+# URLs com impressão digital nunca mudam de conteúdo: cache de um ano
+IMUTAVEL = 'public, max-age=31536000, immutable'
+# Nomes originais (/favicon.ico, /static/css/style.css sem hash): revalidar pela ETag
+REVALIDAR = 'public, no-cache'
+
+class Asset:
+    """Arquivo estático do manifesto: nome com hash e variantes pré-comprimidas"""
+
+    def __init__(self, pasta, nome):
+        self.nome = nome
+        caminho = os.path.join(pasta, nome)
+        with open(caminho, 'rb') as arquivo:
+            conteudo = arquivo.read()
+        self.mtime = os.stat(caminho).st_mtime_ns
+        self.digest = hashlib.sha256(conteudo).hexdigest()[:12]
+        base, extensao = os.path.splitext(nome)
+        self.nome_hash = f'{base}.{self.digest}{extensao}'
+        self.mimetype = mimetypes.guess_type(nome)[0] or 'application/octet-stream'
+        self.comprimidos = {}
+        if self.mimetype in COMPRIMIVEIS:
+            for codificacao in CODIFICACOES:
+                variante = comprimir(conteudo, codificacao, maximo=True)
+                if len(variante) < len(conteudo):
+                    self.comprimidos[codificacao] = variante
+
+class AssetManifest:
+    """Mapa em memória dos arquivos estáticos, montado na inicialização (sem etapa de build)
+
+    Cada arquivo ganha um nome com os primeiros caracteres do seu SHA-256
+    (css/style.css -> css/style.3f2a1b9c0d4e.css). url_for('static', ...)
+    passa a gerar o nome com hash, que é servido com cache imutável, e as
+    verificações de existência são feitas no mapa em vez de no disco.
+    Com `recarregar` (modo debug) um arquivo alterado é processado de novo.
+    """
+
+    def __init__(self, pasta, recarregar=False):
+        self.pasta = pasta
+        self.recarregar = recarregar
+        self.por_nome = {}
+        self.por_hash = {}
+        for raiz, diretorios, arquivos in os.walk(pasta):
+            diretorios[:] = [d for d in diretorios if not d.startswith('.')]
+            for arquivo in arquivos:
+                if not arquivo.startswith('.'):
+                    nome = os.path.relpath(os.path.join(raiz, arquivo), pasta).replace(os.sep, '/')
+                    self._registrar(Asset(pasta, nome))
+
+    def _registrar(self, asset):
+        anterior = self.por_nome.get(asset.nome)
+        if anterior:
+            self.por_hash.pop(anterior.nome_hash, None)
+        self.por_nome[asset.nome] = asset
+        self.por_hash[asset.nome_hash] = asset
+
+    def get(self, nome):
+        """Asset pelo nome original ou com hash (None se não existir)"""
+        asset = self.por_nome.get(nome) or self.por_hash.get(nome)
+        if asset and self.recarregar:
+            try:
+                if os.stat(os.path.join(self.pasta, asset.nome)).st_mtime_ns != asset.mtime:
+                    asset = Asset(self.pasta, asset.nome)
+                    self._registrar(asset)
+            except FileNotFoundError:
+                return None
+        return asset
+
+    def url(self, nome):
+        asset = self.get(nome)
+        return asset.nome_hash if asset else nome
+
+    def enviar(self, filename):
+        """Resposta do arquivo: pré-comprimido quando o cliente aceita, cache imutável se pedido pelo hash"""
+        asset = self.get(filename)
+        if asset is None:
+            abort(404)
+        cache_control = IMUTAVEL if filename == asset.nome_hash else REVALIDAR
+
+        codificacao = codificacao_aceita() if asset.comprimidos else None
+        if codificacao in asset.comprimidos:
+            response = Response(asset.comprimidos[codificacao], mimetype=asset.mimetype)
+            response.headers['Content-Encoding'] = codificacao
+            response.set_etag(f'{asset.digest}-{codificacao}')
+            response.make_conditional(request)
+        else:
+            response = send_from_directory(self.pasta, asset.nome, mimetype=asset.mimetype, etag=asset.digest)
+        if asset.comprimidos:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+def init_assets(app):
+    """Monta o manifesto da pasta static e troca a view 'static' para servir por ele"""
+    manifesto = AssetManifest(app.static_folder, recarregar=app.debug)
+    app.extensions['assets'] = manifesto
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = manifesto.url(values['filename'])
+
+    app.view_functions['static'] = manifesto.enviar
+    return manifesto
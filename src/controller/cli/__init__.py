@@ -0,0 +1,10 @@
+# CLI - Comandos do Flask (flask --app src.main <comando>)
+# Todos os arquivos nesta pasta definem comandos de linha de comando
+
+from .importacao import importar_cli
+from .seed import seed_cli
+
+__all__ = [
+    'importar_cli',
+    'seed_cli'
+]
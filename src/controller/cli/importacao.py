@@ -0,0 +1,34 @@
+import os
+import click
+from flask.cli import AppGroup
+from src.model.services.importacao_service import ImportacaoService, FORMATOS, TAMANHO_LOTE, formato_do_arquivo
+
+importar_cli = AppGroup("importar", help="Importação em massa de clientes e pets (CSV, JSON ou NDJSON).")
+
+def _executar(importar, arquivo, formato, rejeitados, lote):
+    formato = formato or formato_do_arquivo(arquivo)
+    rejeitados = rejeitados or f"{os.path.splitext(arquivo)[0]}.rejeitados.csv"
+    with open(arquivo, "rb") as entrada, open(rejeitados, "w", encoding="utf-8", newline="") as relatorio:
+        resumo = importar(entrada, formato, rejeitados=relatorio, tamanho_lote=lote)
+    click.echo(f"Lidos: {resumo['lidos']}  Importados: {resumo['importados']}  Rejeitados: {resumo['rejeitados']}")
+    if resumo["rejeitados"]:
+        click.echo(f"Linhas rejeitadas em {rejeitados}")
+
+def _opcoes(comando):
+    comando = click.option("--lote", default=TAMANHO_LOTE, show_default=True, help="Registros por transação")(comando)
+    comando = click.option("--rejeitados", type=click.Path(dir_okay=False),
+                           help="Relatório CSV das linhas rejeitadas (padrão: <arquivo>.rejeitados.csv)")(comando)
+    comando = click.option("--formato", type=click.Choice(FORMATOS), help="Padrão: pela extensão do arquivo")(comando)
+    return click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))(comando)
+
+@importar_cli.command("clientes")
+@_opcoes
+def importar_clientes(arquivo, formato, rejeitados, lote):
+    """Importa clientes (nome, cpf, telefone, email, endereco)."""
+    _executar(ImportacaoService().importar_clientes, arquivo, formato, rejeitados, lote)
+
+@importar_cli.command("pets")
+@_opcoes
+def importar_pets(arquivo, formato, rejeitados, lote):
+    """Importa pets (nome, especie, sexo, cliente_id ou cliente_cpf, raca, cor, peso, data_nascimento, observacoes)."""
+    _executar(ImportacaoService().importar_pets, arquivo, formato, rejeitados, lote)
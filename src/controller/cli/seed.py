@@ -0,0 +1,34 @@
+import time
+import click
+from src.model.models import db
+from src.model.services.seed_service import SeedService, PERFIS
+
+@click.command("seed")
+@click.option("--seed", "semente", default=42, show_default=True,
+              help="Semente do gerador (mesma semente, mesmos dados)")
+@click.option("--perfil", type=click.Choice(list(PERFIS)), default="demo", show_default=True,
+              help="Escala base; as opções abaixo sobrescrevem cada valor")
+@click.option("--clientes", type=click.IntRange(min=1))
+@click.option("--pets-por-cliente", type=click.FloatRange(min=0), help="Média de pets por cliente")
+@click.option("--funcionarios", type=click.IntRange(min=1))
+@click.option("--servicos", type=click.IntRange(min=1))
+@click.option("--agendamentos", type=click.IntRange(min=0))
+@click.option("--anos", type=click.FloatRange(min=0, min_open=True), help="Período coberto pelos agendamentos")
+@click.option("--ate", type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Data de referência (hoje) do histórico; fixe-a para reproduzir a mesma base")
+@click.option("--yes", is_flag=True, help="Não pedir confirmação")
+def seed_cli(semente, perfil, ate, yes, **escala):
+    """Apaga o banco e gera dados sintéticos determinísticos (clientes, pets, serviços, agendamentos...)."""
+    parametros = dict(PERFIS[perfil])
+    parametros.update({nome: valor for nome, valor in escala.items() if valor is not None})
+    if not yes:
+        click.confirm(f"Todas as tabelas de {db.engine.url} serão apagadas. "
+                      f"Continuar?", abort=True)
+
+    inicio = time.perf_counter()
+    def progresso(mensagem):
+        click.echo(f"[{time.perf_counter() - inicio:6.1f}s] {mensagem}")
+    service = SeedService(semente, ate.date() if ate else None)
+    totais = service.gerar(progresso=progresso, **parametros)
+    click.echo(f"Concluído em {time.perf_counter() - inicio:.1f}s: "
+               + ", ".join(f"{total} {tabela}" for tabela, total in totais.items()))
@@ -0,0 +1,55 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele apenas gzip é oferecido
+    brotli = None
+
+# Tipos de conteúdo que valem a pena comprimir (texto)
+COMPRIMIVEIS = {
+    'application/json', 'application/javascript', 'application/x-ndjson', 'image/svg+xml',
+    'text/css', 'text/csv', 'text/html', 'text/javascript', 'text/plain',
+}
+
+# Codificações aceitas, na ordem de preferência do servidor
+CODIFICACOES = ('br', 'gzip') if brotli else ('gzip',)
+
+def comprimir(conteudo, codificacao, maximo=False):
+    """Comprime bytes em gzip ou br; `maximo` para arquivos comprimidos uma única vez (estáticos)"""
+    if codificacao == 'br':
+        return brotli.compress(conteudo, quality=11 if maximo else 5)
+    return gzip.compress(conteudo, compresslevel=9 if maximo else 6, mtime=0)
+
+def codificacao_aceita():
+    """Melhor codificação aceita pelo cliente (Accept-Encoding), ou None"""
+    return request.accept_encodings.best_match(CODIFICACOES)
+
+def init_compression(app):
+    """Comprime as respostas de texto acima de COMPRESSAO_MINIMO bytes conforme Accept-Encoding
+
+    Respostas em fluxo (exportações) e arquivos enviados com send_file ficam
+    de fora: as primeiras não têm o corpo inteiro em memória e os estáticos
+    já são servidos pré-comprimidos pelo manifesto de assets.
+    """
+    minimo = app.config.get('COMPRESSAO_MINIMO', 1024)
+
+    @app.after_request
+    def comprimir_resposta(response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRIMIVEIS or 'Content-Encoding' in response.headers
+                or (response.content_length or 0) < minimo):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        codificacao = codificacao_aceita()
+        if not codificacao:
+            return response
+
+        response.set_data(comprimir(response.get_data(), codificacao))
+        response.headers['Content-Encoding'] = codificacao
+        # A representação comprimida não é idêntica byte a byte: ETag forte vira fraca
+        etag, fraca = response.get_etag()
+        if etag and not fraca:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,64 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele usa o json da biblioteca padrão
+    orjson = None
+
+def _default(obj):
+    """Tipos que nenhum dos dois codificadores conhece; datas em ISO 8601, como em to_dict()"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+class JSONProvider(DefaultJSONProvider):
+    """Provider JSON do app: orjson quando instalado, json da biblioteca padrão caso contrário
+
+    Mantém as opções do provider padrão do Flask (sort_keys, indentação em
+    modo debug). Datas e datetimes viram ISO 8601 nos dois casos, então os
+    serializers de src/model/serializers.py podem entregar os valores nativos.
+    Chamadas com argumentos extras (ex: indent do filtro tojson) usam o json
+    da biblioteca padrão, que os entende.
+    """
+
+    default = staticmethod(_default)
+
+    def _opcoes(self, indentar=False):
+        opcoes = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            opcoes |= orjson.OPT_SORT_KEYS
+        if indentar:
+            opcoes |= orjson.OPT_INDENT_2
+        return opcoes
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._opcoes()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        corpo = orjson.dumps(obj, default=_default, option=self._opcoes(indentar))
+        return self._app.response_class(corpo + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,167 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from flask import Response, abort, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Limites dos buckets dos histogramas (como os padrões do cliente Prometheus)
+LIMITES_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LIMITES_TAMANHO = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LIMITES_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Estado da requisição atual: [início, consultas SQL, tempo SQL]. None fora de
+# requisições (inicialização, CLI, thread da réplica): o SQL não é medido.
+_requisicao = ContextVar('metricas_requisicao', default=None)
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _rotulos(nomes, valores, extra=''):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+class Contador:
+    """Contador Prometheus por combinação de rótulos"""
+
+    def __init__(self, nome, ajuda, rotulos):
+        self.nome, self.ajuda, self.rotulos = nome, ajuda, rotulos
+        self.series = {}
+
+    def incrementar(self, valores, quantidade=1):
+        self.series[valores] = self.series.get(valores, 0) + quantidade
+
+    def exportar(self):
+        linhas = [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} counter']
+        for valores, total in sorted(self.series.items()):
+            linhas.append(f'{self.nome}{_rotulos(self.rotulos, valores)} {total}')
+        return linhas
+
+class Histograma:
+    """Histograma Prometheus por combinação de rótulos
+
+    Cada série guarda a contagem de cada bucket (não acumulada, para o registro
+    ser um único bisect) seguida da soma; as contagens acumuladas de le=
+    são calculadas apenas na exportação.
+    """
+
+    def __init__(self, nome, ajuda, rotulos, limites):
+        self.nome, self.ajuda, self.rotulos, self.limites = nome, ajuda, rotulos, limites
+        self.series = {}
+
+    def observar(self, valores, valor):
+        serie = self.series.get(valores)
+        if serie is None:
+            serie = self.series[valores] = [0] * (len(self.limites) + 2)
+        serie[bisect_left(self.limites, valor)] += 1
+        serie[-1] += valor
+
+    def exportar(self):
+        linhas = [f'# HELP {self.nome} {self.ajuda}', f'# TYPE {self.nome} histogram']
+        for valores, serie in sorted(self.series.items()):
+            acumulado = 0
+            for limite, contagem in zip((*self.limites, '+Inf'), serie):
+                acumulado += contagem
+                rotulos = _rotulos(self.rotulos, valores, f'le="{limite}"')
+                linhas.append(f'{self.nome}_bucket{rotulos} {acumulado}')
+            linhas.append(f'{self.nome}_sum{_rotulos(self.rotulos, valores)} {serie[-1]}')
+            linhas.append(f'{self.nome}_count{_rotulos(self.rotulos, valores)} {acumulado}')
+        return linhas
+
+class Metricas:
+    """Métricas das requisições por endpoint, em memória no processo"""
+
+    def __init__(self):
+        self._trava = Lock()
+        rotulos = ('endpoint', 'method')
+        self.requisicoes = Contador('petshop_http_requests_total', 'Requisições atendidas',
+                                    ('endpoint', 'method', 'status'))
+        self.duracao = Histograma('petshop_http_request_duration_seconds', 'Duração das requisições em segundos',
+                                  rotulos, LIMITES_DURACAO)
+        self.tamanho = Histograma('petshop_http_response_size_bytes', 'Tamanho do corpo das respostas em bytes',
+                                  rotulos, LIMITES_TAMANHO)
+        self.consultas = Histograma('petshop_sql_statements', 'Comandos SQL executados por requisição',
+                                    rotulos, LIMITES_CONSULTAS)
+        self.tempo_sql = Contador('petshop_sql_duration_seconds_total', 'Tempo total em comandos SQL em segundos',
+                                  rotulos)
+
+    def registrar(self, endpoint, metodo, status, duracao, tamanho, consultas, tempo_sql):
+        """Registra uma requisição; tamanho None (resposta em fluxo) não entra no histograma de tamanho"""
+        chave = (endpoint, metodo)
+        with self._trava:
+            self.requisicoes.incrementar((endpoint, metodo, status))
+            self.duracao.observar(chave, duracao)
+            self.consultas.observar(chave, consultas)
+            self.tempo_sql.incrementar(chave, tempo_sql)
+            if tamanho is not None:
+                self.tamanho.observar(chave, tamanho)
+
+    def exportar(self):
+        """Todas as métricas no formato de texto do Prometheus"""
+        with self._trava:
+            linhas = []
+            for metrica in (self.requisicoes, self.duracao, self.tamanho, self.consultas, self.tempo_sql):
+                linhas += metrica.exportar()
+        return '\n'.join(linhas) + '\n'
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _antes_do_sql(conn, cursor, statement, parameters, context, executemany):
+    if _requisicao.get() is not None:
+        conn.info['metricas_inicio'] = perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _depois_do_sql(conn, cursor, statement, parameters, context, executemany):
+    estado = _requisicao.get()
+    inicio = conn.info.pop('metricas_inicio', None)
+    if estado is not None and inicio is not None:
+        estado[1] += 1
+        estado[2] += perf_counter() - inicio
+
+def init_metrics(app):
+    """Mede latência, comandos SQL, tempo SQL e tamanho da resposta de cada requisição
+
+    Deve ser chamado antes de init_compression: os hooks after_request rodam
+    na ordem inversa do registro, então o tamanho medido é o do corpo já
+    comprimido. As métricas ficam em GET /metrics (formato Prometheus),
+    protegido por METRICS_TOKEN quando configurado (sem ele, a aplicação
+    deve manter a rota atrás do login). Com SERVER_TIMING, a
+    resposta traz o cabeçalho Server-Timing (app e db). Em respostas em fluxo,
+    a duração vai até o início do envio.
+    """
+    metricas = app.extensions['metricas'] = Metricas()
+    server_timing = app.config.get('SERVER_TIMING', False)
+    token = app.config.get('METRICS_TOKEN')
+
+    @app.before_request
+    def iniciar_medicao():
+        _requisicao.set([perf_counter(), 0, 0.0])
+
+    @app.after_request
+    def registrar_medicao(response):
+        estado = _requisicao.get()
+        if estado is None:
+            return response
+        inicio, consultas, tempo_sql = estado
+        duracao = perf_counter() - inicio
+        tamanho = None if response.is_streamed else response.content_length
+        requisicao = request._get_current_object()  # um acesso ao proxy em vez de dois
+        metricas.registrar(requisicao.endpoint or 'desconhecido', requisicao.method, response.status_code,
+                           duracao, tamanho, consultas, tempo_sql)
+        if server_timing:
+            response.headers['Server-Timing'] = (f'app;dur={duracao * 1000:.1f}, '
+                                                 f'db;dur={tempo_sql * 1000:.1f};desc="{consultas} consultas"')
+        return response
+
+    @app.teardown_request
+    def encerrar_medicao(exc):
+        _requisicao.set(None)
+
+    def exportar_metricas():
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            abort(401)
+        return Response(metricas.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_url_rule('/metrics', 'metrics', exportar_metricas)
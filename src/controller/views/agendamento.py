@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
 from src.model.services.agendamento_service import AgendamentoService
 from src.model.services.cliente_service import ClienteService
 from src.model.services.funcionario_service import FuncionarioService
@@ -16,7 +16,7 @@ def listar():
     try:
         # Parâmetros de filtro e paginação
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        per_page = request.args.get('per_page', current_app.config['ITEMS_PER_PAGE'], type=int)
         search = request.args.get('search', '', type=str)
         status = request.args.get('status', '', type=str)
         cliente_id = request.args.get('cliente_id', '', type=str)
@@ -24,75 +24,28 @@ def listar():
         data_inicio = request.args.get('data_inicio', '', type=str)
         data_fim = request.args.get('data_fim', '', type=str)
         
-        # Buscar todos os agendamentos
-        agendamentos = agendamento_service.get_all_agendamentos()
+        pagination = agendamento_service.search(search=search, status=status,
+                                                cliente_id=int(cliente_id) if cliente_id else None,
+                                                funcionario_id=int(funcionario_id) if funcionario_id else None,
+                                                data_inicio=data_inicio, data_fim=data_fim,
+                                                page=page, per_page=per_page, profile='list')
         
-        # Aplicar filtros
-        if search:
-            agendamentos = [a for a in agendamentos if 
-                           (a.cliente and search.lower() in a.cliente.nome.lower()) or
-                           (a.servico and search.lower() in a.servico.nome.lower()) or
-                           (a.funcionario and search.lower() in a.funcionario.nome.lower()) or
-                           (a.observacoes and search.lower() in a.observacoes.lower())]
-        
-        if status:
-            agendamentos = [a for a in agendamentos if a.status == status]
-            
-        if cliente_id:
-            agendamentos = [a for a in agendamentos if str(a.cliente_id) == cliente_id]
-            
-        if funcionario_id:
-            agendamentos = [a for a in agendamentos if str(a.funcionario_id) == funcionario_id]
-        
-        # Filtro por data
-        if data_inicio:
-            data_inicio_dt = datetime.strptime(data_inicio, '%Y-%m-%d')
-            agendamentos = [a for a in agendamentos if a.data_agendamento >= data_inicio_dt]
-            
-        if data_fim:
-            data_fim_dt = datetime.strptime(data_fim, '%Y-%m-%d')
-            agendamentos = [a for a in agendamentos if a.data_agendamento <= data_fim_dt]
-        
-        # Ordenar por data de agendamento
-        agendamentos.sort(key=lambda x: x.data_agendamento, reverse=True)
-        
-        # Paginação manual
-        total = len(agendamentos)
-        start = (page - 1) * per_page
-        end = start + per_page
-        agendamentos_paginados = agendamentos[start:end]
-        
-        # Calcular informações da paginação
-        has_prev = page > 1
-        has_next = end < total
-        prev_num = page - 1 if has_prev else None
-        next_num = page + 1 if has_next else None
-        total_pages = (total + per_page - 1) // per_page
-        
-        # Obter dados para filtros
-        clientes = cliente_service.get_all_clientes()
-        funcionarios = funcionario_service.get_all_funcionarios()
+        # Obter dados para filtros: o cliente é escolhido pelo autocomplete
+        # (/clientes/buscar); só o selecionado é carregado
+        cliente_selecionado = cliente_service.get_cliente_by_id(int(cliente_id)) if cliente_id else None
+        funcionarios = funcionario_service.get_funcionarios_opcoes()
         status_disponiveis = agendamento_service.get_status_disponiveis()
         
         return render_template('agendamentos/listar.html',
-                             agendamentos=agendamentos_paginados,
-                             pagination={
-                                 'page': page,
-                                 'per_page': per_page,
-                                 'total': total,
-                                 'has_prev': has_prev,
-                                 'has_next': has_next,
-                                 'prev_num': prev_num,
-                                 'next_num': next_num,
-                                 'pages': total_pages
-                             },
+                             agendamentos=pagination.items,
+                             pagination=pagination,
                              search=search,
                              status_filtro=status,
                              cliente_filtro=cliente_id,
                              funcionario_filtro=funcionario_id,
                              data_inicio_filtro=data_inicio,
                              data_fim_filtro=data_fim,
-                             clientes=clientes,
+                             cliente_selecionado=cliente_selecionado,
                              funcionarios=funcionarios,
                              status_disponiveis=status_disponiveis)
     except Exception as e:
@@ -170,7 +123,7 @@ def criar():
 @agendamento_views_bp.route('/agendamentos/<int:id>')
 def visualizar(id):
     try:
-        agendamento = agendamento_service.get_agendamento_by_id(id)
+        agendamento = agendamento_service.get_agendamento_by_id(id, profile='detail')
         if not agendamento:
             flash('Agendamento não encontrado', 'warning')
             return redirect(url_for('agendamento_views.listar'))
@@ -188,7 +141,7 @@ def visualizar(id):
 @agendamento_views_bp.route('/agendamentos/<int:id>/editar')
 def editar(id):
     try:
-        agendamento = agendamento_service.get_agendamento_by_id(id)
+        agendamento = agendamento_service.get_agendamento_by_id(id, profile='detail')
         if not agendamento:
             flash('Agendamento não encontrado', 'warning')
             return redirect(url_for('agendamento_views.listar'))
@@ -1,7 +1,5 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash
 from src.model.services.cliente_service import ClienteService
-from sqlalchemy import or_
-import math
 
 cliente_views_bp = Blueprint("cliente_views", __name__)
 cliente_service = ClienteService()
@@ -10,52 +8,14 @@ cliente_service = ClienteService()
 def listar_clientes():
     """Página de listagem de clientes"""
     page = request.args.get("page", 1, type=int)
-    per_page = 10
+    per_page = current_app.config["ITEMS_PER_PAGE"]
     search = request.args.get("search", "", type=str)
     status = request.args.get("status", "", type=str)
 
     try:
-        # A lógica de filtragem e paginação precisará ser movida para o service ou um novo método no service
-        # Por enquanto, vamos simplificar para listar todos os clientes ativos
-        clientes = cliente_service.get_all_clientes()
-
-        # TODO: Implementar busca e paginação no ClienteService
-        # Para fins de demonstração, vamos filtrar e paginar aqui temporariamente
-        if search:
-            clientes = [c for c in clientes if search.lower() in c.nome.lower() or search.lower() in c.cpf.lower() or (c.email and search.lower() in c.email.lower())]
-        if status == 'true':
-            clientes = [c for c in clientes if c.ativo]
-        elif status == 'false':
-            clientes = [c for c in clientes if not c.ativo]
-
-        total_clientes = len(clientes)
-        total_pages = math.ceil(total_clientes / per_page)
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        clientes_paginados = clientes[start_index:end_index]
-
-        # Criar um objeto de paginação simulado para o template
-        class Pagination:
-            def __init__(self, page, per_page, total_count, items):
-                self.page = page
-                self.per_page = per_page
-                self.total = total_count
-                self.items = items
-                self.pages = math.ceil(total_count / per_page)
-                self.has_next = self.page < self.pages
-                self.has_prev = self.page > 1
-
-            def iter_pages(self, left_edge=2, left_current=2, right_current=5, right_edge=2):
-                last_page = self.pages
-                for num in range(1, last_page + 1):
-                    if num <= left_edge or \
-                       (num > self.page - left_current - 1 and num < self.page + right_current) or \
-                       num > last_page - right_edge:
-                        yield num
-
-        pagination = Pagination(page, per_page, total_clientes, clientes_paginados)
-
-        return render_template("clientes/listar.html", clientes=clientes_paginados, pagination=pagination, search=search, status=status)
+        pagination = cliente_service.search(search=search, status=status, page=page, per_page=per_page)
+
+        return render_template("clientes/listar.html", clientes=pagination.items, pagination=pagination, search=search, status=status)
 
     except Exception as e:
         flash(f"Erro ao carregar clientes: {str(e)}", "error")
@@ -186,20 +146,18 @@ def buscar_clientes():
         if not query or len(query) < 2:
             return {"clientes": []}
 
-        # TODO: Mover esta lógica de busca para o ClienteService
-        clientes = cliente_service.get_all_clientes()
-        clientes_filtrados = [c for c in clientes if c.ativo and (query.lower() in c.nome.lower() or query.lower() in c.cpf.lower() or (c.email and query.lower() in c.email.lower()))]
+        clientes = cliente_service.autocomplete(query, limit=limit)
 
         return {
             "clientes": [
                 {
-                    "id": cliente.id,
-                    "nome": cliente.nome,
-                    "cpf": cliente.cpf,
-                    "telefone": cliente.telefone,
-                    "email": cliente.email,
+                    "id": cliente["id"],
+                    "nome": cliente["nome"],
+                    "cpf": cliente["cpf"],
+                    "telefone": cliente["telefone"],
+                    "email": cliente["email"],
                 }
-                for cliente in clientes_filtrados[:limit]
+                for cliente in clientes
             ]
         }
 
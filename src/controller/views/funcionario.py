@@ -1,7 +1,5 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash
 from src.model.services.funcionario_service import FuncionarioService
-from sqlalchemy import or_
-import math
 
 funcionario_views_bp = Blueprint("funcionario_views", __name__)
 funcionario_service = FuncionarioService()
@@ -10,52 +8,14 @@ funcionario_service = FuncionarioService()
 def listar_funcionarios():
     """Página de listagem de funcionários"""
     page = request.args.get("page", 1, type=int)
-    per_page = 10
+    per_page = current_app.config["ITEMS_PER_PAGE"]
     search = request.args.get("search", "", type=str)
     status = request.args.get("status", "", type=str)
 
     try:
-        # A lógica de filtragem e paginação precisará ser movida para o service ou um novo método no service
-        # Por enquanto, vamos simplificar para listar todos os funcionários ativos
-        funcionarios = funcionario_service.get_all_funcionarios()
+        pagination = funcionario_service.search(search=search, status=status, page=page, per_page=per_page)
 
-        # TODO: Implementar busca e paginação no FuncionarioService
-        # Para fins de demonstração, vamos filtrar e paginar aqui temporariamente
-        if search:
-            funcionarios = [f for f in funcionarios if search.lower() in f.nome.lower() or search.lower() in f.cpf.lower() or (f.email and search.lower() in f.email.lower()) or search.lower() in f.cargo.lower()]
-        if status == 'true':
-            funcionarios = [f for f in funcionarios if f.ativo]
-        elif status == 'false':
-            funcionarios = [f for f in funcionarios if not f.ativo]
-
-        total_funcionarios = len(funcionarios)
-        total_pages = math.ceil(total_funcionarios / per_page)
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        funcionarios_paginados = funcionarios[start_index:end_index]
-
-        # Criar um objeto de paginação simulado para o template
-        class Pagination:
-            def __init__(self, page, per_page, total_count, items):
-                self.page = page
-                self.per_page = per_page
-                self.total = total_count
-                self.items = items
-                self.pages = math.ceil(total_count / per_page)
-                self.has_next = self.page < self.pages
-                self.has_prev = self.page > 1
-
-            def iter_pages(self, left_edge=2, left_current=2, right_current=5, right_edge=2):
-                last_page = self.pages
-                for num in range(1, last_page + 1):
-                    if num <= left_edge or \
-                       (num > self.page - left_current - 1 and num < self.page + right_current) or \
-                       num > last_page - right_edge:
-                        yield num
-
-        pagination = Pagination(page, per_page, total_funcionarios, funcionarios_paginados)
-
-        return render_template("funcionarios/listar.html", funcionarios=funcionarios_paginados, pagination=pagination, search=search, status=status)
+        return render_template("funcionarios/listar.html", funcionarios=pagination.items, pagination=pagination, search=search, status=status)
 
     except Exception as e:
         flash(f"Erro ao carregar funcionários: {str(e)}", "error")
@@ -93,7 +53,7 @@ def novo_funcionario():
 def visualizar_funcionario(funcionario_id):
     """Página de visualização de funcionário"""
     try:
-        funcionario = funcionario_service.get_funcionario_by_id(funcionario_id)
+        funcionario = funcionario_service.get_funcionario_detalhe(funcionario_id)
         if not funcionario:
             flash("Funcionário não encontrado", "error")
             return redirect(url_for("funcionario_views.listar_funcionarios"))
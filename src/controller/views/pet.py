@@ -1,76 +1,33 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
 from src.model.services.pet_service import PetService
 from src.model.services.cliente_service import ClienteService
+from src.model.query_budget import query_budget
 from datetime import datetime
-import math
 
 pet_views_bp = Blueprint("pet_views", __name__)
 pet_service = PetService()
 cliente_service = ClienteService()
 
 @pet_views_bp.route("/pets")
+@query_budget(3)
 def listar_pets():
     """Página de listagem de pets"""
     page = request.args.get("page", 1, type=int)
-    per_page = 10
+    per_page = current_app.config["ITEMS_PER_PAGE"]
     search = request.args.get("search", "", type=str)
     status = request.args.get("status", "", type=str)
     especie = request.args.get("especie", "", type=str)
     cliente_id = request.args.get("cliente_id", type=int)
 
     try:
-        # Buscar todos os pets
-        if cliente_id:
-            pets = pet_service.get_pets_by_cliente_id(cliente_id)
-        else:
-            pets = pet_service.get_all_pets()
-
-        # Filtros
-        if search:
-            pets = [p for p in pets if search.lower() in p.nome.lower() or 
-                   search.lower() in p.dono.nome.lower() or 
-                   (p.raca and search.lower() in p.raca.lower())]
-        
-        if status == 'true':
-            pets = [p for p in pets if p.ativo]
-        elif status == 'false':
-            pets = [p for p in pets if not p.ativo]
-
-        if especie:
-            pets = [p for p in pets if p.especie == especie]
-
-        total_pets = len(pets)
-        total_pages = math.ceil(total_pets / per_page)
-        start_index = (page - 1) * per_page
-        end_index = start_index + per_page
-        pets_paginados = pets[start_index:end_index]
-
-        # Criar objeto de paginação simulado
-        class Pagination:
-            def __init__(self, page, per_page, total_count, items):
-                self.page = page
-                self.per_page = per_page
-                self.total = total_count
-                self.items = items
-                self.pages = math.ceil(total_count / per_page)
-                self.has_next = self.page < self.pages
-                self.has_prev = self.page > 1
-
-            def iter_pages(self, left_edge=2, left_current=2, right_current=5, right_edge=2):
-                last_page = self.pages
-                for num in range(1, last_page + 1):
-                    if num <= left_edge or \
-                       (num > self.page - left_current - 1 and num < self.page + right_current) or \
-                       num > last_page - right_edge:
-                        yield num
-
-        pagination = Pagination(page, per_page, total_pets, pets_paginados)
+        pagination = pet_service.search(search=search, status=status, especie=especie,
+                                        cliente_id=cliente_id, page=page, per_page=per_page)
 
         # Dados para filtros
         especies = pet_service.get_especies_disponiveis()
         
         return render_template("pets/listar.html", 
-                             pets=pets_paginados, 
+                             pets=pagination.items, 
                              pagination=pagination, 
                              search=search, 
                              status=status,
@@ -269,26 +226,18 @@ def buscar_pets():
         if not query or len(query) < 2:
             return jsonify({"pets": []})
 
-        # Buscar pets
-        if cliente_id:
-            pets = pet_service.get_active_pets_by_cliente_id(cliente_id)
-        else:
-            pets = [p for p in pet_service.get_all_pets() if p.ativo]
-
-        # Filtrar por query
-        pets_filtrados = [p for p in pets if query.lower() in p.nome.lower() or 
-                         (p.raca and query.lower() in p.raca.lower())]
+        pets = pet_service.autocomplete(query, limit=limit, cliente_id=cliente_id)
 
         return jsonify({
             "pets": [
                 {
-                    "id": pet.id,
-                    "nome": pet.nome,
-                    "especie": pet.especie,
-                    "raca": pet.raca,
-                    "dono": pet.dono.nome,
+                    "id": pet["id"],
+                    "nome": pet["nome"],
+                    "especie": pet["especie"],
+                    "raca": pet["raca"],
+                    "dono": pet["dono"],
                 }
-                for pet in pets_filtrados[:limit]
+                for pet in pets
             ]
         })
 
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
 from src.model.services.servico_service import ServicoService
 
 servico_views_bp = Blueprint('servico_views', __name__)
@@ -9,55 +9,20 @@ def listar():
     try:
         # Parâmetros de filtro e paginação
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        per_page = request.args.get('per_page', current_app.config['ITEMS_PER_PAGE'], type=int)
         search = request.args.get('search', '', type=str)
         categoria = request.args.get('categoria', '', type=str)
         status = request.args.get('status', '', type=str)
         
-        # Buscar todos os serviços
-        servicos = servico_service.get_all_servicos()
-        
-        # Aplicar filtros
-        if search:
-            servicos = [s for s in servicos if search.lower() in s.nome.lower() or 
-                       (s.descricao and search.lower() in s.descricao.lower())]
-        
-        if categoria:
-            servicos = [s for s in servicos if s.categoria == categoria]
-            
-        if status == 'ativo':
-            servicos = [s for s in servicos if s.ativo]
-        elif status == 'inativo':
-            servicos = [s for s in servicos if not s.ativo]
-        
-        # Paginação manual
-        total = len(servicos)
-        start = (page - 1) * per_page
-        end = start + per_page
-        servicos_paginados = servicos[start:end]
-        
-        # Calcular informações da paginação
-        has_prev = page > 1
-        has_next = end < total
-        prev_num = page - 1 if has_prev else None
-        next_num = page + 1 if has_next else None
-        total_pages = (total + per_page - 1) // per_page
+        pagination = servico_service.search(search=search, categoria=categoria, status=status,
+                                            page=page, per_page=per_page)
         
         # Obter categorias para o filtro
         categorias = servico_service.get_categorias_disponiveis()
         
         return render_template('servicos/listar.html',
-                             servicos=servicos_paginados,
-                             pagination={
-                                 'page': page,
-                                 'per_page': per_page,
-                                 'total': total,
-                                 'has_prev': has_prev,
-                                 'has_next': has_next,
-                                 'prev_num': prev_num,
-                                 'next_num': next_num,
-                                 'pages': total_pages
-                             },
+                             servicos=pagination.items,
+                             pagination=pagination,
                              search=search,
                              categoria_filtro=categoria,
                              status_filtro=status,
@@ -111,7 +76,7 @@ def criar():
 @servico_views_bp.route('/servicos/<int:id>')
 def visualizar(id):
     try:
-        servico = servico_service.get_servico_by_id(id)
+        servico = servico_service.get_servico_detalhe(id)
         if not servico:
             flash('Serviço não encontrado', 'warning')
             return redirect(url_for('servico_views.listar'))
@@ -1,15 +1,24 @@
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from flask import Flask, send_from_directory, render_template, session, redirect, url_for, flash, request
+from flask import Flask, render_template, session, redirect, url_for, flash, request
 from functools import wraps
 from flask_cors import CORS
 
 # Adicionar o diretório pai ao path para permitir importações
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.config import config
 from src.model.models import db
+from src.model.engine import init_engine, init_replica
+from src.model.migrations import init_migrate
+from src.model.query_budget import init_query_budget
+from src.controller.assets import init_assets
+from src.controller.compression import init_compression
+from src.controller.metrics import init_metrics
+from src.controller.json_provider import JSONProvider
 from src.model.services.cliente_service import ClienteService
+from src.model.repositories.autocomplete_repository import AutocompleteRepository
 
 # Importar rotas de API (backend - JSON)
 from src.controller.api.user import user_bp
@@ -18,6 +27,14 @@ from src.controller.api.pet import pet_bp
 from src.controller.api.funcionario import funcionario_bp
 from src.controller.api.servico import servico_bp
 from src.controller.api.agendamento import agendamento_bp
+from src.controller.api.busca import busca_bp
+from src.controller.api.disponibilidade import disponibilidade_bp
+from src.controller.api.importacao import importacao_bp
+from src.controller.api.exportacao import exportacao_bp
+
+# Comandos de linha de comando (flask --app src.main importar clientes arquivo.csv, flask --app src.main seed)
+from src.controller.cli.importacao import importar_cli
+from src.controller.cli.seed import seed_cli
 
 # Importar views (frontend - HTML templates)
 from src.controller.views.cliente import cliente_views_bp
@@ -31,13 +48,24 @@ app = Flask(__name__,
             static_folder=os.path.join(os.path.dirname(__file__), 'view', 'static'),
             template_folder=os.path.join(os.path.dirname(__file__), 'view', 'templates'))
 
-# Configurações
-app.config['SECRET_KEY'] = 'petshop_erp_secret_key_2024'
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'model', 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Configurações do ambiente (FLASK_CONFIG=development|production|testing; padrão development)
+app.config.from_object(config[os.environ.get('FLASK_CONFIG', 'default')])
+
+# JSON das respostas com orjson (quando instalado) e datas em ISO 8601
+app.json = JSONProvider(app)
+
+# Configurar CORS com as origens permitidas pela configuração
+CORS(app, origins=app.config['CORS_ORIGINS'])
+
+# Métricas por endpoint em /metrics (antes da compressão: mede o tamanho já comprimido)
+init_metrics(app)
+
+# Orçamento de SQL e detecção de N+1 por requisição (QUERY_BUDGET: testes e desenvolvimento)
+init_query_budget(app)
 
-# Configurar CORS para permitir requisições de qualquer origem
-CORS(app, origins="*")
+# Estáticos com impressão digital (cache imutável) e compressão gzip/brotli das respostas
+init_assets(app)
+init_compression(app)
 
 # Registrar blueprints de API (backend - JSON endpoints)
 app.register_blueprint(user_bp, url_prefix='/api')
@@ -46,6 +74,14 @@ app.register_blueprint(pet_bp, url_prefix='/api')
 app.register_blueprint(funcionario_bp, url_prefix='/api')
 app.register_blueprint(servico_bp, url_prefix='/api')
 app.register_blueprint(agendamento_bp, url_prefix='/api')
+app.register_blueprint(busca_bp, url_prefix='/api')
+app.register_blueprint(disponibilidade_bp, url_prefix='/api')
+app.register_blueprint(importacao_bp, url_prefix='/api')
+app.register_blueprint(exportacao_bp, url_prefix='/api')
+
+# Registrar comandos de CLI
+app.cli.add_command(importar_cli)
+app.cli.add_command(seed_cli)
 
 # Registrar blueprints de Views (frontend - HTML templates)
 app.register_blueprint(cliente_views_bp)  # Sem prefixo /api
@@ -55,12 +91,22 @@ app.register_blueprint(servico_views_bp)  # Sem prefixo /api
 app.register_blueprint(agendamento_views_bp)  # Sem prefixo /api
 app.register_blueprint(auth_views_bp)  # Sem prefixo /api
 
-# Inicializar banco de dados
+# Inicializar banco de dados (PRAGMAs do SQLite em cada nova conexão do pool)
 db.init_app(app)
+init_engine(app, db)
+
+# Migrações (Alembic via Flask-Migrate): flask --app src.main db upgrade
+# O esquema além das tabelas (colunas novas, triggers, índice de busca) vem só das migrações
+migrate = init_migrate(app, db)
 
 # Criar tabelas
 with app.app_context():
     db.create_all()
+    # Índice de autocomplete em memória (clientes e pets)
+    AutocompleteRepository().build()
+
+# Réplica de leitura SQLite (DATABASE_REPLICA_URL): primeira cópia e atualização periódica
+init_replica(app, db)
 
 def login_required(f):
     @wraps(f)
@@ -75,6 +121,9 @@ def login_required(f):
 def before_request():    
     # Lista de endpoints que não precisam de autenticação
     public_endpoints = ['auth_views.login', 'auth_views.register', 'api_info', 'static']
+    # /metrics fica fora do login apenas quando protegido por METRICS_TOKEN
+    if app.config.get('METRICS_TOKEN'):
+        public_endpoints.append('metrics')
     
     if request.endpoint and not any(endpoint in request.endpoint for endpoint in public_endpoints):
         if 'logged_in' not in session or not session['logged_in']:
@@ -89,63 +138,18 @@ def before_request():
 @login_required
 def dashboard():
     """Dashboard principal do sistema"""
-    from src.model.models import Cliente, Pet, Funcionario, Servico, Agendamento
-    from datetime import datetime, date
-    
+    from src.model.services.dashboard_service import DashboardService
+
     try:
-        # Estatísticas básicas usando query direta
-        total_clientes = Cliente.query.count()
-        clientes_ativos = Cliente.query.filter_by(ativo=True).count()
-        
-        total_pets = Pet.query.count()
-        pets_ativos = Pet.query.filter_by(ativo=True).count()
-        
-        total_funcionarios = Funcionario.query.count()
-        funcionarios_ativos = Funcionario.query.filter_by(ativo=True).count()
-        
-        total_servicos = Servico.query.count()
-        servicos_ativos = Servico.query.filter_by(ativo=True).count()
-
-        # Agendamentos
-        total_agendamentos = Agendamento.query.count()
-        
-        # Agendamentos de hoje
-        hoje = date.today()
-        agendamentos_hoje = Agendamento.query.filter(
-            db.func.date(Agendamento.data_agendamento) == hoje
-        ).all()
-        
-        # Agendamentos pendentes (agendado, confirmado, em_andamento)
-        status_pendentes = ['agendado', 'confirmado', 'em_andamento']
-        agendamentos_pendentes = Agendamento.query.filter(
-            Agendamento.status.in_(status_pendentes)
-        ).count()
+        resumo = DashboardService().get_resumo()
 
-        stats = {
-            'total_clientes': total_clientes,
-            'clientes_ativos': clientes_ativos,
-            'total_pets': total_pets,
-            'pets_ativos': pets_ativos,
-            'total_funcionarios': total_funcionarios,
-            'funcionarios_ativos': funcionarios_ativos,
-            'total_servicos': total_servicos,
-            'servicos_ativos': servicos_ativos,
-            'total_agendamentos': total_agendamentos,
-            'agendamentos_hoje': len(agendamentos_hoje),
-            'agendamentos_pendentes': agendamentos_pendentes
-        }
-        
-        # Dados recentes para exibição
-        clientes_recentes = Cliente.query.filter_by(ativo=True).order_by(Cliente.data_cadastro.desc()).limit(5).all()
-        agendamentos_hoje_lista = agendamentos_hoje[:5]  # Mostrar apenas os primeiros 5
-        
-        return render_template('dashboard.html', 
-                             stats=stats,
-                             clientes_recentes=clientes_recentes,
-                             agendamentos_hoje=agendamentos_hoje_lista)
+        return render_template('dashboard.html',
+                             stats=resumo['stats'],
+                             clientes_recentes=resumo['clientes_recentes'],
+                             agendamentos_hoje=resumo['agendamentos_hoje'])
                              
-    except Exception as e:
-        print(f"Erro no dashboard: {e}")
+    except Exception:
+        app.logger.exception('Erro no dashboard')
         # Em caso de erro, retornar dashboard com dados vazios
         stats = {
             'total_clientes': 0,
@@ -180,13 +184,14 @@ def serve(path):
     if static_folder_path is None:
         return "Static folder not configured", 404
 
-    if os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
+    # Existência verificada no manifesto de assets (em memória), sem acessar o disco
+    assets = app.extensions['assets']
+    if assets.get(path):
+        return assets.enviar(path)
     else:
         # Se arquivo não existe, verificar se existe index.html
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+        if assets.get('index.html'):
+            return assets.enviar('index.html')
         else:
             # Redirecionar para dashboard como fallback
             return dashboard()
@@ -204,10 +209,11 @@ def api_info():
                 "GET /api/clientes/{id}": "Buscar cliente por ID",
                 "PUT /api/clientes/{id}": "Atualizar cliente",
                 "DELETE /api/clientes/{id}": "Desativar cliente",
-                "GET /api/clientes/{id}/pets": "Listar pets do cliente"
+                "GET /api/clientes/{id}/pets": "Listar pets do cliente",
+                "GET /api/clientes/pets?ids=": "Pets de vários clientes, agrupados por cliente"
             },
             "pets": {
-                "GET /api/pets": "Listar todos os pets",
+                "GET /api/pets": "Listar todos os pets (?fields= e ?include=cliente)",
                 "POST /api/pets": "Criar novo pet",
                 "GET /api/pets/{id}": "Buscar pet por ID",
                 "PUT /api/pets/{id}": "Atualizar pet",
@@ -230,18 +236,34 @@ def api_info():
                 "GET /api/servicos/categoria/{categoria}": "Serviços por categoria"
             },
             "agendamentos": {
-                "GET /api/agendamentos": "Listar agendamentos (com filtros opcionais)",
+                "GET /api/agendamentos": "Listar agendamentos (com filtros opcionais, ?fields= e ?include=)",
                 "POST /api/agendamentos": "Criar novo agendamento",
+                "POST /api/agendamentos/lote": "Criar série de agendamentos recorrentes",
                 "GET /api/agendamentos/{id}": "Buscar agendamento por ID",
                 "PUT /api/agendamentos/{id}": "Atualizar agendamento",
                 "PUT /api/agendamentos/{id}/status": "Atualizar status do agendamento",
                 "DELETE /api/agendamentos/{id}": "Cancelar agendamento",
                 "GET /api/agendamentos/cliente/{cliente_id}": "Agendamentos por cliente",
                 "GET /api/agendamentos/funcionario/{funcionario_id}": "Agendamentos por funcionário"
+            },
+            "busca": {
+                "GET /api/busca?q=": "Busca global sem acentos em clientes, pets, serviços e agendamentos"
+            },
+            "disponibilidade": {
+                "GET /api/disponibilidade?servico_id=": "Horários livres por funcionário e dia para o serviço"
+            },
+            "importacao": {
+                "POST /api/import/clientes": "Importar clientes em massa (CSV, JSON ou NDJSON)",
+                "POST /api/import/pets": "Importar pets em massa (dono por cliente_id ou cliente_cpf)"
+            },
+            "exportacao": {
+                "GET /api/export/agendamentos": "Exportar agendamentos em CSV ou NDJSON (filtros de data e status)",
+                "GET /api/export/clientes": "Exportar clientes em CSV ou NDJSON",
+                "GET /api/export/pets": "Exportar pets em CSV ou NDJSON"
             }
         }
     }
     return routes_info
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    app.run(host='0.0.0.0', port=5000, debug=app.config.get('DEBUG', False))
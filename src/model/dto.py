@@ -0,0 +1,57 @@
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from src.model.models import db
+
+# Linhas de leitura das listagens: as mesmas colunas de to_dict(), sem objeto
+# do ORM (identity map, rastreamento de alterações, relacionamentos). Usam
+# __slots__, então cada linha ocupa só os campos. Os serializers e os
+# templates as consomem como os modelos (pet.nome, agendamento.status).
+
+@dataclass(slots=True)
+class AgendamentoDTO:
+    id: int
+    data_agendamento: datetime
+    data_criacao: datetime
+    status: str
+    observacoes: str
+    valor_estimado: float
+    tempo_estimado: int
+    data_fim: datetime
+    cliente_id: int
+    pet_id: int
+    servico_id: int
+    funcionario_id: int
+
+@dataclass(slots=True)
+class PetDTO:
+    id: int
+    nome: str
+    especie: str
+    raca: str
+    cor: str
+    sexo: str
+    data_nascimento: date
+    peso: float
+    observacoes: str
+    data_cadastro: datetime
+    ativo: bool
+    cliente_id: int
+
+def columns_for(dto, model):
+    """Colunas do modelo na ordem dos campos do DTO, para select(*columns_for(...))"""
+    return [getattr(model, campo.name) for campo in fields(dto)]
+
+def fetch_dtos(dto, query):
+    """Executa o select() na conexão da sessão, sem a camada de carregamento do ORM, e monta os DTOs
+
+    Sem autoflush: destinado às listagens, que não têm alterações pendentes.
+    A conexão é a da transação da sessão (inclusive a réplica em @read_only).
+    """
+    return [dto(*row) for row in db.session.connection().execute(query)]
+
+def fetch_rows(query):
+    """Como fetch_dtos, mas devolve as Rows do select() (para ?fields=, com só algumas colunas)
+
+    As Rows são lidas por atributo como os DTOs (row.id, row.status).
+    """
+    return db.session.connection().execute(query).all()
@@ -0,0 +1,157 @@
+import logging
+import os
+import sqlite3
+import threading
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+# Bind de SQLALCHEMY_BINDS usado como réplica de leitura
+REPLICA = 'replica'
+
+# Chaves em session.info: profundidade de somente_leitura() em andamento e
+# se a sessão já escreveu no banco principal
+CHAVE_LEITURA = 'read_only'
+CHAVE_ESCRITA = 'escreveu'
+
+def aplicar_pragmas(engine, pragmas):
+    """Executa os PRAGMAs em cada nova conexão SQLite do pool (outros bancos são ignorados)"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _aplicar(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nome} = {valor}')
+        cursor.close()
+
+def init_engine(app, db):
+    """Configura os engines do app conforme SQLITE_PRAGMAS; chamar antes da primeira conexão
+
+    As conexões da réplica também recebem query_only: uma escrita roteada
+    para ela por engano falha em vez de divergir do banco principal.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        for chave, engine in db.engines.items():
+            aplicar_pragmas(engine, {**pragmas, 'query_only': 'ON'} if chave == REPLICA else pragmas)
+
+class RoutingSession(Session):
+    """Sessão que envia as leituras de somente_leitura() para a réplica
+
+    Todo o resto vai para o banco principal: o flush, as leituras fora de
+    somente_leitura() e qualquer leitura depois de uma escrita na mesma
+    sessão (read-after-write), para que a requisição leia o que acabou de
+    gravar. Sem o bind 'replica' configurado tudo vai para o principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and self.info.get(CHAVE_LEITURA) and not self.info.get(CHAVE_ESCRITA)
+                and not self._flushing and REPLICA in self._db.engines):
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _marcar_flush(session, flush_context):
+    session.info[CHAVE_ESCRITA] = True
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _marcar_execucao(estado):
+    # INSERT/UPDATE/DELETE em lote e SQL textual de escrita não passam pelo flush
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        estado.session.info[CHAVE_ESCRITA] = True
+    elif isinstance(estado.statement, TextClause) and \
+            not estado.statement.text.lstrip().upper().startswith(('SELECT', 'WITH')):
+        estado.session.info[CHAVE_ESCRITA] = True
+
+def _arquivo_sqlite(engine):
+    """Caminho do arquivo de um engine SQLite (None para outros bancos e :memory:)"""
+    if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        return None
+    return engine.url.database
+
+class ReplicaSQLite:
+    """Réplica do banco principal em outro arquivo SQLite, copiada pela API de backup
+
+    A cópia é feita em uma única transação no arquivo da réplica: quem está
+    lendo dela continua vendo a versão anterior até o fim da sua consulta.
+    Só copia quando os arquivos do principal (banco e WAL) mudaram desde a
+    última cópia.
+    """
+
+    def __init__(self, origem, destino, intervalo=5):
+        self.origem = origem
+        self.destino = destino
+        self.intervalo = intervalo
+        self._copiada = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _assinatura(self):
+        assinatura = []
+        for caminho in (self.origem, f'{self.origem}-wal'):
+            try:
+                stat = os.stat(caminho)
+                assinatura.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def atualizar(self, forcar=False):
+        """Copia o principal para a réplica; retorna False se nada mudou desde a última cópia"""
+        with self._lock:
+            assinatura = self._assinatura()
+            if not forcar and assinatura == self._copiada:
+                return False
+            origem = sqlite3.connect(self.origem)
+            destino = sqlite3.connect(self.destino, timeout=30)
+            try:
+                origem.backup(destino)
+            finally:
+                destino.close()
+                origem.close()
+            self._copiada = assinatura
+            return True
+
+    def iniciar(self):
+        """Atualiza a réplica a cada `intervalo` segundos em uma thread de fundo"""
+        if self._thread is not None or self.intervalo <= 0:
+            return
+
+        def executar():
+            while not self._parar.wait(self.intervalo):
+                try:
+                    self.atualizar()
+                except sqlite3.Error:
+                    logger.exception('Erro ao atualizar a réplica')
+
+        self._thread = threading.Thread(target=executar, name='replica-sqlite', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def init_replica(app, db):
+    """Prepara a réplica SQLite, se houver: primeira cópia e atualização periódica
+
+    Chamar depois de criar as tabelas do banco principal. A instância fica em
+    app.extensions['replica'] (None quando não há réplica SQLite a copiar,
+    por exemplo sem o bind ou com uma réplica mantida pelo próprio servidor).
+    """
+    replica = None
+    with app.app_context():
+        if REPLICA in db.engines:
+            origem, destino = _arquivo_sqlite(db.engine), _arquivo_sqlite(db.engines[REPLICA])
+            if origem and destino:
+                replica = ReplicaSQLite(origem, destino, app.config.get('REPLICA_INTERVALO', 5))
+                replica.atualizar(forcar=True)
+                replica.iniciar()
+    app.extensions['replica'] = replica
+    return replica
@@ -0,0 +1,30 @@
+import os
+from flask_migrate import Migrate, stamp, upgrade
+from src.model.repositories.agendamento_repository import AgendamentoRepository
+from src.model.repositories.busca_repository import BuscaRepository, incluir_no_autogenerate
+
+# Revisões do Alembic (migrations/ na raiz do projeto)
+PASTA_MIGRACOES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                               'migrations')
+
+def init_migrate(app, db):
+    """Registra o Flask-Migrate: flask --app src.main db upgrade"""
+    return Migrate(app, db, directory=PASTA_MIGRACOES, render_as_batch=True,
+                   include_object=incluir_no_autogenerate)
+
+def aplicar_migracoes(refazer=False):
+    """Aplica as revisões pendentes no banco do app atual, como flask db upgrade
+
+    O esquema além dos modelos (triggers, índice FTS5, colunas e dados
+    migrados) vem só das migrações. Com refazer, todas as revisões rodam de
+    novo: para um banco cujas tabelas foram recriadas por create_all (todas
+    as revisões são idempotentes). Em seguida os repositórios verificam de
+    novo o que passou a existir no banco.
+    """
+    if refazer:
+        stamp(revision='base')
+    upgrade()
+    AgendamentoRepository._contadores = None
+    BuscaRepository._disponivel = None
+    AgendamentoRepository().contadores_disponiveis()
+    BuscaRepository().disponivel()
@@ -1,24 +1,29 @@
 from flask_sqlalchemy import SQLAlchemy
+from src.model.engine import RoutingSession
 
-# Instância única do SQLAlchemy
-db = SQLAlchemy()
+# Instância única do SQLAlchemy (sessão com leituras roteáveis para a réplica)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Importar todos os modelos
 from .cliente import Cliente
-from .pet import Pet
+from .pet import Pet, PetDesativadoComCliente
 from .funcionario import Funcionario
 from .servico import Servico
-from .agendamento import Agendamento
+from .agendamento import Agendamento, AgendamentoStatusContagem
 from .user import User
+from .versao import TabelaVersao
 
 # Exportar todos os modelos
 __all__ = [
     'db',
     'Cliente',
     'Pet', 
+    'PetDesativadoComCliente',
     'Funcionario',
     'Servico',
     'Agendamento',
-    'User'
+    'AgendamentoStatusContagem',
+    'User',
+    'TabelaVersao'
 ]
 
@@ -1,11 +1,40 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
 
 # Usar a instância global do db
 from . import db
+from .servico import Servico
+
+# Duração (minutos) assumida quando nem o agendamento nem o serviço informam tempo estimado
+DURACAO_PADRAO = 60
+
+def calcular_data_fim(data_agendamento, tempo_estimado=None, duracao_servico=None):
+    """Horário de término: início + tempo estimado, a duração do serviço ou a duração padrão
+
+    Mesma ordem do preenchimento da migração 0003, para que salvar um
+    agendamento antigo não mude o horário de término calculado em SQL.
+    """
+    if data_agendamento is None:
+        return None
+    return data_agendamento + timedelta(minutes=tempo_estimado or duracao_servico or DURACAO_PADRAO)
 
 class Agendamento(db.Model):
     __tablename__ = 'agendamentos'
+    __table_args__ = (
+        # Verificação de conflito de horário: funcionário + data (+ status)
+        db.Index('ix_agendamentos_funcionario_data_status', 'funcionario_id', 'data_agendamento', 'status'),
+        # Agendamentos por cliente ordenados por data
+        db.Index('ix_agendamentos_cliente_data', 'cliente_id', 'data_agendamento'),
+        db.Index('ix_agendamentos_pet_id', 'pet_id'),
+        db.Index('ix_agendamentos_servico_id', 'servico_id'),
+        # Filtro por status (listagem, estatísticas, pendentes do dashboard)
+        db.Index('ix_agendamentos_status_data', 'status', 'data_agendamento'),
+        # Intervalos de data e paginação por cursor em (data_agendamento, id)
+        db.Index('ix_agendamentos_data_id', 'data_agendamento', 'id'),
+        # Sobreposição de horários: agendamentos do funcionário que terminam após um instante
+        db.Index('ix_agendamentos_funcionario_fim', 'funcionario_id', 'data_fim', 'data_agendamento'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     data_agendamento = db.Column(db.DateTime, nullable=False)
@@ -14,6 +43,7 @@ class Agendamento(db.Model):
     observacoes = db.Column(db.Text, nullable=True)
     valor_estimado = db.Column(db.Float, nullable=True)
     tempo_estimado = db.Column(db.Integer, nullable=True)  # em minutos
+    data_fim = db.Column(db.DateTime, nullable=True)  # data_agendamento + tempo_estimado (mantido automaticamente)
     
     # Chaves estrangeiras
     cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id'), nullable=False)
@@ -33,9 +63,32 @@ class Agendamento(db.Model):
             'observacoes': self.observacoes,
             'valor_estimado': self.valor_estimado,
             'tempo_estimado': self.tempo_estimado,
+            'data_fim': self.data_fim.isoformat() if self.data_fim else None,
             'cliente_id': self.cliente_id,
             'pet_id': self.pet_id,
             'servico_id': self.servico_id,
             'funcionario_id': self.funcionario_id
         }
 
+@event.listens_for(Agendamento, 'before_insert')
+@event.listens_for(Agendamento, 'before_update')
+def _atualizar_data_fim(mapper, connection, target):
+    duracao_servico = None
+    if not target.tempo_estimado and target.servico_id is not None:
+        duracao_servico = connection.scalar(
+            select(Servico.duracao_estimada).where(Servico.id == target.servico_id))
+    target.data_fim = calcular_data_fim(target.data_agendamento, target.tempo_estimado, duracao_servico)
+
+class AgendamentoStatusContagem(db.Model):
+    """Quantidade de agendamentos por status, mantida por triggers no banco
+
+    Permite obter os totais por status sem varrer a tabela de agendamentos.
+    Os triggers são criados pela migração 0002_contagem_status.
+    """
+    __tablename__ = 'agendamentos_por_status'
+
+    status = db.Column(db.String(20), primary_key=True)  # '' para agendamentos sem status
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<AgendamentoStatusContagem {self.status}: {self.total}>'
@@ -6,6 +6,11 @@ from . import db
 
 class Pet(db.Model):
     __tablename__ = 'pets'
+    __table_args__ = (
+        # Pets por cliente e verificação de nome duplicado para o mesmo cliente
+        db.Index('ix_pets_cliente_nome', 'cliente_id', 'nome'),
+        db.Index('ix_pets_ativo', 'ativo'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(80), nullable=False)
@@ -54,3 +59,17 @@ class Pet(db.Model):
             'cliente_id': self.cliente_id
         }
 
+
+class PetDesativadoComCliente(db.Model):
+    """Pets que ClienteService.deactivate_cliente desativou junto com o dono
+
+    activate_cliente reativa exatamente estes pets e apaga os registros; os
+    pets que já estavam inativos antes do cliente continuam inativos.
+    """
+    __tablename__ = 'pets_desativados_com_cliente'
+
+    pet_id = db.Column(db.Integer, db.ForeignKey('pets.id', ondelete='CASCADE'), primary_key=True)
+    cliente_id = db.Column(db.Integer, db.ForeignKey('clientes.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<PetDesativadoComCliente {self.pet_id}>'
@@ -0,0 +1,15 @@
+from . import db
+
+class TabelaVersao(db.Model):
+    """Versão de cada tabela, incrementada na mesma transação das escritas
+
+    Como fica no banco, todos os processos (e workers) enxergam a mesma
+    versão assim que a escrita é confirmada. Mantida por VersaoRepository.
+    """
+    __tablename__ = 'versoes_tabelas'
+
+    tabela = db.Column(db.String(64), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TabelaVersao {self.tabela}: {self.versao}>'
@@ -0,0 +1,159 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Carregamentos preguiçosos da mesma relação, em uma mesma contagem, a partir
+# dos quais o padrão é tratado como N+1 (a relação lida dentro de um laço)
+LIMITE_N_MAIS_1 = 2
+
+# Comportamento quando um orçamento é excedido ou um N+1 é detectado:
+# 'raise' (testes) levanta QueryBudgetExceeded, 'warn' (desenvolvimento)
+# registra o relatório no log e None (produção) não mede nada.
+# Definido por init_query_budget a partir de QUERY_BUDGET.
+_modo = None
+
+# Contagens ativas (aninhadas: requisição > view > serviço). Cada comando SQL
+# entra em todas elas.
+_contagens = ContextVar('query_budget', default=())
+# Contagem da requisição em andamento (verificada em after_request)
+_da_requisicao = ContextVar('query_budget_requisicao', default=None)
+
+class QueryBudgetExceeded(AssertionError):
+    """Orçamento de comandos SQL excedido ou carregamento N+1 detectado"""
+
+class Contagem:
+    """Comandos SQL e carregamentos preguiçosos de um bloco (requisição, view ou serviço)"""
+
+    def __init__(self, nome, maximo=None):
+        self.nome = nome
+        self.maximo = maximo
+        self.comandos = []
+        self.preguicosos = Counter()
+
+    @property
+    def total(self):
+        return len(self.comandos)
+
+    def repetidos(self):
+        """{relação: vezes} das relações carregadas preguiçosamente LIMITE_N_MAIS_1 vezes ou mais"""
+        return {relacao: vezes for relacao, vezes in self.preguicosos.items() if vezes >= LIMITE_N_MAIS_1}
+
+    def problemas(self):
+        excedeu = self.maximo is not None and self.total > self.maximo
+        return excedeu or bool(self.repetidos())
+
+    def relatorio(self):
+        """Relatório legível: total x orçamento, relações em N+1 e os comandos executados"""
+        orcamento = f' (orçamento: {self.maximo})' if self.maximo is not None else ''
+        linhas = [f'{self.nome}: {self.total} comandos SQL{orcamento}']
+        repetidos = self.repetidos()
+        if repetidos:
+            linhas.append('Carregamentos preguiçosos repetidos (N+1), use joinedload/selectinload ou um perfil de carga:')
+            linhas += [f'  {relacao}: {vezes} consultas' for relacao, vezes in sorted(repetidos.items())]
+        linhas.append('Comandos:')
+        linhas += [f'  {numero:>3}. {" ".join(sql.split())[:160]}' for numero, sql in enumerate(self.comandos, 1)]
+        return '\n'.join(linhas)
+
+    def verificar(self):
+        """Aplica o modo configurado se o orçamento foi excedido ou houve N+1"""
+        if _modo is None or not self.problemas():
+            return
+        if _modo == 'raise':
+            raise QueryBudgetExceeded(self.relatorio())
+        logger.warning(self.relatorio())
+
+@contextmanager
+def count_queries(nome='bloco', maximo=None):
+    """Conta os comandos SQL do bloco, independentemente do modo (usado pelos testes)
+
+        with count_queries('listagem') as contagem:
+            ...
+        assert contagem.total <= 3, contagem.relatorio()
+    """
+    contagem = Contagem(nome, maximo)
+    token = _contagens.set(_contagens.get() + (contagem,))
+    try:
+        yield contagem
+    finally:
+        _contagens.reset(token)
+
+def query_budget(maximo):
+    """Limita os comandos SQL de uma view ou método de serviço
+
+        @pet_views_bp.route("/pets")
+        @query_budget(3)
+        def listar_pets(): ...
+
+    Conta tudo o que a função executa, inclusive o que o template carrega.
+    Sem QUERY_BUDGET (produção) a função é chamada sem contagem.
+    """
+    def decorator(funcao):
+        @wraps(funcao)
+        def wrapper(*args, **kwargs):
+            if _modo is None:
+                return funcao(*args, **kwargs)
+            with count_queries(funcao.__qualname__, maximo) as contagem:
+                resultado = funcao(*args, **kwargs)
+            contagem.verificar()
+            return resultado
+        return wrapper
+    return decorator
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _contar_comando(conn, cursor, statement, parameters, context, executemany):
+    for contagem in _contagens.get():
+        contagem.comandos.append(statement)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _contar_preguicoso(orm_execute_state):
+    # lazy_loaded_from só existe em SELECTs do ORM (text() e DML passam por aqui também)
+    if not _contagens.get() or not orm_execute_state.is_select or orm_execute_state.lazy_loaded_from is None:
+        return
+    mapper, relacao = orm_execute_state.loader_strategy_path.path[-2:]
+    nome = f'{mapper.class_.__name__}.{relacao.key}'
+    for contagem in _contagens.get():
+        contagem.preguicosos[nome] += 1
+
+def _encerrar():
+    """Tira a contagem da requisição da pilha, mantendo as externas (count_queries de um teste)"""
+    contagem = _da_requisicao.get()
+    if contagem is not None:
+        _da_requisicao.set(None)
+        _contagens.set(tuple(ativa for ativa in _contagens.get() if ativa is not contagem))
+    return contagem
+
+def init_query_budget(app):
+    """Ativa as contagens conforme QUERY_BUDGET ('raise', 'warn' ou None)
+
+    Além dos orçamentos declarados com @query_budget, cada requisição é
+    verificada quanto a carregamentos N+1.
+    """
+    global _modo
+    _modo = app.config.get('QUERY_BUDGET')
+    if _modo is None:
+        return
+
+    @app.before_request
+    def iniciar_contagem():
+        contagem = Contagem(f'{request.method} {request.path}')
+        _da_requisicao.set(contagem)
+        _contagens.set(_contagens.get() + (contagem,))
+
+    @app.after_request
+    def verificar_contagem(response):
+        contagem = _encerrar()
+        if contagem is not None:
+            contagem.verificar()
+        return response
+
+    @app.teardown_request
+    def encerrar_contagem(exc):
+        _encerrar()
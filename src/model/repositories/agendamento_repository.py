@@ -1,37 +1,206 @@
-from src.model.models import db, Agendamento
+from sqlalchemy import bindparam, func, insert, or_, select, text
+from sqlalchemy.orm import joinedload
+from src.model.models import db, Agendamento, AgendamentoStatusContagem, Cliente, Pet, Servico, Funcionario
+from src.model.dto import AgendamentoDTO, columns_for, fetch_dtos, fetch_rows
+from src.model.repositories.busca_repository import BuscaRepository
+from src.model.repositories.query_spec import (apply_search, like_condition, apply_equals, apply_date_range, paginate,
+                                              count_if, in_range, keyset_query)
+from src.model.repositories.unit_of_work import commit
+
+# Chave de ordenação da paginação por cursor da API: (data_agendamento, id)
+PAGE_KEYS = (Agendamento.data_agendamento, Agendamento.id)
+
+# Status que ocupam o horário do funcionário (conflitos, pendências)
+STATUS_ATIVOS = ('Agendado', 'Confirmado', 'Em Andamento')
+
+# Relações que a API pode embutir (?include=): modelo e chave estrangeira no agendamento
+RELACOES = {
+    'cliente': (Cliente, Agendamento.cliente_id),
+    'pet': (Pet, Agendamento.pet_id),
+    'servico': (Servico, Agendamento.servico_id),
+    'funcionario': (Funcionario, Agendamento.funcionario_id),
+}
+
+# Relacionamentos carregados junto com o agendamento em cada perfil de uso.
+# Todos são many-to-one, então o JOIN não multiplica linhas e funciona com LIMIT.
+LOAD_PROFILES = {
+    'list': ('cliente', 'pet', 'servico', 'funcionario'),    # agendamentos/listar.html
+    'detail': ('cliente', 'pet', 'servico', 'funcionario'),  # visualizar.html / editar.html
+    'api': (),                                               # to_dict() usa apenas as chaves estrangeiras
+}
+
+def load_options(profile=None):
+    """Retorna as opções de carregamento (eager loading) para o perfil informado"""
+    if profile is None:
+        return []
+    if profile not in LOAD_PROFILES:
+        raise ValueError(f"Perfil de carregamento inválido: {profile}")
+    return [joinedload(getattr(Agendamento, relacionamento)) for relacionamento in LOAD_PROFILES[profile]]
+
+# Triggers (SQLite) que mantêm agendamentos_por_status em dia a cada escrita,
+# criados pela migração 0002_contagem_status
+STATUS_TRIGGERS = ('trg_agendamentos_status_insert', 'trg_agendamentos_status_delete',
+                   'trg_agendamentos_status_update')
 
 class AgendamentoRepository:
-    def get_all(self):
-        return Agendamento.query.all()
+    _contadores = None
 
-    def get_by_id(self, agendamento_id):
-        return Agendamento.query.get(agendamento_id)
+    def contadores_disponiveis(self):
+        """Indica se agendamentos_por_status é mantida pelos triggers (verificado uma vez por processo)"""
+        if AgendamentoRepository._contadores is None:
+            if db.engine.dialect.name != 'sqlite':
+                AgendamentoRepository._contadores = False
+            else:
+                query = text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN :nomes") \
+                    .bindparams(bindparam('nomes', expanding=True))
+                total = db.session.execute(query, {'nomes': list(STATUS_TRIGGERS)}).scalar()
+                AgendamentoRepository._contadores = total == len(STATUS_TRIGGERS)
+        return AgendamentoRepository._contadores
 
-    def get_by_cliente_id(self, cliente_id):
-        return Agendamento.query.filter_by(cliente_id=cliente_id).all()
+    def _query(self, profile=None):
+        return Agendamento.query.options(*load_options(profile))
 
-    def get_by_funcionario_id(self, funcionario_id):
-        return Agendamento.query.filter_by(funcionario_id=funcionario_id).all()
+    def get_all(self, profile=None):
+        return self._query(profile).all()
 
-    def get_by_servico_id(self, servico_id):
-        return Agendamento.query.filter_by(servico_id=servico_id).all()
+    def get_by_id(self, agendamento_id, profile=None):
+        return self._query(profile).get(agendamento_id)
 
-    def get_by_status(self, status):
-        return Agendamento.query.filter_by(status=status).all()
+    def get_by_cliente_id(self, cliente_id, profile=None):
+        return self._query(profile).filter_by(cliente_id=cliente_id).all()
 
-    def get_by_date_range(self, data_inicio, data_fim):
-        return Agendamento.query.filter(
+    def get_by_funcionario_id(self, funcionario_id, profile=None):
+        return self._query(profile).filter_by(funcionario_id=funcionario_id).all()
+
+    def get_by_servico_id(self, servico_id, profile=None):
+        return self._query(profile).filter_by(servico_id=servico_id).all()
+
+    def get_by_status(self, status, profile=None):
+        return self._query(profile).filter_by(status=status).all()
+
+    def get_by_date_range(self, data_inicio, data_fim, profile=None):
+        return self._query(profile).filter(
             Agendamento.data_agendamento >= data_inicio,
             Agendamento.data_agendamento <= data_fim
         ).all()
 
+    def find_conflict(self, funcionario_id, inicio, fim, ignorar_id=None):
+        """Primeiro agendamento ativo do funcionário que se sobrepõe ao intervalo [inicio, fim)
+
+        A busca percorre o índice (funcionario_id, data_fim) a partir de inicio,
+        lendo apenas os agendamentos que terminam depois dele; o histórico
+        anterior não é visitado.
+        """
+        query = Agendamento.query.filter(
+            Agendamento.funcionario_id == funcionario_id,
+            Agendamento.data_fim > inicio,
+            Agendamento.data_agendamento < fim,
+            Agendamento.status.in_(STATUS_ATIVOS)
+        )
+        if ignorar_id:
+            query = query.filter(Agendamento.id != ignorar_id)
+        return query.order_by(Agendamento.data_fim).first()
+
+    def get_intervalos_ocupados(self, funcionario_id, inicio, fim):
+        """(início, fim) dos agendamentos ativos do funcionário que tocam [inicio, fim), em uma consulta"""
+        query = select(Agendamento.data_agendamento, Agendamento.data_fim).where(
+            Agendamento.funcionario_id == funcionario_id,
+            Agendamento.data_fim > inicio,
+            Agendamento.data_agendamento < fim,
+            Agendamento.status.in_(STATUS_ATIVOS)
+        ).order_by(Agendamento.data_agendamento)
+        return db.session.execute(query).all()
+
+    def count_by_status(self):
+        """Quantidade de agendamentos por status, sem carregar objetos
+
+        Lê a tabela de contadores mantida por triggers quando disponível
+        (custo constante); caso contrário faz um GROUP BY na tabela.
+        """
+        if self.contadores_disponiveis():
+            query = select(AgendamentoStatusContagem.status, AgendamentoStatusContagem.total) \
+                .where(AgendamentoStatusContagem.total > 0)
+        else:
+            status = func.coalesce(Agendamento.status, '')
+            query = select(status, func.count()).group_by(status)
+        return {status: total for status, total in db.session.execute(query)}
+
+    def count_in_periods(self, periodos):
+        """Contagem de agendamentos em cada período {nome: (inicio, fim)} em um único SELECT
+
+        A busca fica restrita ao intervalo que cobre todos os períodos, usando o índice de data.
+        """
+        colunas = [count_if(in_range(Agendamento.data_agendamento, inicio, fim)).label(nome)
+                   for nome, (inicio, fim) in periodos.items()]
+        inicio = min(inicio for inicio, _ in periodos.values())
+        fim = max(fim for _, fim in periodos.values())
+        query = select(*colunas).where(in_range(Agendamento.data_agendamento, inicio, fim))
+        return db.session.execute(query).one()._asdict()
+
+    def get_page(self, after=None, limit=100, data_inicio=None, data_fim=None, status=None, funcionario_id=None,
+                 campos=None):
+        """Página da API como AgendamentoDTO: SELECT só das colunas, sem objetos do ORM
+
+        data_fim é exclusiva (datetime) ou o dia inteiro (string YYYY-MM-DD), como em apply_date_range.
+        Com campos (nomes de colunas), seleciona só essas colunas e devolve as Rows.
+        """
+        if campos is None:
+            query = select(*columns_for(AgendamentoDTO, Agendamento))
+        else:
+            query = select(*(getattr(Agendamento, campo) for campo in campos))
+        query = apply_date_range(query, Agendamento.data_agendamento, data_inicio, data_fim)
+        query = apply_equals(query, Agendamento.status, status)
+        query = apply_equals(query, Agendamento.funcionario_id, funcionario_id)
+        query = keyset_query(query, PAGE_KEYS, after, limit)
+        agendamentos = fetch_dtos(AgendamentoDTO, query) if campos is None else fetch_rows(query)
+        return agendamentos[:limit], len(agendamentos) > limit
+
+    def search(self, search=None, status=None, cliente_id=None, funcionario_id=None,
+               data_inicio=None, data_fim=None, page=1, per_page=10, profile='list'):
+        query = self._query(profile)
+        busca = BuscaRepository()
+        if busca.pode_buscar(search):
+            # Observações e nomes de cliente/serviço pelo índice FTS; funcionário por LIKE
+            query = query.outerjoin(Funcionario, Agendamento.funcionario_id == Funcionario.id)
+            query = query.filter(or_(
+                Agendamento.id.in_(busca.ids('agendamento', search)),
+                Agendamento.cliente_id.in_(busca.ids('cliente', search)),
+                Agendamento.servico_id.in_(busca.ids('servico', search)),
+                like_condition(search, Funcionario.nome)
+            ))
+        elif search and search.strip():
+            query = (query.outerjoin(Cliente, Agendamento.cliente_id == Cliente.id)
+                          .outerjoin(Servico, Agendamento.servico_id == Servico.id)
+                          .outerjoin(Funcionario, Agendamento.funcionario_id == Funcionario.id))
+            query = apply_search(query, search, Cliente.nome, Servico.nome, Funcionario.nome, Agendamento.observacoes)
+        query = apply_equals(query, Agendamento.status, status)
+        query = apply_equals(query, Agendamento.cliente_id, cliente_id)
+        query = apply_equals(query, Agendamento.funcionario_id, funcionario_id)
+        query = apply_date_range(query, Agendamento.data_agendamento, data_inicio, data_fim)
+        query = query.order_by(Agendamento.data_agendamento.desc(), Agendamento.id.desc())
+        return paginate(query, page, per_page)
+
     def add(self, agendamento):
         db.session.add(agendamento)
-        db.session.commit()
+        commit()
+
+    def insert_many(self, linhas):
+        """Insere as linhas em um único INSERT de várias linhas e um único commit
+
+        O INSERT em lote não passa pelos eventos do ORM: data_fim deve vir
+        preenchido nas linhas e o índice de busca é atualizado aqui, na mesma
+        transação. Os contadores por status são mantidos pelos triggers.
+        Retorna {data_agendamento: id}.
+        """
+        query = insert(Agendamento).returning(Agendamento.id, Agendamento.data_agendamento)
+        ids = {data_agendamento: id for id, data_agendamento in db.session.execute(query, linhas)}
+        BuscaRepository().index_ids('agendamento', ids.values())
+        commit()
+        return ids
 
     def update(self, agendamento):
-        db.session.commit()
+        commit()
 
     def delete(self, agendamento):
         db.session.delete(agendamento)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
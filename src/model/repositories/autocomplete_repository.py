@@ -0,0 +1,276 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from threading import RLock
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from src.model.models import db, Cliente, Pet
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: "João" -> "joao\""""
+    texto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+
+def tokenizar(*textos):
+    tokens = set()
+    for texto in textos:
+        tokens.update(re.findall(r'\w+', normalizar(texto)))
+    return tokens
+
+def _texto(*campos):
+    """Campos normalizados para a busca por trecho (o separador não aparece em um termo digitado)"""
+    return '\n'.join(normalizar(campo) for campo in campos if campo)
+
+class PrefixIndex:
+    """Índice em memória de prefixos de palavras: lista ordenada de (token, id)
+
+    A busca pela primeira palavra é um bisect na lista (O(log n)) seguido da
+    leitura apenas das entradas com aquele prefixo; as demais palavras são
+    verificadas nos tokens do próprio documento. Se os prefixos não
+    completarem o limite, os textos dos documentos são percorridos em busca
+    do termo em qualquer posição (ex: um trecho do meio do CPF).
+    """
+
+    def __init__(self):
+        self.documentos = {}
+        self.tokens = {}
+        self.textos = {}
+        self.chaves = []
+
+    def clear(self):
+        self.documentos.clear()
+        self.tokens.clear()
+        self.textos.clear()
+        self.chaves.clear()
+
+    def put(self, doc_id, documento, tokens, texto='', ordenar=True):
+        self.remove(doc_id)
+        self.documentos[doc_id] = documento
+        self.tokens[doc_id] = tokens
+        self.textos[doc_id] = texto
+        for token in tokens:
+            if ordenar:
+                insort(self.chaves, (token, doc_id))
+            else:
+                self.chaves.append((token, doc_id))
+
+    def remove(self, doc_id):
+        tokens = self.tokens.pop(doc_id, None)
+        self.documentos.pop(doc_id, None)
+        self.textos.pop(doc_id, None)
+        for token in tokens or ():
+            pos = bisect_left(self.chaves, (token, doc_id))
+            if pos < len(self.chaves) and self.chaves[pos] == (token, doc_id):
+                del self.chaves[pos]
+
+    def sort(self):
+        self.chaves.sort()
+
+    def _casa(self, doc_id, palavras):
+        tokens = self.tokens[doc_id]
+        return all(any(token.startswith(palavra) for token in tokens) for palavra in palavras)
+
+    def search(self, termo, limit=10, filtro=None, candidatos=None):
+        palavras = sorted(tokenizar(termo), key=len, reverse=True)
+        if not palavras or limit <= 0:
+            return []
+
+        resultados = []
+        vistos = set()
+        if candidatos is not None:
+            # Conjunto pequeno já conhecido (ex: pets de um cliente): verificar um a um
+            ids = (doc_id for doc_id in candidatos if self._casa(doc_id, palavras))
+        else:
+            primeira, demais = palavras[0], palavras[1:]
+            ids = self._por_prefixo(primeira, demais)
+
+        self._coletar(ids, resultados, vistos, limit, filtro)
+        if len(resultados) < limit:
+            # Trecho em qualquer posição, como a busca por substring anterior ao índice
+            trecho = normalizar(termo).strip()
+            ids = candidatos if candidatos is not None else list(self.textos)
+            self._coletar((doc_id for doc_id in ids if trecho in self.textos[doc_id]),
+                          resultados, vistos, limit, filtro)
+        return resultados
+
+    def _coletar(self, ids, resultados, vistos, limit, filtro):
+        for doc_id in ids:
+            if len(resultados) >= limit:
+                return
+            if doc_id in vistos:
+                continue
+            vistos.add(doc_id)
+            documento = self.documentos[doc_id]
+            if filtro and not filtro(documento):
+                continue
+            resultados.append(documento)
+
+    def _por_prefixo(self, prefixo, demais):
+        pos = bisect_left(self.chaves, (prefixo,))
+        while pos < len(self.chaves):
+            token, doc_id = self.chaves[pos]
+            if not token.startswith(prefixo):
+                break
+            if not demais or self._casa(doc_id, demais):
+                yield doc_id
+            pos += 1
+
+class AutocompleteRepository:
+    """Índices de autocomplete de clientes e pets mantidos em memória por processo
+
+    Construídos na inicialização e atualizados a cada commit a partir dos
+    eventos da sessão. Em implantações com vários processos, cada processo
+    vê apenas as alterações feitas por ele mesmo até a próxima reconstrução.
+    """
+
+    clientes = PrefixIndex()
+    pets = PrefixIndex()
+    pets_por_cliente = {}
+    _lock = RLock()
+    _construido = False
+
+    def build(self):
+        with self._lock:
+            self.clientes.clear()
+            self.pets.clear()
+            self.pets_por_cliente.clear()
+
+            colunas_cliente = select(Cliente.id, Cliente.nome, Cliente.cpf, Cliente.telefone,
+                                     Cliente.email, Cliente.ativo)
+            for row in db.session.execute(colunas_cliente):
+                self._put_cliente(row._asdict(), ordenar=False)
+
+            colunas_pet = select(Pet.id, Pet.nome, Pet.especie, Pet.raca, Pet.ativo, Pet.cliente_id)
+            for row in db.session.execute(colunas_pet):
+                self._put_pet(row._asdict(), ordenar=False)
+
+            self.clientes.sort()
+            self.pets.sort()
+            AutocompleteRepository._construido = True
+
+    def construido(self):
+        return AutocompleteRepository._construido
+
+    @classmethod
+    def invalidar(cls):
+        """Descarta o índice (cargas em massa não disparam eventos); a próxima busca o reconstrói"""
+        with cls._lock:
+            cls.clientes.clear()
+            cls.pets.clear()
+            cls.pets_por_cliente.clear()
+            cls._construido = False
+
+    def _garantir(self):
+        if not AutocompleteRepository._construido:
+            with self._lock:
+                if not AutocompleteRepository._construido:
+                    self.build()
+
+    # As buscas seguram o mesmo lock de apply(): um commit de outra thread
+    # altera listas e dicionários no lugar, e uma busca no meio dele veria o
+    # índice pela metade. Os documentos saem copiados, pois apply() também
+    # altera o nome do dono dentro dos documentos de pets.
+    def search_clientes(self, termo, limit=10):
+        self._garantir()
+        with self._lock:
+            resultados = self.clientes.search(termo, limit=limit, filtro=lambda c: c['ativo'])
+            return [dict(documento) for documento in resultados]
+
+    def search_pets(self, termo, limit=10, cliente_id=None):
+        self._garantir()
+        with self._lock:
+            candidatos = None
+            if cliente_id:
+                candidatos = sorted(self.pets_por_cliente.get(cliente_id, ()))
+            resultados = self.pets.search(termo, limit=limit, filtro=lambda p: p['ativo'], candidatos=candidatos)
+            return [dict(documento) for documento in resultados]
+
+    def _put_cliente(self, dados, ordenar=True):
+        cpf_digitos = re.sub(r'\D', '', dados['cpf'] or '')
+        documento = {
+            'id': dados['id'],
+            'nome': dados['nome'],
+            'cpf': dados['cpf'],
+            'telefone': dados['telefone'],
+            'email': dados['email'],
+            'ativo': dados['ativo'],
+        }
+        tokens = tokenizar(dados['nome'], dados['cpf'], dados['email']) | {cpf_digitos}
+        texto = _texto(dados['nome'], dados['cpf'], cpf_digitos, dados['email'])
+        self.clientes.put(dados['id'], documento, tokens - {''}, texto, ordenar=ordenar)
+
+        # Nome do dono é desnormalizado nos pets
+        for pet_id in self.pets_por_cliente.get(dados['id'], ()):
+            pet = self.pets.documentos.get(pet_id)
+            if pet:
+                pet['dono'] = dados['nome']
+
+    def _put_pet(self, dados, ordenar=True):
+        anterior = self.pets.documentos.get(dados['id'])
+        if anterior and anterior['cliente_id'] != dados['cliente_id']:
+            self.pets_por_cliente.get(anterior['cliente_id'], set()).discard(dados['id'])
+
+        dono = self.clientes.documentos.get(dados['cliente_id'])
+        documento = {
+            'id': dados['id'],
+            'nome': dados['nome'],
+            'especie': dados['especie'],
+            'raca': dados['raca'],
+            'dono': dono['nome'] if dono else None,
+            'ativo': dados['ativo'],
+            'cliente_id': dados['cliente_id'],
+        }
+        self.pets.put(dados['id'], documento, tokenizar(dados['nome'], dados['raca']),
+                      _texto(dados['nome'], dados['raca']), ordenar=ordenar)
+        self.pets_por_cliente.setdefault(dados['cliente_id'], set()).add(dados['id'])
+
+    def _remove_pet(self, pet_id):
+        anterior = self.pets.documentos.get(pet_id)
+        if anterior:
+            self.pets_por_cliente.get(anterior['cliente_id'], set()).discard(pet_id)
+        self.pets.remove(pet_id)
+
+    def apply(self, alteracoes):
+        with self._lock:
+            for tipo, acao, dados in alteracoes:
+                if tipo == 'cliente':
+                    if acao == 'put':
+                        self._put_cliente(dados)
+                    else:
+                        self.clientes.remove(dados['id'])
+                else:
+                    if acao == 'put':
+                        self._put_pet(dados)
+                    else:
+                        self._remove_pet(dados['id'])
+
+# Sincronização: as alterações de cada flush ficam pendentes na sessão e só
+# entram no índice depois do commit (um rollback as descarta).
+_CAMPOS = {
+    Cliente: ('cliente', ('id', 'nome', 'cpf', 'telefone', 'email', 'ativo')),
+    Pet: ('pet', ('id', 'nome', 'especie', 'raca', 'ativo', 'cliente_id')),
+}
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_alteracoes(session, flush_context):
+    if not AutocompleteRepository._construido:
+        return
+    pendentes = session.info.setdefault('autocomplete_pendentes', [])
+    for obj in list(session.new) + list(session.dirty):
+        if type(obj) in _CAMPOS:
+            tipo, campos = _CAMPOS[type(obj)]
+            pendentes.append((tipo, 'put', {campo: getattr(obj, campo) for campo in campos}))
+    for obj in session.deleted:
+        if type(obj) in _CAMPOS:
+            tipo, _ = _CAMPOS[type(obj)]
+            pendentes.append((tipo, 'delete', {'id': obj.id}))
+
+@event.listens_for(Session, 'after_commit')
+def _aplicar_alteracoes(session):
+    pendentes = session.info.pop('autocomplete_pendentes', None)
+    if pendentes:
+        AutocompleteRepository().apply(pendentes)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_alteracoes(session, previous_transaction):
+    session.info.pop('autocomplete_pendentes', None)
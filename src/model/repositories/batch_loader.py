@@ -0,0 +1,68 @@
+from sqlalchemy import and_, select, true
+from src.model.models import db
+from src.model.serializers import serializer_for
+
+# Ids por consulta IN. Abaixo do limite antigo de 999 parâmetros do SQLite;
+# listas maiores são divididas em lotes.
+LOTE_IDS = 500
+
+def _unicos(ids):
+    """Ids sem repetição e sem nulos, na ordem recebida"""
+    return list(dict.fromkeys(id_ for id_ in ids if id_ is not None))
+
+def _lotes(ids):
+    for inicio in range(0, len(ids), LOTE_IDS):
+        yield ids[inicio:inicio + LOTE_IDS]
+
+def load_by_ids(model, ids, campos):
+    """{id: {campo: valor}} dos registros de model com esses ids (id sempre incluído)
+
+    Seleciona apenas as colunas pedidas, sem objetos do ORM, em consultas
+    IN de até LOTE_IDS ids. Ids repetidos e nulos são ignorados.
+    """
+    colunas = [getattr(model, campo) for campo in dict.fromkeys(('id', *campos))]
+    carregados = {}
+    for lote in _lotes(sorted(_unicos(ids))):
+        query = select(*colunas).where(model.id.in_(lote))
+        for row in db.session.connection().execute(query):
+            carregados[row.id] = row._asdict()
+    return carregados
+
+def load_in_order(model, ids, campos=None):
+    """(registros na ordem de ids, ids não encontrados), com os campos de to_dict() por padrão"""
+    ids = _unicos(ids)
+    carregados = load_by_ids(model, ids, campos or serializer_for(model).campos)
+    return [carregados[id_] for id_ in ids if id_ in carregados], [id_ for id_ in ids if id_ not in carregados]
+
+def load_grouped(pai, model, chave, ids, condicao=true()):
+    """({id do pai: [registros de model]} na ordem de ids, ids não encontrados)
+
+    Uma consulta por lote: LEFT JOIN a partir do pai, então um pai sem
+    registros vem com a lista vazia e um id sem pai vai para os não
+    encontrados. condicao filtra os registros (entra no ON do JOIN).
+    """
+    ids = _unicos(ids)
+    campos = serializer_for(model).campos
+    colunas = [getattr(model, campo) for campo in campos]
+    grupos = {}
+    for lote in _lotes(ids):
+        query = (select(pai.id.label('pai_id'), *colunas).select_from(pai)
+                 .outerjoin(model, and_(chave == pai.id, condicao))
+                 .where(pai.id.in_(lote)).order_by(pai.id, model.id))
+        for row in db.session.connection().execute(query):
+            registros = grupos.setdefault(row.pai_id, [])
+            if row.id is not None:
+                registros.append(dict(zip(campos, row[1:])))
+    return {id_: grupos[id_] for id_ in ids if id_ in grupos}, [id_ for id_ in ids if id_ not in grupos]
+
+def load_relations(itens, relacoes, include):
+    """{relação: {id: dict}} das relações pedidas, com uma consulta por relação
+
+    relacoes mapeia o nome da relação para (modelo, coluna da chave
+    estrangeira nos itens); include mapeia o nome para os campos desejados.
+    """
+    carregadas = {}
+    for nome, campos in include.items():
+        model, chave = relacoes[nome]
+        carregadas[nome] = load_by_ids(model, (getattr(item, chave.key) for item in itens), campos)
+    return carregadas
@@ -0,0 +1,137 @@
+import re
+from sqlalchemy import bindparam, event, func, inspect, literal_column, select, table, column, text
+from src.model.models import db, Cliente, Pet, Servico, Agendamento
+
+# Índice de busca textual (SQLite FTS5) mantido em paralelo às tabelas, criado
+# pela migração 0007_indice_busca. O tokenizador unicode61 com remove_diacritics
+# faz "Joao" encontrar "João".
+FTS_TABLE = 'busca_fts'
+
+# SELECT que gera o documento de cada tipo; usado tanto na reconstrução
+# completa quanto na sincronização de linhas específicas (com WHERE id = :id / IN :ids).
+# O rowid é id * 8 + código do tipo, para remover um documento sem varrer o índice.
+DOCUMENTOS = {
+    'cliente': (Cliente, """
+        SELECT id * 8 + 1, 'cliente', id, nome, cpf, nome,
+               cpf || ' ' || replace(replace(cpf, '.', ''), '-', '') || ' ' || coalesce(email, '')
+        FROM clientes"""),
+    'pet': (Pet, """
+        SELECT id * 8 + 2, 'pet', id, nome, especie || coalesce(' - ' || raca, ''), nome,
+               coalesce(raca, '') || ' ' || especie
+        FROM pets"""),
+    'servico': (Servico, """
+        SELECT id * 8 + 3, 'servico', id, nome, categoria, nome,
+               categoria || ' ' || coalesce(descricao, '')
+        FROM servicos"""),
+    'agendamento': (Agendamento, """
+        SELECT id * 8 + 4, 'agendamento', id, 'Agendamento #' || id, data_agendamento, '', observacoes
+        FROM agendamentos
+        WHERE observacoes IS NOT NULL AND observacoes <> ''"""),
+}
+
+CODIGOS = {'cliente': 1, 'pet': 2, 'servico': 3, 'agendamento': 4}
+
+# Atributos que, quando alterados, exigem reindexar a linha
+CAMPOS_INDEXADOS = {
+    'cliente': ('nome', 'cpf', 'email'),
+    'pet': ('nome', 'especie', 'raca'),
+    'servico': ('nome', 'categoria', 'descricao'),
+    'agendamento': ('observacoes',),
+}
+
+_busca = table(FTS_TABLE, column('tipo'), column('ref_id'), column('rotulo'), column('subtitulo'))
+_match = literal_column(FTS_TABLE)
+
+def incluir_no_autogenerate(object, name, type_, reflected, compare_to):
+    """Filtro do Alembic: ignora a tabela FTS5 e suas tabelas internas"""
+    return not (type_ == 'table' and name.startswith(FTS_TABLE))
+
+def montar_consulta(termo):
+    """Converte o texto digitado em uma consulta FTS5 (todas as palavras, por prefixo)"""
+    palavras = re.findall(r'\w+', termo or '')
+    return ' '.join(f'"{palavra}"*' for palavra in palavras)
+
+def _sql_documento(tipo, filtro=None):
+    sql = DOCUMENTOS[tipo][1]
+    if filtro:
+        sql += f" {'AND' if 'WHERE' in sql else 'WHERE'} {filtro}"
+    return f'INSERT INTO {FTS_TABLE} (rowid, tipo, ref_id, rotulo, subtitulo, titulo, conteudo) {sql}'
+
+class BuscaRepository:
+    _disponivel = None
+
+    def disponivel(self, connection=None):
+        """Indica se o índice FTS5 pode ser usado (SQLite com a tabela criada; verificado uma vez por processo)"""
+        if BuscaRepository._disponivel is None:
+            if db.engine.dialect.name != 'sqlite':
+                BuscaRepository._disponivel = False
+            else:
+                BuscaRepository._disponivel = inspect(connection or db.engine).has_table(FTS_TABLE)
+        return BuscaRepository._disponivel
+
+    def pode_buscar(self, termo):
+        """Indica se o termo pode ser resolvido pelo índice FTS5"""
+        return bool(montar_consulta(termo)) and self.disponivel()
+
+    def rebuild(self):
+        """Reconstrói o índice inteiro (após cargas em massa que não disparam eventos)"""
+        with db.engine.begin() as connection:
+            self._rebuild(connection)
+
+    def _rebuild(self, connection):
+        connection.exec_driver_sql(f'DELETE FROM {FTS_TABLE}')
+        for tipo in DOCUMENTOS:
+            connection.execute(text(_sql_documento(tipo)))
+
+    def index_ids(self, tipo, ids):
+        """Indexa, em um único INSERT ... SELECT, linhas gravadas em lote sem passar pelos eventos do ORM"""
+        if not ids or not self.disponivel():
+            return
+        query = text(_sql_documento(tipo, 'id IN :ids')).bindparams(bindparam('ids', expanding=True))
+        db.session.execute(query, {'ids': list(ids)})
+
+    def ids(self, tipo, termo):
+        """SELECT dos ids do tipo informado que casam com o termo (para usar em IN)"""
+        return select(_busca.c.ref_id).where(
+            _busca.c.tipo == tipo,
+            _match.op('MATCH')(montar_consulta(termo))
+        )
+
+    def search(self, termo, tipos=None, limit=20):
+        consulta = montar_consulta(termo)
+        if not consulta:
+            return []
+        rank = func.bm25(_match, 0.0, 0.0, 0.0, 0.0, 10.0, 1.0)
+        query = select(_busca.c.tipo, _busca.c.ref_id, _busca.c.rotulo, _busca.c.subtitulo, rank.label('rank')) \
+            .where(_match.op('MATCH')(consulta))
+        if tipos:
+            query = query.where(_busca.c.tipo.in_(tipos))
+        query = query.order_by(rank).limit(limit)
+        return db.session.execute(query).all()
+
+def _sincronizar(tipo, connection, target, remover=True, inserir=True):
+    if not BuscaRepository().disponivel(connection):
+        return
+    if remover:
+        connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :rowid'),
+                           {'rowid': target.id * 8 + CODIGOS[tipo]})
+    if inserir:
+        connection.execute(text(_sql_documento(tipo, 'id = :id')), {'id': target.id})
+
+def _registrar_eventos(tipo, model):
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        _sincronizar(tipo, connection, target, remover=False)
+
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        estado = inspect(target)
+        if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS_INDEXADOS[tipo]):
+            _sincronizar(tipo, connection, target)
+
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        _sincronizar(tipo, connection, target, inserir=False)
+
+for _tipo, (_model, _) in DOCUMENTOS.items():
+    _registrar_eventos(_tipo, _model)
@@ -1,4 +1,11 @@
+from sqlalchemy import insert, select
 from src.model.models import db, Cliente
+from src.model.repositories.busca_repository import BuscaRepository
+from src.model.repositories.query_spec import apply_search, apply_status, paginate, keyset_page
+from src.model.repositories.unit_of_work import commit
+
+# Chave de ordenação da paginação por cursor da API
+PAGE_KEYS = (Cliente.id,)
 
 class ClienteRepository:
     def get_all(self):
@@ -13,15 +20,65 @@ class ClienteRepository:
     def get_by_email(self, email):
         return Cliente.query.filter_by(email=email).first()
 
+    def search(self, search=None, status=None, page=1, per_page=10):
+        query = Cliente.query
+        busca = BuscaRepository()
+        if busca.pode_buscar(search):
+            query = query.filter(Cliente.id.in_(busca.ids('cliente', search)))
+        else:
+            query = apply_search(query, search, Cliente.nome, Cliente.cpf, Cliente.email)
+        query = apply_status(query, Cliente.ativo, status)
+        query = query.order_by(Cliente.nome, Cliente.id)
+        return paginate(query, page, per_page)
+
+    def get_page(self, after=None, limit=100):
+        return keyset_page(Cliente.query, PAGE_KEYS, after, limit)
+
+    def get_cpfs_existentes(self, cpfs):
+        """CPFs do conjunto que já estão cadastrados, em uma consulta"""
+        if not cpfs:
+            return set()
+        return set(db.session.scalars(select(Cliente.cpf).where(Cliente.cpf.in_(cpfs))))
+
+    def get_emails_existentes(self, emails):
+        """Emails do conjunto que já estão cadastrados, em uma consulta"""
+        if not emails:
+            return set()
+        return set(db.session.scalars(select(Cliente.email).where(Cliente.email.in_(emails))))
+
+    def get_situacao_by_ids(self, cliente_ids):
+        """{id: ativo} dos clientes informados, em uma consulta"""
+        if not cliente_ids:
+            return {}
+        return dict(db.session.execute(select(Cliente.id, Cliente.ativo).where(Cliente.id.in_(cliente_ids))).all())
+
+    def get_situacao_by_cpfs(self, cpfs):
+        """{cpf: (id, ativo)} dos clientes informados, em uma consulta"""
+        if not cpfs:
+            return {}
+        query = select(Cliente.cpf, Cliente.id, Cliente.ativo).where(Cliente.cpf.in_(cpfs))
+        return {cpf: (cliente_id, ativo) for cpf, cliente_id, ativo in db.session.execute(query)}
+
+    def insert_many(self, linhas):
+        """Insere as linhas em um único INSERT de várias linhas e um único commit
+
+        O INSERT em lote não passa pelos eventos do ORM: o índice de busca é
+        atualizado aqui, na mesma transação. Retorna os ids inseridos.
+        """
+        ids = db.session.scalars(insert(Cliente).returning(Cliente.id), linhas).all()
+        BuscaRepository().index_ids('cliente', ids)
+        commit()
+        return ids
+
     def add(self, cliente):
         db.session.add(cliente)
-        db.session.commit()
+        commit()
 
     def update(self, cliente):
-        db.session.commit()
+        commit()
 
     def delete(self, cliente):
         db.session.delete(cliente)
-        db.session.commit()
+        commit()
 
 
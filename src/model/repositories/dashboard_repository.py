@@ -0,0 +1,44 @@
+from sqlalchemy import func, select
+from src.model.models import db, Cliente, Pet, Funcionario, Servico, Agendamento
+from src.model.repositories.agendamento_repository import STATUS_ATIVOS
+from src.model.repositories.query_spec import count_if
+
+# Status que ainda dependem de ação (usados no contador de pendentes)
+STATUS_PENDENTES = STATUS_ATIVOS
+
+# Tabelas com contadores de total/ativos no dashboard
+CADASTROS = {
+    'clientes': Cliente,
+    'pets': Pet,
+    'funcionarios': Funcionario,
+    'servicos': Servico,
+}
+
+class DashboardRepository:
+    def contar_cadastros(self, model):
+        """Total e ativos de uma tabela em um único SELECT"""
+        row = db.session.execute(
+            select(func.count(), count_if(model.ativo.is_(True)))
+            .select_from(model)
+        ).one()
+        return row[0], row[1]
+
+    def get_clientes_recentes(self, limit=5):
+        return db.session.execute(
+            select(Cliente.id, Cliente.nome, Cliente.telefone, Cliente.data_cadastro)
+            .where(Cliente.ativo.is_(True))
+            .order_by(Cliente.data_cadastro.desc())
+            .limit(limit)
+        ).all()
+
+    def get_agendamentos_periodo(self, inicio, fim, limit=5):
+        """Agendamentos do intervalo com os nomes já resolvidos por JOIN"""
+        return db.session.execute(
+            select(Agendamento.id, Agendamento.data_agendamento, Agendamento.status,
+                   Cliente.nome.label('cliente_nome'), Servico.nome.label('servico_nome'))
+            .outerjoin(Cliente, Agendamento.cliente_id == Cliente.id)
+            .outerjoin(Servico, Agendamento.servico_id == Servico.id)
+            .where(Agendamento.data_agendamento >= inicio, Agendamento.data_agendamento < fim)
+            .order_by(Agendamento.data_agendamento, Agendamento.id)
+            .limit(limit)
+        ).all()
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from threading import Lock
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from src.model.models import db, Agendamento
+from src.model.repositories.agendamento_repository import STATUS_ATIVOS
+
+# Grade de horários: cada dia é um inteiro em que o bit i indica o intervalo
+# [i * SLOT_MINUTOS, (i + 1) * SLOT_MINUTOS) ocupado
+SLOT_MINUTOS = 15
+SLOTS_POR_DIA = 24 * 60 // SLOT_MINUTOS
+
+# Quantidade máxima de mapas (funcionário, dia) mantidos em memória
+MAX_MAPAS = 20000
+
+# Rótulo "HH:MM" do início de cada slot
+ROTULOS = [f'{slot * SLOT_MINUTOS // 60:02d}:{slot * SLOT_MINUTOS % 60:02d}' for slot in range(SLOTS_POR_DIA)]
+
+def slot_do_horario(momento):
+    return (momento.hour * 60 + momento.minute) // SLOT_MINUTOS
+
+def marcar_intervalo(mapas, funcionario_id, inicio, fim):
+    """Marca no mapa de cada dia os slots cobertos por [inicio, fim), mesmo atravessando a meia-noite"""
+    dia = inicio.date()
+    while datetime.combine(dia, time.min) < fim:
+        abertura = datetime.combine(dia, time.min)
+        primeiro = slot_do_horario(inicio) if inicio > abertura else 0
+        fim_dia = min(fim, abertura + timedelta(days=1))
+        minutos = int((fim_dia - abertura).total_seconds() // 60)
+        ultimo = -(-minutos // SLOT_MINUTOS)  # arredonda para cima
+        if ultimo > primeiro:
+            chave = (funcionario_id, dia)
+            mapas[chave] = mapas.get(chave, 0) | (((1 << (ultimo - primeiro)) - 1) << primeiro)
+        dia += timedelta(days=1)
+
+class DisponibilidadeRepository:
+    """Mapas de ocupação por funcionário e dia, em memória por processo
+
+    Cada mapa é calculado sob demanda a partir dos agendamentos não
+    cancelados e descartado quando um commit altera algum agendamento
+    daquele funcionário e dia. Outros processos só percebem a alteração
+    quando o mapa é recalculado; a criação do agendamento sempre verifica
+    conflitos no banco.
+    """
+
+    _mapas = OrderedDict()
+    _geracao = 0
+    _lock = Lock()
+
+    def get_mapas(self, funcionario_ids, dias):
+        """Retorna {(funcionario_id, dia): bits ocupados}, consultando o banco só para o que faltar"""
+        chaves = [(funcionario_id, dia) for funcionario_id in funcionario_ids for dia in dias]
+        with self._lock:
+            mapas = {chave: self._mapas[chave] for chave in chaves if chave in self._mapas}
+            geracao = DisponibilidadeRepository._geracao
+        faltantes = [chave for chave in chaves if chave not in mapas]
+        if not faltantes:
+            return mapas
+
+        carregados = self._carregar(sorted({chave[0] for chave in faltantes}),
+                                    min(chave[1] for chave in faltantes),
+                                    max(chave[1] for chave in faltantes))
+        with self._lock:
+            # Um commit durante a consulta pode ter invalidado o resultado: usar sem guardar
+            guardar = geracao == DisponibilidadeRepository._geracao
+            for chave in faltantes:
+                mapas[chave] = carregados.get(chave, 0)
+                if guardar:
+                    self._mapas[chave] = mapas[chave]
+            while len(self._mapas) > MAX_MAPAS:
+                self._mapas.popitem(last=False)
+        return mapas
+
+    def _carregar(self, funcionario_ids, primeiro_dia, ultimo_dia):
+        """Uma consulta por intervalo para todos os funcionários e dias pedidos"""
+        inicio = datetime.combine(primeiro_dia, time.min)
+        fim = datetime.combine(ultimo_dia, time.min) + timedelta(days=1)
+        query = select(Agendamento.funcionario_id, Agendamento.data_agendamento, Agendamento.data_fim).where(
+            Agendamento.funcionario_id.in_(funcionario_ids),
+            Agendamento.data_fim > inicio,
+            Agendamento.data_agendamento < fim,
+            # Mesmos status que find_conflict considera ocupando o horário
+            Agendamento.status.in_(STATUS_ATIVOS)
+        )
+        mapas = {}
+        for funcionario_id, data_inicio, data_fim in db.session.execute(query):
+            marcar_intervalo(mapas, funcionario_id, data_inicio, data_fim)
+        return mapas
+
+    @classmethod
+    def invalidar(cls, chaves):
+        with cls._lock:
+            cls._geracao += 1
+            for chave in chaves:
+                cls._mapas.pop(chave, None)
+
+    @classmethod
+    def limpar(cls):
+        with cls._lock:
+            cls._geracao += 1
+            cls._mapas.clear()
+
+def _dias_afetados(funcionario_id, inicio, fim):
+    if not funcionario_id or not inicio:
+        return set()
+    fim = fim or inicio
+    dias = set()
+    dia = inicio.date()
+    while dia <= fim.date():
+        dias.add((funcionario_id, dia))
+        dia += timedelta(days=1)
+    return dias
+
+def _valor_anterior(estado, campo):
+    historico = estado.attrs[campo].history
+    return historico.deleted[0] if historico.deleted else getattr(estado.object, campo)
+
+# Sincronização: os dias afetados em cada flush (valores antigos e novos)
+# ficam pendentes na sessão e são descartados do cache após o commit.
+@event.listens_for(Session, 'after_flush')
+def _registrar_dias(session, flush_context):
+    afetados = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Agendamento):
+            continue
+        estado = inspect(obj)
+        afetados |= _dias_afetados(obj.funcionario_id, obj.data_agendamento, obj.data_fim)
+        afetados |= _dias_afetados(_valor_anterior(estado, 'funcionario_id'),
+                                   _valor_anterior(estado, 'data_agendamento'),
+                                   _valor_anterior(estado, 'data_fim'))
+    if afetados:
+        session.info.setdefault('disponibilidade_afetados', set()).update(afetados)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_dias(session):
+    afetados = session.info.pop('disponibilidade_afetados', None)
+    if afetados:
+        DisponibilidadeRepository.invalidar(afetados)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_dias(session, previous_transaction):
+    session.info.pop('disponibilidade_afetados', None)
@@ -0,0 +1,51 @@
+from sqlalchemy import select
+from src.model.models import db, Cliente, Pet, Funcionario, Servico, Agendamento
+from src.model.repositories.query_spec import apply_date_range, apply_equals, apply_status
+
+# Linhas buscadas do cursor por vez durante a exportação
+TAMANHO_LOTE = 1000
+
+class ExportacaoRepository:
+    """Consultas de exportação: apenas colunas, com os nomes resolvidos por JOIN
+
+    As linhas são lidas do cursor em lotes de TAMANHO_LOTE (yield_per), sem
+    montar objetos do ORM nem carregar o resultado inteiro em memória.
+    """
+
+    def agendamentos(self, data_inicio=None, data_fim=None, status=None):
+        query = select(
+            Agendamento.id, Agendamento.data_agendamento, Agendamento.data_fim, Agendamento.status,
+            Agendamento.cliente_id, Cliente.nome.label('cliente'),
+            Agendamento.pet_id, Pet.nome.label('pet'),
+            Agendamento.servico_id, Servico.nome.label('servico'),
+            Agendamento.funcionario_id, Funcionario.nome.label('funcionario'),
+            Agendamento.valor_estimado, Agendamento.tempo_estimado, Agendamento.observacoes,
+            Agendamento.data_criacao
+        ).outerjoin(Cliente, Agendamento.cliente_id == Cliente.id) \
+            .outerjoin(Pet, Agendamento.pet_id == Pet.id) \
+            .outerjoin(Servico, Agendamento.servico_id == Servico.id) \
+            .outerjoin(Funcionario, Agendamento.funcionario_id == Funcionario.id)
+        query = apply_date_range(query, Agendamento.data_agendamento, data_inicio, data_fim)
+        query = apply_equals(query, Agendamento.status, status)
+        # Mesma ordem do índice (data_agendamento, id)
+        return self._stream(query.order_by(Agendamento.data_agendamento, Agendamento.id))
+
+    def clientes(self, status=None):
+        query = select(Cliente.id, Cliente.nome, Cliente.cpf, Cliente.telefone, Cliente.email,
+                       Cliente.endereco, Cliente.data_cadastro, Cliente.ativo)
+        query = apply_status(query, Cliente.ativo, status)
+        return self._stream(query.order_by(Cliente.id))
+
+    def pets(self, status=None, especie=None, cliente_id=None):
+        query = select(
+            Pet.id, Pet.nome, Pet.especie, Pet.raca, Pet.cor, Pet.sexo, Pet.data_nascimento, Pet.peso,
+            Pet.observacoes, Pet.cliente_id, Cliente.nome.label('cliente'), Cliente.cpf.label('cliente_cpf'),
+            Pet.data_cadastro, Pet.ativo
+        ).join(Cliente, Pet.cliente_id == Cliente.id)
+        query = apply_status(query, Pet.ativo, status)
+        query = apply_equals(query, Pet.especie, especie)
+        query = apply_equals(query, Pet.cliente_id, cliente_id)
+        return self._stream(query.order_by(Pet.id))
+
+    def _stream(self, query):
+        return db.session.execute(query.execution_options(yield_per=TAMANHO_LOTE))
@@ -1,4 +1,12 @@
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from src.model.models import db, Funcionario
+from src.model.repositories.agendamento_repository import load_options
+from src.model.repositories.query_spec import apply_search, apply_status, paginate
+from src.model.repositories.unit_of_work import commit
+
+# Chave de ordenação da paginação por cursor da API
+PAGE_KEYS = (Funcionario.id,)
 
 class FuncionarioRepository:
     def get_all(self):
@@ -7,19 +15,42 @@ class FuncionarioRepository:
     def get_by_id(self, funcionario_id):
         return Funcionario.query.get(funcionario_id)
 
+    def get_with_agendamentos(self, funcionario_id):
+        """Funcionário com os agendamentos e seus cliente, pet e serviço (funcionarios/visualizar.html)
+
+        Uma consulta para o funcionário e uma para os agendamentos (com JOIN
+        nas relações), em vez de uma por agendamento listado no template.
+        """
+        opcoes = selectinload(Funcionario.agendamentos).options(*load_options('list'))
+        return db.session.get(Funcionario, funcionario_id, options=[opcoes])
+
+    def get_opcoes(self):
+        """(id, nome) de todos os funcionários, para filtros e selects (sem carregar as entidades)"""
+        return db.session.execute(select(Funcionario.id, Funcionario.nome).order_by(Funcionario.nome)).all()
+
+    def get_active(self):
+        return Funcionario.query.filter_by(ativo=True).order_by(Funcionario.nome, Funcionario.id).all()
+
     def get_by_cpf(self, cpf):
         return Funcionario.query.filter_by(cpf=cpf).first()
 
     def get_by_email(self, email):
         return Funcionario.query.filter_by(email=email).first()
 
+    def search(self, search=None, status=None, page=1, per_page=10):
+        query = Funcionario.query
+        query = apply_search(query, search, Funcionario.nome, Funcionario.cpf, Funcionario.email, Funcionario.cargo)
+        query = apply_status(query, Funcionario.ativo, status)
+        query = query.order_by(Funcionario.nome, Funcionario.id)
+        return paginate(query, page, per_page)
+
     def add(self, funcionario):
         db.session.add(funcionario)
-        db.session.commit()
+        commit()
 
     def update(self, funcionario):
-        db.session.commit()
+        commit()
 
     def delete(self, funcionario):
         db.session.delete(funcionario)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
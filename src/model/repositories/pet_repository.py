@@ -1,4 +1,18 @@
-from src.model.models import db, Pet
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import contains_eager
+from src.model.models import db, Pet, PetDesativadoComCliente, Cliente
+from src.model.dto import PetDTO, columns_for, fetch_dtos, fetch_rows
+from src.model.repositories.busca_repository import BuscaRepository
+from src.model.repositories.query_spec import apply_search, apply_status, apply_equals, paginate, keyset_query
+from src.model.repositories.unit_of_work import commit
+
+# Chave de ordenação da paginação por cursor da API
+PAGE_KEYS = (Pet.id,)
+
+# Relações que a API pode embutir (?include=): modelo e chave estrangeira no pet
+RELACOES = {
+    'cliente': (Cliente, Pet.cliente_id),
+}
 
 class PetRepository:
     def get_all(self):
@@ -13,16 +27,84 @@ class PetRepository:
     def get_active_by_cliente_id(self, cliente_id):
         return Pet.query.filter_by(cliente_id=cliente_id, ativo=True).all()
 
+    def desativar_com_cliente(self, cliente_id):
+        """Desativa os pets ativos do cliente e registra quais foram, para reativá-los com ele"""
+        pets = self.get_active_by_cliente_id(cliente_id)
+        for pet in pets:
+            pet.ativo = False
+            db.session.add(PetDesativadoComCliente(pet_id=pet.id, cliente_id=cliente_id))
+        commit()
+        return pets
+
+    def reativar_com_cliente(self, cliente_id):
+        """Reativa os pets registrados por desativar_com_cliente e apaga os registros"""
+        pets = Pet.query.join(PetDesativadoComCliente, PetDesativadoComCliente.pet_id == Pet.id) \
+            .filter(PetDesativadoComCliente.cliente_id == cliente_id).all()
+        for pet in pets:
+            pet.ativo = True
+        db.session.execute(delete(PetDesativadoComCliente).where(PetDesativadoComCliente.cliente_id == cliente_id))
+        commit()
+        return pets
+
     def get_by_nome_and_cliente(self, nome, cliente_id):
         return Pet.query.filter_by(nome=nome, cliente_id=cliente_id).first()
 
+    def get_nomes_existentes(self, pares):
+        """Pares (cliente_id, nome) do conjunto que já existem, em uma consulta"""
+        if not pares:
+            return set()
+        query = select(Pet.cliente_id, Pet.nome).where(
+            Pet.cliente_id.in_({cliente_id for cliente_id, _ in pares}),
+            Pet.nome.in_({nome for _, nome in pares})
+        )
+        return {tuple(row) for row in db.session.execute(query)} & set(pares)
+
+    def insert_many(self, linhas):
+        """Insere as linhas em um único INSERT de várias linhas e um único commit
+
+        O INSERT em lote não passa pelos eventos do ORM: o índice de busca é
+        atualizado aqui, na mesma transação. Retorna os ids inseridos.
+        """
+        ids = db.session.scalars(insert(Pet).returning(Pet.id), linhas).all()
+        BuscaRepository().index_ids('pet', ids)
+        commit()
+        return ids
+
+    def search(self, search=None, status=None, especie=None, cliente_id=None, page=1, per_page=10):
+        # O JOIN com o dono serve tanto para a busca por nome do cliente quanto para o template
+        query = Pet.query.join(Pet.dono).options(contains_eager(Pet.dono))
+        busca = BuscaRepository()
+        if busca.pode_buscar(search):
+            query = query.filter(or_(Pet.id.in_(busca.ids('pet', search)),
+                                     Pet.cliente_id.in_(busca.ids('cliente', search))))
+        else:
+            query = apply_search(query, search, Pet.nome, Pet.raca, Cliente.nome)
+        query = apply_status(query, Pet.ativo, status)
+        query = apply_equals(query, Pet.especie, especie)
+        query = apply_equals(query, Pet.cliente_id, cliente_id)
+        query = query.order_by(Pet.nome, Pet.id)
+        return paginate(query, page, per_page)
+
+    def get_page(self, after=None, limit=100, cliente_id=None, campos=None):
+        """Página da API como PetDTO: SELECT só das colunas, sem objetos do ORM
+
+        Com campos (nomes de colunas), seleciona só essas colunas e devolve as Rows.
+        """
+        if campos is None:
+            query = select(*columns_for(PetDTO, Pet))
+        else:
+            query = select(*(getattr(Pet, campo) for campo in campos))
+        query = keyset_query(apply_equals(query, Pet.cliente_id, cliente_id), PAGE_KEYS, after, limit)
+        pets = fetch_dtos(PetDTO, query) if campos is None else fetch_rows(query)
+        return pets[:limit], len(pets) > limit
+
     def add(self, pet):
         db.session.add(pet)
-        db.session.commit()
+        commit()
 
     def update(self, pet):
-        db.session.commit()
+        commit()
 
     def delete(self, pet):
         db.session.delete(pet)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
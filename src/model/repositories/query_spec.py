@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from sqlalchemy import case, func, or_, tuple_
+
+# Limite de itens por página aceito nas listagens
+MAX_PER_PAGE = 100
+
+def _escape_like(term):
+    """Escapa os curingas do LIKE para que o termo seja buscado literalmente"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def like_condition(search, *columns):
+    """Condição LIKE (sem diferenciar maiúsculas) em qualquer uma das colunas"""
+    pattern = f"%{_escape_like(search.strip())}%"
+    return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+def apply_search(query, search, *columns):
+    """Filtra por LIKE em qualquer uma das colunas quando há termo de busca"""
+    if not search or not search.strip():
+        return query
+    return query.filter(like_condition(search, *columns))
+
+def apply_status(query, column, status, ativo="true", inativo="false"):
+    """Filtra pelo campo booleano de ativo/inativo conforme o valor do formulário"""
+    if status == ativo:
+        return query.filter(column.is_(True))
+    if status == inativo:
+        return query.filter(column.is_(False))
+    return query
+
+def apply_equals(query, column, value):
+    """Filtra por igualdade quando o valor foi informado"""
+    if value in (None, ""):
+        return query
+    return query.filter(column == value)
+
+def apply_date_range(query, column, data_inicio=None, data_fim=None):
+    """Filtra por intervalo de datas; data_fim inclui o dia inteiro"""
+    if data_inicio:
+        if isinstance(data_inicio, str):
+            data_inicio = datetime.strptime(data_inicio, "%Y-%m-%d")
+        query = query.filter(column >= data_inicio)
+    if data_fim:
+        if isinstance(data_fim, str):
+            data_fim = datetime.strptime(data_fim, "%Y-%m-%d") + timedelta(days=1)
+        query = query.filter(column < data_fim)
+    return query
+
+def in_range(column, inicio, fim):
+    """Condição de intervalo semiaberto [inicio, fim), que pode usar o índice da coluna"""
+    return (column >= inicio) & (column < fim)
+
+def count_if(condition):
+    """COUNT apenas das linhas que atendem à condição (para vários contadores no mesmo SELECT)"""
+    return func.count(case((condition, 1)))
+
+def paginate(query, page=1, per_page=10):
+    """Executa COUNT + LIMIT/OFFSET e retorna um objeto de paginação do Flask-SQLAlchemy"""
+    page = page if page and page > 0 else 1
+    per_page = per_page if per_page and per_page > 0 else 10
+    return query.paginate(page=page, per_page=per_page, max_per_page=MAX_PER_PAGE, error_out=False)
+
+def _seek_condition(keys, after):
+    """Compara (k1, k2, ...) > (v1, v2, ...) como row value, o que permite ao banco usar o índice"""
+    if len(keys) == 1:
+        return keys[0] > after[0]
+    return tuple_(*keys) > tuple_(*after)
+
+def keyset_query(query, keys, after=None, limit=100):
+    """Condição de seek, ordenação e LIMIT limit + 1 (para saber se há mais); Query do ORM ou select()"""
+    if after:
+        query = query.filter(_seek_condition(keys, after))
+    return query.order_by(*keys).limit(limit + 1)
+
+def keyset_page(query, keys, after=None, limit=100):
+    """Paginação por chave (seek): retorna (itens, ha_mais) sem usar OFFSET
+
+    keys são as colunas de ordenação (a última deve ser única, ex: id) e
+    after são os valores da última linha da página anterior.
+    """
+    itens = keyset_query(query, keys, after, limit).all()
+    return itens[:limit], len(itens) > limit
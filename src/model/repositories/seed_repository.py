@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+from src.model.migrations import aplicar_migracoes
+from src.model.models import db, TabelaVersao
+from src.model.repositories.busca_repository import BuscaRepository
+from src.model.repositories.versao_repository import VersaoRepository
+
+class SeedRepository:
+    """Carga em massa de dados sintéticos: tabelas recriadas e INSERTs com executemany
+
+    As linhas chegam prontas para o SQLite (datas já no formato de texto do
+    SQLAlchemy, booleanos como 0/1) e vão direto para o cursor, sem o
+    processamento de tipos do SQLAlchemy nem os eventos do ORM. Por isso
+    finalizar() reconstrói o que os eventos e triggers manteriam.
+    """
+
+    def __init__(self):
+        self.connection = None
+
+    def _tabelas(self):
+        """Tabelas do banco principal, menos a de versões (as ETags já emitidas não podem voltar a valer)"""
+        return [tabela for tabela in db.metadata.sorted_tables if tabela.name != TabelaVersao.__tablename__]
+
+    def recriar_tabelas(self):
+        """Apaga e recria as tabelas do banco principal (a réplica é atualizada pela cópia)"""
+        db.metadata.drop_all(db.engine, tables=self._tabelas())
+        db.create_all(bind_key=None)
+
+    @contextmanager
+    def carga(self):
+        """Uma transação em uma conexão própria, sem checar chaves estrangeiras
+
+        As linhas geradas já são consistentes, e checar cada chave estrangeira
+        dobra o tempo dos INSERTs. foreign_keys só muda fora de transação (por
+        isso vem antes do primeiro comando), e a conexão é descartada no fim
+        para que as próximas voltem com os PRAGMAs de SQLITE_PRAGMAS.
+        """
+        connection = db.engine.connect()
+        try:
+            if db.engine.dialect.name == 'sqlite':
+                connection.exec_driver_sql('PRAGMA foreign_keys = OFF')
+                connection.exec_driver_sql('PRAGMA cache_size = -131072')  # 128 MB para recriar os índices
+            self.connection = connection
+            yield
+            connection.commit()
+        finally:
+            self.connection = None
+            connection.invalidate()
+            connection.close()
+
+    def inserir(self, model, colunas, linhas):
+        """INSERT com executemany de uma lista de tuplas na ordem de colunas"""
+        if not linhas:
+            return
+        sql = (f"INSERT INTO {model.__tablename__} ({', '.join(colunas)}) "
+               f"VALUES ({', '.join('?' * len(colunas))})")
+        self.connection.exec_driver_sql(sql, linhas)
+
+    @contextmanager
+    def sem_indices(self, model):
+        """Remove os índices da tabela durante a carga e os recria no fim
+
+        Criar um índice sobre a tabela cheia (uma ordenação) custa bem menos
+        do que mantê-lo a cada linha inserida fora de ordem.
+        """
+        indices = list(model.__table__.indexes)
+        for indice in indices:
+            indice.drop(self.connection)
+        yield
+        for indice in indices:
+            indice.create(self.connection)
+
+    def finalizar(self):
+        """Esquema das migrações, índice de busca, versões das tabelas e estatísticas do planejador
+
+        As tabelas foram recriadas por create_all: as migrações rodam de novo
+        sobre os dados já carregados (triggers e contadores por status, índice
+        FTS5), e o índice de busca, que não é apagado com as tabelas, é refeito.
+        """
+        aplicar_migracoes(refazer=True)
+        BuscaRepository().rebuild()
+        with db.engine.begin() as connection:
+            VersaoRepository.incrementar(connection, [tabela.name for tabela in self._tabelas()])
+            connection.exec_driver_sql('ANALYZE')
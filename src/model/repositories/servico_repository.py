@@ -1,4 +1,13 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 from src.model.models import db, Servico
+from src.model.repositories.agendamento_repository import load_options
+from src.model.repositories.busca_repository import BuscaRepository
+from src.model.repositories.query_spec import apply_search, apply_status, apply_equals, paginate, count_if
+from src.model.repositories.unit_of_work import commit
+
+# Chave de ordenação da paginação por cursor da API
+PAGE_KEYS = (Servico.id,)
 
 class ServicoRepository:
     def get_all(self):
@@ -7,6 +16,11 @@ class ServicoRepository:
     def get_by_id(self, servico_id):
         return Servico.query.get(servico_id)
 
+    def get_with_agendamentos(self, servico_id):
+        """Serviço com os agendamentos e seus cliente e pet (servicos/visualizar.html)"""
+        opcoes = selectinload(Servico.agendamentos).options(*load_options('list'))
+        return db.session.get(Servico, servico_id, options=[opcoes])
+
     def get_by_nome(self, nome):
         return Servico.query.filter_by(nome=nome).first()
 
@@ -16,13 +30,32 @@ class ServicoRepository:
     def get_active(self):
         return Servico.query.filter_by(ativo=True).all()
 
+    def count_by_categoria(self):
+        """Total e ativos por categoria em um único GROUP BY"""
+        query = select(Servico.categoria, func.count().label('total'),
+                       count_if(Servico.ativo.is_(True)).label('ativos')) \
+            .group_by(Servico.categoria)
+        return db.session.execute(query).all()
+
+    def search(self, search=None, categoria=None, status=None, page=1, per_page=10):
+        query = Servico.query
+        busca = BuscaRepository()
+        if busca.pode_buscar(search):
+            query = query.filter(Servico.id.in_(busca.ids('servico', search)))
+        else:
+            query = apply_search(query, search, Servico.nome, Servico.descricao)
+        query = apply_equals(query, Servico.categoria, categoria)
+        query = apply_status(query, Servico.ativo, status, ativo="ativo", inativo="inativo")
+        query = query.order_by(Servico.nome, Servico.id)
+        return paginate(query, page, per_page)
+
     def add(self, servico):
         db.session.add(servico)
-        db.session.commit()
+        commit()
 
     def update(self, servico):
-        db.session.commit()
+        commit()
 
     def delete(self, servico):
         db.session.delete(servico)
-        db.session.commit()
\ No newline at end of file
+        commit()
\ No newline at end of file
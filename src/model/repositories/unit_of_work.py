@@ -0,0 +1,87 @@
+import inspect
+from contextlib import contextmanager
+from functools import wraps
+from src.model.engine import CHAVE_LEITURA
+from src.model.models import db
+
+# Chave em session.info com a profundidade de unit_of_work() em andamento
+CHAVE = 'unit_of_work'
+
+def em_unit_of_work():
+    return db.session.info.get(CHAVE, 0) > 0
+
+def commit():
+    """Confirma as escritas dos repositórios
+
+    Fora de unit_of_work() é um commit, como antes. Dentro, apenas um flush:
+    os ids ficam disponíveis e as consultas seguintes veem as alterações,
+    mas a gravação definitiva acontece uma vez, no fim do bloco.
+    """
+    if em_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+@contextmanager
+def unit_of_work():
+    """Agrupa as escritas de vários repositórios em uma única transação
+
+        with unit_of_work():
+            pet_repository.add(pet)
+            agendamento_repository.add(agendamento)
+
+    Commit ao sair do bloco e rollback se ele terminar com exceção. Blocos
+    aninhados participam da transação do bloco mais externo.
+    """
+    session = db.session
+    externo = not em_unit_of_work()
+    session.info[CHAVE] = session.info.get(CHAVE, 0) + 1
+    try:
+        yield session
+        if externo:
+            session.commit()
+    except BaseException:
+        if externo:
+            session.rollback()
+        raise
+    finally:
+        session.info[CHAVE] -= 1
+
+@contextmanager
+def somente_leitura():
+    """Envia as consultas do bloco para a réplica de leitura, quando configurada
+
+    Dentro de unit_of_work(), ou depois de uma escrita na mesma sessão, as
+    consultas continuam no banco principal (ver RoutingSession).
+    """
+    session = db.session
+    if em_unit_of_work():
+        yield session
+        return
+    session.info[CHAVE_LEITURA] = session.info.get(CHAVE_LEITURA, 0) + 1
+    try:
+        yield session
+    finally:
+        session.info[CHAVE_LEITURA] -= 1
+
+def read_only(funcao):
+    """Declara um método de service como somente leitura (consultas na réplica)
+
+        @read_only
+        def get_all_clientes(self): ...
+
+    Em geradores o escopo vale enquanto o gerador é consumido, que é quando
+    as consultas de fato acontecem.
+    """
+    if inspect.isgeneratorfunction(funcao):
+        @wraps(funcao)
+        def gerador(*args, **kwargs):
+            with somente_leitura():
+                yield from funcao(*args, **kwargs)
+        return gerador
+
+    @wraps(funcao)
+    def wrapper(*args, **kwargs):
+        with somente_leitura():
+            return funcao(*args, **kwargs)
+    return wrapper
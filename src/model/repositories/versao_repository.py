@@ -0,0 +1,62 @@
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
+from src.model.models import db, TabelaVersao
+
+# Cria a linha da tabela na primeira escrita (SQLite 3.24+ e PostgreSQL)
+INCREMENTAR = text(f"""
+    INSERT INTO {TabelaVersao.__tablename__} (tabela, versao) VALUES (:tabela, 1)
+    ON CONFLICT (tabela) DO UPDATE SET versao = {TabelaVersao.__tablename__}.versao + 1
+""")
+
+class VersaoRepository:
+    """Versão de cada tabela, guardada no banco (tabela versoes_tabelas)
+
+    A versão de uma tabela é incrementada em todo commit que a altera (pelo
+    flush do ORM ou por INSERT/UPDATE/DELETE em lote na sessão), dentro da
+    mesma transação: a versão nova fica visível junto com os dados, para
+    todos os processos que usam o banco. Escritas por SQL textual ou fora
+    da sessão (como o gerador de dados) precisam chamar incrementar().
+    """
+
+    def get_versoes(self, tabelas):
+        """Retorna {tabela: versão} das tabelas pedidas (0 se nunca alterada), em uma consulta"""
+        versoes = dict(db.session.execute(
+            select(TabelaVersao.tabela, TabelaVersao.versao).where(TabelaVersao.tabela.in_(tabelas))
+        ).all())
+        return {tabela: versoes.get(tabela, 0) for tabela in tabelas}
+
+    @staticmethod
+    def incrementar(connection, tabelas):
+        """Incrementa a versão das tabelas na transação da conexão informada"""
+        connection.execute(INCREMENTAR, [{'tabela': tabela} for tabela in sorted(tabelas)])
+
+# Sincronização: as tabelas alteradas em cada flush ficam pendentes na sessão
+# e ganham nova versão logo antes do commit, na mesma transação (um rollback
+# descarta as duas coisas).
+def _pendentes(session):
+    return session.info.setdefault('versoes_pendentes', set())
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_tabelas(session, flush_context):
+    tabelas = {obj.__table__.name for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+               if hasattr(obj, '__table__')}
+    if tabelas:
+        _pendentes(session).update(tabelas)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_execucao(estado):
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        _pendentes(estado.session).add(estado.statement.table.name)
+
+@event.listens_for(Session, 'before_commit')
+def _incrementar_versoes(session):
+    # O commit ainda faria o último flush depois deste evento: antecipá-lo
+    # para que as tabelas dele também entrem no incremento
+    session.flush()
+    tabelas = session.info.pop('versoes_pendentes', None)
+    if tabelas:
+        VersaoRepository.incrementar(session.connection(), tabelas)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_versoes(session, previous_transaction):
+    session.info.pop('versoes_pendentes', None)
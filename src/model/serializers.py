@@ -0,0 +1,46 @@
+from dataclasses import fields, is_dataclass
+from operator import attrgetter, itemgetter
+
+class Serializer:
+    """Serialização de um modelo para JSON com os mesmos campos de to_dict()
+
+    Os campos são lidos uma vez, de to_dict() de uma instância vazia, e os
+    getters são montados na criação. Cada objeto vira um dict com os valores
+    das colunas como estão: datas e datetimes seguem nativos para o provider
+    JSON (orjson as codifica direto em ISO 8601, igual a isoformat()), sem
+    uma chamada isoformat() por campo. Os valores são lidos do __dict__ da
+    instância; se algum atributo não estiver carregado (objeto expirado
+    depois de um commit, coluna adiada), usa o acesso normal, que o carrega.
+    Os DTOs de src/model/dto.py (sem __dict__) são lidos pelos seus campos.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        if is_dataclass(model):
+            self.campos = tuple(campo.name for campo in fields(model))
+            self._do_estado = None
+        else:
+            self.campos = tuple(model().to_dict())
+            self._do_estado = itemgetter(*self.campos)
+        self._dos_atributos = attrgetter(*self.campos)
+
+    def __call__(self, obj):
+        if self._do_estado is None:
+            return dict(zip(self.campos, self._dos_atributos(obj)))
+        try:
+            valores = self._do_estado(obj.__dict__)
+        except KeyError:
+            valores = self._dos_atributos(obj)
+        return dict(zip(self.campos, valores))
+
+_serializers = {}
+
+def serializer_for(model):
+    """Serializer do modelo (criado na primeira chamada e reutilizado)"""
+    serializer = _serializers.get(model)
+    if serializer is None:
+        serializer = _serializers[model] = Serializer(model)
+    return serializer
+
+def serialize(obj):
+    return serializer_for(type(obj))(obj)
@@ -1,37 +1,142 @@
-from src.model.repositories.agendamento_repository import AgendamentoRepository
+from src.model.repositories.agendamento_repository import AgendamentoRepository, RELACOES, STATUS_ATIVOS
+from src.model.repositories.batch_loader import load_in_order, load_relations
 from src.model.models import Agendamento
+from src.model.models.agendamento import calcular_data_fim
+from src.model.repositories.disponibilidade_repository import DisponibilidadeRepository
+from src.model.repositories.unit_of_work import read_only
 from src.model.services.cliente_service import ClienteService
+from src.model.services.dashboard_service import DashboardService
+from src.model.services.pet_service import PetService
 from src.model.services.funcionario_service import FuncionarioService
 from src.model.services.servico_service import ServicoService
+from bisect import bisect_left
+from calendar import monthrange
 from datetime import datetime, timedelta
 
+# Limite de ocorrências geradas por uma regra de recorrência
+MAX_OCORRENCIAS = 100
+FREQUENCIAS = ('diaria', 'semanal', 'mensal')
+
+def _somar_meses(data, meses):
+    """Mesma data N meses depois; dias inexistentes viram o último dia do mês (31/01 -> 28/02)"""
+    mes = data.month - 1 + meses
+    ano, mes = data.year + mes // 12, mes % 12 + 1
+    return data.replace(year=ano, month=mes, day=min(data.day, monthrange(ano, mes)[1]))
+
+def gerar_recorrencia(inicio, frequencia, intervalo=1, ocorrencias=None, ate=None):
+    """Datas da série a partir de inicio: a cada `intervalo` dias/semanas/meses, até `ocorrencias` ou `ate`"""
+    if frequencia not in FREQUENCIAS:
+        raise ValueError(f"Frequência inválida. Use uma das seguintes: {', '.join(FREQUENCIAS)}")
+    if not isinstance(intervalo, int) or intervalo < 1:
+        raise ValueError("O intervalo da recorrência deve ser um inteiro positivo")
+    if not ocorrencias and not ate:
+        raise ValueError("Informe o número de ocorrências ou a data final da recorrência")
+    if ocorrencias and (not isinstance(ocorrencias, int) or ocorrencias < 1):
+        raise ValueError("O número de ocorrências deve ser um inteiro positivo")
+    if isinstance(ate, str):
+        try:
+            ate = datetime.strptime(ate, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError("Formato de data final da recorrência inválido. Use YYYY-MM-DD")
+    if isinstance(ate, datetime):
+        ate = ate.date()
+
+    datas = []
+    while len(datas) < (ocorrencias or MAX_OCORRENCIAS + 1):
+        n = len(datas) * intervalo
+        if frequencia == 'diaria':
+            data = inicio + timedelta(days=n)
+        elif frequencia == 'semanal':
+            data = inicio + timedelta(weeks=n)
+        else:
+            data = _somar_meses(inicio, n)
+        if ate and data.date() > ate:
+            break
+        datas.append(data)
+
+    if not datas:
+        raise ValueError("A recorrência não gera nenhuma ocorrência")
+    if len(datas) > MAX_OCORRENCIAS:
+        raise ValueError(f"A recorrência não pode gerar mais de {MAX_OCORRENCIAS} ocorrências")
+    return datas
+
 class AgendamentoService:
     def __init__(self):
         self.agendamento_repository = AgendamentoRepository()
         self.cliente_service = ClienteService()
+        self.pet_service = PetService()
         self.funcionario_service = FuncionarioService()
         self.servico_service = ServicoService()
 
-    def get_all_agendamentos(self):
-        return self.agendamento_repository.get_all()
-
-    def get_agendamento_by_id(self, agendamento_id):
-        return self.agendamento_repository.get_by_id(agendamento_id)
-
-    def get_agendamentos_by_cliente(self, cliente_id):
-        return self.agendamento_repository.get_by_cliente_id(cliente_id)
-
-    def get_agendamentos_by_funcionario(self, funcionario_id):
-        return self.agendamento_repository.get_by_funcionario_id(funcionario_id)
-
-    def get_agendamentos_by_servico(self, servico_id):
-        return self.agendamento_repository.get_by_servico_id(servico_id)
-
-    def get_agendamentos_by_status(self, status):
-        return self.agendamento_repository.get_by_status(status)
-
-    def get_agendamentos_by_date_range(self, data_inicio, data_fim):
-        return self.agendamento_repository.get_by_date_range(data_inicio, data_fim)
+    @read_only
+    def get_all_agendamentos(self, profile=None):
+        return self.agendamento_repository.get_all(profile=profile)
+
+    @read_only
+    def get_agendamentos_page(self, after=None, limit=100, data_inicio=None, data_fim=None, status=None,
+                              funcionario_id=None, campos=None):
+        """Página de agendamentos a partir da chave after (paginação por cursor), como AgendamentoDTO"""
+        return self.agendamento_repository.get_page(after=after, limit=limit, data_inicio=data_inicio,
+                                                    data_fim=data_fim, status=status, funcionario_id=funcionario_id,
+                                                    campos=campos)
+
+    @read_only
+    def get_agendamentos_by_ids(self, ids):
+        """(agendamentos na ordem de ids, ids não encontrados), em consultas IN"""
+        return load_in_order(Agendamento, ids)
+
+    @read_only
+    def get_relacionados(self, agendamentos, include):
+        """Relações pedidas em ?include= ({relação: campos}), uma consulta em lote por relação"""
+        return load_relations(agendamentos, RELACOES, include)
+
+    @read_only
+    def search(self, search=None, status=None, cliente_id=None, funcionario_id=None,
+               data_inicio=None, data_fim=None, page=1, per_page=10, profile='list'):
+        """Busca paginada de agendamentos com filtros aplicados no banco"""
+        return self.agendamento_repository.search(search=search, status=status, cliente_id=cliente_id,
+                                                  funcionario_id=funcionario_id, data_inicio=data_inicio,
+                                                  data_fim=data_fim, page=page, per_page=per_page,
+                                                  profile=profile)
+
+    def get_agendamento_by_id(self, agendamento_id, profile=None):
+        return self.agendamento_repository.get_by_id(agendamento_id, profile=profile)
+
+    def get_agendamentos_by_cliente(self, cliente_id, profile=None):
+        return self.agendamento_repository.get_by_cliente_id(cliente_id, profile=profile)
+
+    def get_agendamentos_by_funcionario(self, funcionario_id, profile=None):
+        return self.agendamento_repository.get_by_funcionario_id(funcionario_id, profile=profile)
+
+    def get_agendamentos_by_servico(self, servico_id, profile=None):
+        return self.agendamento_repository.get_by_servico_id(servico_id, profile=profile)
+
+    def get_agendamentos_by_status(self, status, profile=None):
+        return self.agendamento_repository.get_by_status(status, profile=profile)
+
+    def get_agendamentos_by_date_range(self, data_inicio, data_fim, profile=None):
+        return self.agendamento_repository.get_by_date_range(data_inicio, data_fim, profile=profile)
+
+    def verificar_conflito(self, funcionario_id, data_agendamento, tempo_estimado=None, ignorar_id=None,
+                           servico_id=None):
+        """Lança ValueError se o funcionário já tiver agendamento ativo sobreposto ao horário
+
+        Sem tempo_estimado, a duração vem do serviço (como em data_fim).
+        """
+        if not funcionario_id or not data_agendamento:
+            return
+        duracao_servico = None
+        if not tempo_estimado and servico_id:
+            servico = self.servico_service.get_servico_by_id(servico_id)
+            duracao_servico = servico.duracao_estimada if servico else None
+        data_fim = calcular_data_fim(data_agendamento, tempo_estimado, duracao_servico)
+        conflito = self.agendamento_repository.find_conflict(funcionario_id, data_agendamento, data_fim,
+                                                             ignorar_id=ignorar_id)
+        if conflito:
+            raise ValueError(
+                "Funcionário já possui agendamento neste horário "
+                f"({conflito.data_agendamento.strftime('%d/%m/%Y %H:%M')} - {conflito.data_fim.strftime('%H:%M')})"
+            )
 
     def create_agendamento(self, cliente_id, servico_id, data_agendamento, 
                           funcionario_id=None, pet_id=None, observacoes=None, valor_estimado=None):
@@ -65,6 +170,9 @@ class AgendamentoService:
         # Calcular tempo estimado baseado no serviço
         tempo_estimado = servico.duracao_estimada if servico.duracao_estimada else None
 
+        # Verificar sobreposição com outros agendamentos do funcionário
+        self.verificar_conflito(funcionario_id, data_agendamento, tempo_estimado)
+
         # Usar valor do serviço como estimativa se não fornecido
         if valor_estimado is None:
             valor_estimado = servico.preco
@@ -84,6 +192,105 @@ class AgendamentoService:
         self.agendamento_repository.add(new_agendamento)
         return new_agendamento
 
+    def create_agendamentos_recorrentes(self, cliente_id, pet_id, servico_id, data_agendamento, recorrencia,
+                                        funcionario_id=None, observacoes=None, valor_estimado=None,
+                                        tempo_estimado=None):
+        """Cria uma série de agendamentos a partir de uma regra de recorrência
+
+        As entidades são validadas uma única vez, os conflitos de toda a série
+        são verificados com uma única consulta por intervalo e as ocorrências
+        livres são gravadas em um único INSERT de várias linhas e um único
+        commit. Retorna o resultado de cada ocorrência ('criado' ou 'conflito').
+        """
+        if not cliente_id or not pet_id or not servico_id or not data_agendamento:
+            raise ValueError("Cliente, pet, serviço e data do agendamento são obrigatórios")
+        if not isinstance(recorrencia, dict):
+            raise ValueError("recorrencia é obrigatória")
+
+        cliente = self.cliente_service.get_cliente_by_id(cliente_id)
+        if not cliente or not cliente.ativo:
+            raise ValueError("Cliente não encontrado ou inativo")
+
+        pet = self.pet_service.get_pet_by_id(pet_id)
+        if not pet or not pet.ativo:
+            raise ValueError("Pet não encontrado ou inativo")
+        if pet.cliente_id != cliente.id:
+            raise ValueError("Pet não pertence ao cliente informado")
+
+        servico = self.servico_service.get_servico_by_id(servico_id)
+        if not servico or not servico.ativo:
+            raise ValueError("Serviço não encontrado ou inativo")
+
+        if funcionario_id:
+            funcionario = self.funcionario_service.get_funcionario_by_id(funcionario_id)
+            if not funcionario or not funcionario.ativo:
+                raise ValueError("Funcionário não encontrado ou inativo")
+
+        if isinstance(data_agendamento, str):
+            data_agendamento = datetime.fromisoformat(data_agendamento)
+        if data_agendamento < datetime.now():
+            raise ValueError("Não é possível agendar para datas passadas")
+
+        datas = gerar_recorrencia(data_agendamento, recorrencia.get('frequencia'),
+                                  recorrencia.get('intervalo', 1), recorrencia.get('ocorrencias'),
+                                  recorrencia.get('ate'))
+
+        tempo_estimado = tempo_estimado or servico.duracao_estimada
+        if valor_estimado is None:
+            valor_estimado = servico.preco
+        intervalos = [(inicio, calcular_data_fim(inicio, tempo_estimado)) for inicio in datas]
+
+        # Agendamentos do funcionário na janela da série, com o maior fim acumulado
+        # para responder "algum começa antes de X e termina depois de Y?" por bisect
+        inicios, maiores_fins = [], []
+        if funcionario_id:
+            for inicio, fim in self.agendamento_repository.get_intervalos_ocupados(
+                    funcionario_id, intervalos[0][0], intervalos[-1][1]):
+                inicios.append(inicio)
+                maiores_fins.append(max(fim, maiores_fins[-1]) if maiores_fins else fim)
+
+        resultado, novos = [], []
+        fim_anterior = None
+        for inicio, fim in intervalos:
+            anteriores = bisect_left(inicios, fim)
+            ocupado = anteriores > 0 and maiores_fins[anteriores - 1] > inicio
+            sobreposto = funcionario_id and fim_anterior and fim_anterior > inicio
+            if ocupado or sobreposto:
+                resultado.append({'data_agendamento': inicio.isoformat(), 'status': 'conflito',
+                                  'erro': 'Funcionário já possui agendamento neste horário'})
+                continue
+            novos.append({
+                'cliente_id': cliente.id,
+                'pet_id': pet.id,
+                'servico_id': servico.id,
+                'funcionario_id': funcionario_id,
+                'data_agendamento': inicio,
+                'data_fim': fim,
+                'observacoes': observacoes,
+                'valor_estimado': valor_estimado,
+                'tempo_estimado': tempo_estimado,
+                'status': 'Agendado'
+            })
+            resultado.append({'data_agendamento': inicio.isoformat(), 'status': 'criado', 'inicio': inicio})
+            fim_anterior = fim
+
+        if novos:
+            ids = self.agendamento_repository.insert_many(novos)
+            for item in resultado:
+                if 'inicio' in item:
+                    item['id'] = ids[item.pop('inicio')]
+            # O INSERT em lote não dispara os eventos de sessão que limpam os caches
+            if funcionario_id:
+                DisponibilidadeRepository.invalidar({(funcionario_id, linha[campo].date())
+                                                     for linha in novos for campo in ('data_agendamento', 'data_fim')})
+            DashboardService.invalidar()
+
+        return {
+            'criados': len(novos),
+            'conflitos': len(resultado) - len(novos),
+            'ocorrencias': resultado
+        }
+
     def update_agendamento(self, agendamento_id, **kwargs):
         agendamento = self.agendamento_repository.get_by_id(agendamento_id)
         if not agendamento:
@@ -111,6 +318,16 @@ class AgendamentoService:
                 data_agendamento = datetime.fromisoformat(data_agendamento)
             if data_agendamento < datetime.now():
                 raise ValueError("Não é possível agendar para datas passadas")
+            kwargs['data_agendamento'] = data_agendamento
+
+        # Verificar sobreposição com o horário resultante da alteração
+        def valor(campo):
+            return kwargs[campo] if kwargs.get(campo) is not None else getattr(agendamento, campo)
+
+        if valor('status') in STATUS_ATIVOS:
+            self.verificar_conflito(valor('funcionario_id'), valor('data_agendamento'),
+                                    valor('tempo_estimado'), ignorar_id=agendamento.id,
+                                    servico_id=valor('servico_id'))
 
         # Atualizar campos
         for key, value in kwargs.items():
@@ -129,6 +346,12 @@ class AgendamentoService:
         if not agendamento:
             raise ValueError("Agendamento não encontrado")
 
+        # Reativar um agendamento volta a ocupar o horário do funcionário
+        if status in STATUS_ATIVOS and agendamento.status not in STATUS_ATIVOS:
+            self.verificar_conflito(agendamento.funcionario_id, agendamento.data_agendamento,
+                                    agendamento.tempo_estimado, ignorar_id=agendamento.id,
+                                    servico_id=agendamento.servico_id)
+
         agendamento.status = status
         self.agendamento_repository.update(agendamento)
         return agendamento
@@ -162,28 +385,24 @@ class AgendamentoService:
     def get_status_disponiveis(self):
         return ['Agendado', 'Confirmado', 'Em Andamento', 'Concluído', 'Cancelado']
 
+    @read_only
     def get_agendamentos_estatisticas(self):
-        """Retorna estatísticas dos agendamentos"""
-        agendamentos = self.get_all_agendamentos()
-        
-        total = len(agendamentos)
-        
-        # Contar por status
-        status_count = {}
-        for agendamento in agendamentos:
-            status = agendamento.status
-            status_count[status] = status_count.get(status, 0) + 1
-
-        # Agendamentos de hoje
-        agendamentos_hoje = self.get_agendamentos_hoje()
-        
-        # Agendamentos da semana
-        agendamentos_semana = self.get_agendamentos_semana()
+        """Retorna estatísticas dos agendamentos a partir de consultas agregadas"""
+        hoje = datetime.now().date()
+        inicio_hoje = datetime.combine(hoje, datetime.min.time())
+        inicio_semana = inicio_hoje - timedelta(days=hoje.weekday())
+        periodos = {
+            'hoje': (inicio_hoje, inicio_hoje + timedelta(days=1)),
+            'semana': (inicio_semana, inicio_semana + timedelta(days=7)),
+        }
+
+        status_count = self.agendamento_repository.count_by_status()
+        contagem_periodos = self.agendamento_repository.count_in_periods(periodos)
 
         return {
-            'total': total,
-            'hoje': len(agendamentos_hoje),
-            'semana': len(agendamentos_semana),
+            'total': sum(status_count.values()),
+            'hoje': contagem_periodos['hoje'],
+            'semana': contagem_periodos['semana'],
             'por_status': status_count,
             'agendados': status_count.get('Agendado', 0),
             'confirmados': status_count.get('Confirmado', 0),
@@ -0,0 +1,32 @@
+from src.model.repositories.busca_repository import BuscaRepository, DOCUMENTOS
+
+class BuscaService:
+    def __init__(self):
+        self.busca_repository = BuscaRepository()
+
+    def get_tipos_disponiveis(self):
+        return list(DOCUMENTOS.keys())
+
+    def buscar(self, termo, tipos=None, limit=20):
+        """Busca global ordenada por relevância em clientes, pets, serviços e agendamentos"""
+        if not termo or len(termo.strip()) < 2:
+            raise ValueError("Informe ao menos 2 caracteres para a busca")
+
+        if tipos:
+            invalidos = [tipo for tipo in tipos if tipo not in DOCUMENTOS]
+            if invalidos:
+                raise ValueError(f"Tipo inválido. Use um dos seguintes: {', '.join(DOCUMENTOS)}")
+
+        if not self.busca_repository.disponivel():
+            raise RuntimeError("Índice de busca indisponível para este banco de dados")
+
+        return [
+            {
+                'tipo': row.tipo,
+                'id': row.ref_id,
+                'titulo': row.rotulo,
+                'subtitulo': row.subtitulo,
+                'relevancia': round(-row.rank, 4)
+            }
+            for row in self.busca_repository.search(termo, tipos=tipos, limit=limit)
+        ]
@@ -1,18 +1,60 @@
+import re
 from src.model.repositories.cliente_repository import ClienteRepository
-from src.model.models import Cliente
+from src.model.repositories.pet_repository import PetRepository
+from src.model.repositories.unit_of_work import unit_of_work, read_only
+from src.model.repositories.autocomplete_repository import AutocompleteRepository
+from src.model.repositories.batch_loader import load_grouped, load_in_order
+from src.model.models import Cliente, Pet
+
+def formatar_cpf(cpf):
+    """CPF com 11 dígitos no formato 000.000.000-00; outros valores ficam como vieram
+
+    Cadastro, edição e importação gravam o CPF assim, para que a checagem de
+    duplicidade (e a restrição UNIQUE) não dependa de como ele foi digitado.
+    """
+    digitos = re.sub(r'\D', '', cpf)
+    if len(digitos) != 11:
+        return cpf
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
 
 class ClienteService:
     def __init__(self):
         self.cliente_repository = ClienteRepository()
+        self.pet_repository = PetRepository()
 
+    @read_only
     def get_all_clientes(self):
         return self.cliente_repository.get_all()
 
+    @read_only
+    def search(self, search=None, status=None, page=1, per_page=10):
+        """Busca paginada de clientes com filtros aplicados no banco"""
+        return self.cliente_repository.search(search=search, status=status, page=page, per_page=per_page)
+
+    @read_only
+    def get_clientes_page(self, after=None, limit=100):
+        """Página de clientes a partir da chave after (paginação por cursor)"""
+        return self.cliente_repository.get_page(after=after, limit=limit)
+
+    @read_only
+    def get_clientes_by_ids(self, ids):
+        """(clientes na ordem de ids, ids não encontrados), em consultas IN"""
+        return load_in_order(Cliente, ids)
+
+    @read_only
+    def get_pets_by_cliente_ids(self, ids):
+        """({cliente_id: [pets ativos]} na ordem de ids, clientes não encontrados), em consultas IN"""
+        return load_grouped(Cliente, Pet, Pet.cliente_id, ids, Pet.ativo.is_(True))
+
+    def autocomplete(self, termo, limit=10):
+        """Clientes ativos cujo nome, CPF ou email começam pelas palavras digitadas ou contêm o texto (índice em memória)"""
+        return AutocompleteRepository().search_clientes(termo, limit=limit)
+
     def get_cliente_by_id(self, cliente_id):
         return self.cliente_repository.get_by_id(cliente_id)
 
     def get_cliente_by_cpf(self, cpf):
-        return self.cliente_repository.get_by_cpf(cpf)
+        return self.cliente_repository.get_by_cpf(formatar_cpf(cpf))
 
     def get_cliente_by_email(self, email):
         return self.cliente_repository.get_by_email(email)
@@ -21,6 +63,7 @@ class ClienteService:
         if not nome or not cpf or not telefone:
             raise ValueError("Nome, CPF e telefone são obrigatórios")
 
+        cpf = formatar_cpf(cpf)
         if self.cliente_repository.get_by_cpf(cpf):
             raise ValueError("CPF já cadastrado")
 
@@ -39,6 +82,7 @@ class ClienteService:
         if not nome or not cpf or not telefone:
             raise ValueError("Nome, CPF e telefone são obrigatórios")
 
+        cpf = formatar_cpf(cpf)
         cpf_existente = self.cliente_repository.get_by_cpf(cpf)
         if cpf_existente and cpf_existente.id != cliente_id:
             raise ValueError("CPF já cadastrado para outro cliente")
@@ -48,28 +92,41 @@ class ClienteService:
             if email_existente and email_existente.id != cliente_id:
                 raise ValueError("Email já cadastrado para outro cliente")
 
+        reativado = ativo and not cliente.ativo
         cliente.nome = nome if nome is not None else cliente.nome
         cliente.cpf = cpf if cpf is not None else cliente.cpf
         cliente.telefone = telefone if telefone is not None else cliente.telefone
         cliente.email = email if email is not None else cliente.email
         cliente.endereco = endereco if endereco is not None else cliente.endereco
         cliente.ativo = ativo if ativo is not None else cliente.ativo
-        self.cliente_repository.update(cliente)
+        with unit_of_work():
+            self.cliente_repository.update(cliente)
+            # Reativação pela edição: mesmo efeito de activate_cliente sobre os pets
+            if reativado:
+                self.pet_repository.reativar_com_cliente(cliente_id)
         return cliente
 
     def deactivate_cliente(self, cliente_id):
+        """Desativa o cliente e os pets dele em uma única transação"""
         cliente = self.cliente_repository.get_by_id(cliente_id)
         if cliente:
-            cliente.ativo = False
-            self.cliente_repository.update(cliente)
+            with unit_of_work():
+                cliente.ativo = False
+                self.cliente_repository.update(cliente)
+                # Pets de cliente inativo não podem ser reativados nem recebem agendamentos;
+                # os desativados aqui voltam com activate_cliente
+                self.pet_repository.desativar_com_cliente(cliente_id)
             return True
         return False
 
     def activate_cliente(self, cliente_id):
+        """Reativa o cliente e os pets que foram desativados junto com ele, em uma única transação"""
         cliente = self.cliente_repository.get_by_id(cliente_id)
         if cliente:
-            cliente.ativo = True
-            self.cliente_repository.update(cliente)
+            with unit_of_work():
+                cliente.ativo = True
+                self.cliente_repository.update(cliente)
+                self.pet_repository.reativar_com_cliente(cliente_id)
             return cliente
         return None
 
@@ -0,0 +1,92 @@
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from threading import Lock
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.model.models import Cliente, Pet, Funcionario, Servico, Agendamento
+from src.model.repositories.agendamento_repository import AgendamentoRepository
+from src.model.repositories.dashboard_repository import DashboardRepository, CADASTROS, STATUS_PENDENTES
+
+# Modelos cujas escritas invalidam o resumo do dashboard
+MODELOS_DASHBOARD = (Cliente, Pet, Funcionario, Servico, Agendamento)
+
+class DashboardService:
+    """Resumo do dashboard com cache curto (TTL) invalidado a cada commit que altera os dados"""
+
+    TTL = 30
+    _cache = None
+    _lock = Lock()
+
+    def __init__(self):
+        self.dashboard_repository = DashboardRepository()
+        self.agendamento_repository = AgendamentoRepository()
+
+    def get_resumo(self):
+        """Retorna {'stats', 'clientes_recentes', 'agendamentos_hoje'} usando o cache quando válido"""
+        hoje = date.today()
+        cache = DashboardService._cache
+        if cache and cache['dia'] == hoje and cache['expira_em'] > time.monotonic():
+            return cache['resumo']
+
+        resumo = self._calcular(hoje)
+        with self._lock:
+            DashboardService._cache = {
+                'dia': hoje,
+                'expira_em': time.monotonic() + self.TTL,
+                'resumo': resumo,
+            }
+        return resumo
+
+    @classmethod
+    def invalidar(cls):
+        with cls._lock:
+            cls._cache = None
+
+    def _calcular(self, hoje):
+        inicio = datetime.combine(hoje, dtime.min)
+        fim = inicio + timedelta(days=1)
+
+        stats = {}
+        for nome, model in CADASTROS.items():
+            total, ativos = self.dashboard_repository.contar_cadastros(model)
+            stats[f'total_{nome}'] = total
+            stats[f'{nome}_ativos'] = ativos
+
+        por_status = self.agendamento_repository.count_by_status()
+        stats['total_agendamentos'] = sum(por_status.values())
+        stats['agendamentos_hoje'] = self.agendamento_repository.count_in_periods({'hoje': (inicio, fim)})['hoje']
+        stats['agendamentos_pendentes'] = sum(por_status.get(status, 0) for status in STATUS_PENDENTES)
+
+        # Dicionários simples: podem ser reutilizados entre requisições sem sessão aberta
+        clientes_recentes = [row._asdict() for row in self.dashboard_repository.get_clientes_recentes()]
+        agendamentos_hoje = [
+            {
+                'id': row.id,
+                'data_agendamento': row.data_agendamento,
+                'status': row.status,
+                'cliente': {'nome': row.cliente_nome} if row.cliente_nome else None,
+                'servico': {'nome': row.servico_nome} if row.servico_nome else None,
+            }
+            for row in self.dashboard_repository.get_agendamentos_periodo(inicio, fim)
+        ]
+
+        return {
+            'stats': stats,
+            'clientes_recentes': clientes_recentes,
+            'agendamentos_hoje': agendamentos_hoje,
+        }
+
+@event.listens_for(Session, 'after_flush')
+def _marcar_alteracao(session, flush_context):
+    objetos = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, MODELOS_DASHBOARD) for obj in objetos):
+        session.info['dashboard_alterado'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _invalidar_cache(session):
+    if session.info.pop('dashboard_alterado', False):
+        DashboardService.invalidar()
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_alteracao(session, previous_transaction):
+    session.info.pop('dashboard_alterado', None)
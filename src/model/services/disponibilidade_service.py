@@ -0,0 +1,99 @@
+from datetime import date, datetime, time, timedelta
+from src.model.models.agendamento import DURACAO_PADRAO
+from src.model.repositories.disponibilidade_repository import (DisponibilidadeRepository, SLOT_MINUTOS, ROTULOS,
+                                                               slot_do_horario)
+from src.model.repositories.funcionario_repository import FuncionarioRepository
+from src.model.repositories.servico_repository import ServicoRepository
+
+# Horário de funcionamento considerado na busca de horários livres
+HORARIO_ABERTURA = time(8, 0)
+HORARIO_FECHAMENTO = time(18, 0)
+
+# Maior intervalo de dias aceito em uma consulta
+MAX_DIAS = 31
+
+def _para_data(valor, campo):
+    if isinstance(valor, date):
+        return valor
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(f'Formato de {campo} inválido. Use YYYY-MM-DD')
+
+def inicios_livres(ocupado, slots_necessarios, primeiro, ultimo):
+    """Slots em [primeiro, ultimo) onde cabem slots_necessarios slots livres consecutivos"""
+    livres = ~ocupado & (((1 << (ultimo - primeiro)) - 1) << primeiro)
+    cabe = livres
+    for deslocamento in range(1, slots_necessarios):
+        cabe &= livres >> deslocamento
+    return [slot for slot in range(primeiro, ultimo - slots_necessarios + 1) if cabe >> slot & 1]
+
+class DisponibilidadeService:
+    def __init__(self):
+        self.disponibilidade_repository = DisponibilidadeRepository()
+        self.funcionario_repository = FuncionarioRepository()
+        self.servico_repository = ServicoRepository()
+
+    def get_disponibilidade(self, servico_id, data_inicio=None, data_fim=None, funcionario_id=None):
+        """Horários de início livres, por funcionário e dia, em que o serviço cabe inteiro"""
+        if not servico_id:
+            raise ValueError('servico_id é obrigatório')
+        servico = self.servico_repository.get_by_id(servico_id)
+        if not servico or not servico.ativo:
+            raise ValueError('Serviço não encontrado ou inativo')
+
+        data_inicio = _para_data(data_inicio, 'data_inicio') if data_inicio else date.today()
+        data_fim = _para_data(data_fim, 'data_fim') if data_fim else data_inicio + timedelta(days=6)
+        if data_fim < data_inicio:
+            raise ValueError('data_fim deve ser igual ou posterior a data_inicio')
+        if (data_fim - data_inicio).days >= MAX_DIAS:
+            raise ValueError(f'O intervalo máximo é de {MAX_DIAS} dias')
+
+        if funcionario_id:
+            funcionario = self.funcionario_repository.get_by_id(funcionario_id)
+            if not funcionario or not funcionario.ativo:
+                raise ValueError('Funcionário não encontrado ou inativo')
+            funcionarios = [funcionario]
+        else:
+            funcionarios = self.funcionario_repository.get_active()
+
+        duracao = servico.duracao_estimada or DURACAO_PADRAO
+        slots_necessarios = -(-duracao // SLOT_MINUTOS)
+        dias = [data_inicio + timedelta(days=i) for i in range((data_fim - data_inicio).days + 1)]
+        mapas = self.disponibilidade_repository.get_mapas([f.id for f in funcionarios], dias)
+
+        agora = datetime.now()
+        abertura = slot_do_horario(HORARIO_ABERTURA)
+        fechamento = slot_do_horario(HORARIO_FECHAMENTO)
+        resultado = []
+        for funcionario in funcionarios:
+            livres_por_dia = []
+            for dia in dias:
+                primeiro = abertura
+                if dia == agora.date():
+                    # Hoje: apenas horários que ainda não passaram
+                    primeiro = max(primeiro, -(-(agora.hour * 60 + agora.minute) // SLOT_MINUTOS))
+                elif dia < agora.date():
+                    continue
+                if primeiro >= fechamento:
+                    continue
+                slots = inicios_livres(mapas[(funcionario.id, dia)], slots_necessarios, primeiro, fechamento)
+                if slots:
+                    livres_por_dia.append({
+                        'data': dia.isoformat(),
+                        'horarios': [ROTULOS[slot] for slot in slots]
+                    })
+            resultado.append({
+                'funcionario_id': funcionario.id,
+                'nome': funcionario.nome,
+                'dias': livres_por_dia
+            })
+
+        return {
+            'servico_id': servico.id,
+            'duracao': duracao,
+            'slot': SLOT_MINUTOS,
+            'data_inicio': data_inicio.isoformat(),
+            'data_fim': data_fim.isoformat(),
+            'funcionarios': resultado
+        }
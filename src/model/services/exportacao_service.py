@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from src.model.repositories.exportacao_repository import ExportacaoRepository
+from src.model.repositories.unit_of_work import read_only
+
+FORMATOS = ('csv', 'ndjson')
+
+def _valor(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+def _para_data(valor, campo):
+    if not valor:
+        return None
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f'Formato de {campo} inválido. Use YYYY-MM-DD')
+
+def linhas_csv(resultado):
+    """Cabeçalho e linhas em CSV, um bloco de texto por lote do cursor"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(resultado.keys())
+    for lote in resultado.partitions():
+        writer.writerows([_valor(valor) for valor in row] for row in lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def linhas_ndjson(resultado):
+    """Um objeto JSON por linha, um bloco de texto por lote do cursor"""
+    colunas = list(resultado.keys())
+    for lote in resultado.partitions():
+        yield ''.join(
+            json.dumps(dict(zip(colunas, row)), ensure_ascii=False, default=_valor) + '\n'
+            for row in lote
+        )
+
+class ExportacaoService:
+    """Exportação em fluxo (CSV ou NDJSON) de agendamentos, clientes e pets
+
+    Os filtros são validados na chamada; a consulta só é executada quando o
+    gerador retornado começa a ser consumido (durante o envio da resposta).
+    """
+
+    def __init__(self):
+        self.exportacao_repository = ExportacaoRepository()
+
+    def exportar_agendamentos(self, formato='csv', data_inicio=None, data_fim=None, status=None):
+        formatar = self._formatador(formato)
+        inicio = _para_data(data_inicio, 'data_inicio')
+        fim = _para_data(data_fim, 'data_fim')
+        if inicio and fim and fim < inicio:
+            raise ValueError('data_fim deve ser igual ou posterior a data_inicio')
+        return self._gerar(formatar, self.exportacao_repository.agendamentos, data_inicio=data_inicio,
+                           data_fim=data_fim, status=status)
+
+    def exportar_clientes(self, formato='csv', status=None):
+        return self._gerar(self._formatador(formato), self.exportacao_repository.clientes, status=status)
+
+    def exportar_pets(self, formato='csv', status=None, especie=None, cliente_id=None):
+        return self._gerar(self._formatador(formato), self.exportacao_repository.pets, status=status,
+                           especie=especie, cliente_id=cliente_id)
+
+    def _formatador(self, formato):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato inválido. Use um dos seguintes: {', '.join(FORMATOS)}")
+        return linhas_csv if formato == 'csv' else linhas_ndjson
+
+    @read_only
+    def _gerar(self, formatar, consultar, **filtros):
+        resultado = None
+        try:
+            resultado = consultar(**filtros)
+            yield from formatar(resultado)
+        finally:
+            # Envio interrompido: libera o cursor em vez de esperar o coletor de lixo
+            if resultado is not None:
+                resultado.close()
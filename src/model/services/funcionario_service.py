@@ -1,4 +1,6 @@
 from src.model.repositories.funcionario_repository import FuncionarioRepository
+from src.model.repositories.unit_of_work import read_only
+from src.model.repositories.batch_loader import load_in_order
 from src.model.models import Funcionario
 from datetime import datetime
 
@@ -6,12 +8,31 @@ class FuncionarioService:
     def __init__(self):
         self.funcionario_repository = FuncionarioRepository()
 
+    @read_only
     def get_all_funcionarios(self):
         return self.funcionario_repository.get_all()
 
+    @read_only
+    def get_funcionarios_opcoes(self):
+        return self.funcionario_repository.get_opcoes()
+
+    @read_only
+    def search(self, search=None, status=None, page=1, per_page=10):
+        """Busca paginada de funcionários com filtros aplicados no banco"""
+        return self.funcionario_repository.search(search=search, status=status, page=page, per_page=per_page)
+
+    @read_only
+    def get_funcionarios_by_ids(self, ids):
+        """(funcionários na ordem de ids, ids não encontrados), em consultas IN"""
+        return load_in_order(Funcionario, ids)
+
     def get_funcionario_by_id(self, funcionario_id):
         return self.funcionario_repository.get_by_id(funcionario_id)
 
+    def get_funcionario_detalhe(self, funcionario_id):
+        """Funcionário com os agendamentos já carregados, para a página de visualização"""
+        return self.funcionario_repository.get_with_agendamentos(funcionario_id)
+
     def get_funcionario_by_cpf(self, cpf):
         return self.funcionario_repository.get_by_cpf(cpf)
 
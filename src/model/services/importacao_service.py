@@ -0,0 +1,309 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from src.model.repositories.autocomplete_repository import AutocompleteRepository
+from src.model.repositories.cliente_repository import ClienteRepository
+from src.model.repositories.pet_repository import PetRepository
+from src.model.services.cliente_service import formatar_cpf
+from src.model.services.dashboard_service import DashboardService
+from src.model.services.pet_service import PetService
+
+# Registros validados e gravados por vez (uma transação por lote)
+TAMANHO_LOTE = 1000
+# Caracteres lidos por vez dos arquivos JSON
+TAMANHO_LEITURA = 64 * 1024
+# Rejeições devolvidas no resumo (o relatório completo vai para o arquivo)
+MAX_AMOSTRA_REJEITADOS = 100
+
+FORMATOS = ('csv', 'json', 'ndjson')
+
+def abrir_texto(arquivo):
+    """Texto UTF-8 (com ou sem BOM) sobre um arquivo binário, lido sob demanda"""
+    if isinstance(arquivo, io.TextIOBase):
+        return arquivo
+    if not isinstance(arquivo, io.BufferedIOBase):
+        arquivo = io.BufferedReader(arquivo)
+    return io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+
+def ler_csv(texto):
+    for numero, registro in enumerate(csv.DictReader(texto), start=1):
+        yield numero, registro
+
+def ler_json(texto):
+    """Objetos de uma lista JSON ou de um NDJSON, decodificados aos pedaços
+
+    Apenas o trecho ainda não decodificado fica em memória, então o consumo
+    não depende do tamanho do arquivo.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    numero = 0
+    em_lista = None
+    while True:
+        bloco = texto.read(TAMANHO_LEITURA)
+        buffer += bloco
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                break
+            if em_lista is None:
+                em_lista = buffer[pos] == '['
+                pos += em_lista
+                continue
+            if em_lista and buffer[pos] == ']':
+                return
+            try:
+                registro, pos_final = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not bloco:
+                    raise ValueError(f'JSON inválido após o registro {numero}')
+                break
+            numero += 1
+            pos = pos_final
+            yield numero, registro
+        buffer = buffer[pos:]
+        if not bloco:
+            if em_lista:
+                raise ValueError('JSON inválido: lista não terminada')
+            return
+
+def ler_registros(arquivo, formato):
+    """Gera (número do registro, dict) a partir do arquivo, sem carregá-lo inteiro"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido. Use um dos seguintes: {', '.join(FORMATOS)}")
+    texto = abrir_texto(arquivo)
+    return ler_csv(texto) if formato == 'csv' else ler_json(texto)
+
+def formato_do_arquivo(nome, padrao='csv'):
+    """Formato pela extensão do arquivo (.csv, .json, .ndjson ou .jsonl)"""
+    extensao = os.path.splitext(nome or '')[1].lower().lstrip('.')
+    extensao = 'ndjson' if extensao == 'jsonl' else extensao
+    return extensao if extensao in FORMATOS else padrao
+
+def _texto(registro, campo):
+    valor = registro.get(campo)
+    if valor is None:
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+def _lotes(registros, tamanho):
+    lote = []
+    for item in registros:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+class RelatorioImportacao:
+    """Contagens da importação e relatório CSV das linhas rejeitadas"""
+
+    def __init__(self, rejeitados=None):
+        self.lidos = 0
+        self.importados = 0
+        self.rejeitados = 0
+        self.amostra = []
+        self.writer = csv.writer(rejeitados) if rejeitados else None
+        if self.writer:
+            self.writer.writerow(['registro', 'erro', 'dados'])
+
+    def rejeitar(self, numero, registro, erro):
+        self.rejeitados += 1
+        if len(self.amostra) < MAX_AMOSTRA_REJEITADOS:
+            self.amostra.append({'registro': numero, 'erro': erro})
+        if self.writer:
+            self.writer.writerow([numero, erro, json.dumps(registro, ensure_ascii=False, default=str)])
+
+    def to_dict(self):
+        return {
+            'lidos': self.lidos,
+            'importados': self.importados,
+            'rejeitados': self.rejeitados,
+            'amostra_rejeitados': self.amostra
+        }
+
+class ImportacaoService:
+    """Importação em massa de clientes e pets a partir de CSV, JSON ou NDJSON
+
+    O arquivo é lido em fluxo e processado em lotes de TAMANHO_LOTE: as
+    regras de cadastro são verificadas com uma consulta por lote (em vez de
+    consultas por linha), cada lote é gravado com um único INSERT e um
+    commit, e as linhas recusadas vão para o relatório com o motivo. Lotes
+    já gravados permanecem se a importação for interrompida.
+    """
+
+    def __init__(self):
+        self.cliente_repository = ClienteRepository()
+        self.pet_repository = PetRepository()
+        self.pet_service = PetService()
+
+    def importar_clientes(self, arquivo, formato='csv', rejeitados=None, tamanho_lote=TAMANHO_LOTE):
+        return self._importar(self._importar_lote_clientes, arquivo, formato, rejeitados, tamanho_lote)
+
+    def importar_pets(self, arquivo, formato='csv', rejeitados=None, tamanho_lote=TAMANHO_LOTE):
+        return self._importar(self._importar_lote_pets, arquivo, formato, rejeitados, tamanho_lote)
+
+    def _importar(self, importar_lote, arquivo, formato, rejeitados, tamanho_lote):
+        relatorio = RelatorioImportacao(rejeitados)
+        registros = ler_registros(arquivo, formato)
+        # O índice de autocomplete é reconstruído sob demanda depois da carga
+        AutocompleteRepository.invalidar()
+        try:
+            for lote in _lotes(registros, tamanho_lote):
+                importar_lote(lote, relatorio)
+        finally:
+            if relatorio.importados:
+                AutocompleteRepository.invalidar()
+                DashboardService.invalidar()
+        return relatorio.to_dict()
+
+    def _importar_lote_clientes(self, lote, relatorio):
+        relatorio.lidos += len(lote)
+        candidatos = []
+        for numero, registro in lote:
+            if not isinstance(registro, dict):
+                relatorio.rejeitar(numero, registro, 'Registro deve ser um objeto')
+                continue
+            linha = {
+                'nome': _texto(registro, 'nome'),
+                'cpf': _texto(registro, 'cpf'),
+                'telefone': _texto(registro, 'telefone'),
+                'email': _texto(registro, 'email'),
+                'endereco': _texto(registro, 'endereco'),
+                'ativo': True
+            }
+            if not linha['nome'] or not linha['cpf'] or not linha['telefone']:
+                relatorio.rejeitar(numero, registro, 'Nome, CPF e telefone são obrigatórios')
+                continue
+            linha['cpf'] = formatar_cpf(linha['cpf'])
+            candidatos.append((numero, registro, linha))
+
+        # Lotes anteriores já foram gravados: a consulta cobre banco e arquivo
+        cpfs_existentes = self.cliente_repository.get_cpfs_existentes({l['cpf'] for _, _, l in candidatos})
+        emails_existentes = self.cliente_repository.get_emails_existentes(
+            {l['email'] for _, _, l in candidatos if l['email']})
+
+        novos = []
+        for numero, registro, linha in candidatos:
+            if linha['cpf'] in cpfs_existentes:
+                relatorio.rejeitar(numero, registro, 'CPF já cadastrado')
+                continue
+            if linha['email'] and linha['email'] in emails_existentes:
+                relatorio.rejeitar(numero, registro, 'Email já cadastrado')
+                continue
+            cpfs_existentes.add(linha['cpf'])
+            if linha['email']:
+                emails_existentes.add(linha['email'])
+            novos.append(linha)
+
+        if novos:
+            self.cliente_repository.insert_many(novos)
+            relatorio.importados += len(novos)
+
+    def _importar_lote_pets(self, lote, relatorio):
+        relatorio.lidos += len(lote)
+        especies = self.pet_service.get_especies_disponiveis()
+        sexos = self.pet_service.get_sexos_disponiveis()
+        hoje = datetime.now().date()
+
+        candidatos = []
+        for numero, registro in lote:
+            if not isinstance(registro, dict):
+                relatorio.rejeitar(numero, registro, 'Registro deve ser um objeto')
+                continue
+            try:
+                linha = self._validar_pet(registro, especies, sexos, hoje)
+            except ValueError as e:
+                relatorio.rejeitar(numero, registro, str(e))
+                continue
+            candidatos.append((numero, registro, linha))
+
+        # Dono pelo id ou pelo CPF (o id do sistema antigo não existe aqui)
+        situacao_por_id = self.cliente_repository.get_situacao_by_ids(
+            {l['cliente_id'] for _, _, l in candidatos if l['cliente_id']})
+        situacao_por_cpf = self.cliente_repository.get_situacao_by_cpfs(
+            {l['cliente_cpf'] for _, _, l in candidatos if not l['cliente_id']})
+
+        com_dono = []
+        for numero, registro, linha in candidatos:
+            cpf = linha.pop('cliente_cpf')
+            if linha['cliente_id']:
+                ativo = situacao_por_id.get(linha['cliente_id'])
+            else:
+                linha['cliente_id'], ativo = situacao_por_cpf.get(cpf, (None, None))
+            if ativo is None:
+                relatorio.rejeitar(numero, registro, 'Cliente não encontrado')
+            elif not ativo:
+                relatorio.rejeitar(numero, registro, 'Não é possível cadastrar pet para cliente inativo')
+            else:
+                com_dono.append((numero, registro, linha))
+
+        existentes = self.pet_repository.get_nomes_existentes(
+            {(l['cliente_id'], l['nome']) for _, _, l in com_dono})
+        novos = []
+        for numero, registro, linha in com_dono:
+            chave = (linha['cliente_id'], linha['nome'])
+            if chave in existentes:
+                relatorio.rejeitar(numero, registro, 'Já existe um pet com este nome para este cliente')
+                continue
+            existentes.add(chave)
+            novos.append(linha)
+
+        if novos:
+            self.pet_repository.insert_many(novos)
+            relatorio.importados += len(novos)
+
+    def _validar_pet(self, registro, especies, sexos, hoje):
+        """Mesmas regras de PetService.create_pet, sem consultas ao banco"""
+        linha = {
+            'nome': _texto(registro, 'nome'),
+            'especie': _texto(registro, 'especie'),
+            'raca': _texto(registro, 'raca'),
+            'cor': _texto(registro, 'cor'),
+            'sexo': _texto(registro, 'sexo'),
+            'observacoes': _texto(registro, 'observacoes'),
+            'data_nascimento': None,
+            'peso': None,
+            'ativo': True
+        }
+        cliente_id = _texto(registro, 'cliente_id')
+        linha['cliente_cpf'] = _texto(registro, 'cliente_cpf')
+        if not linha['nome'] or not linha['especie'] or not (cliente_id or linha['cliente_cpf']):
+            raise ValueError("Nome, espécie e cliente (cliente_id ou cliente_cpf) são obrigatórios")
+        try:
+            linha['cliente_id'] = int(cliente_id) if cliente_id else None
+        except ValueError:
+            raise ValueError("cliente_id inválido")
+        if linha['cliente_cpf']:
+            linha['cliente_cpf'] = formatar_cpf(linha['cliente_cpf'])
+
+        if linha['especie'] not in especies:
+            raise ValueError(f"Espécie deve ser uma das seguintes: {', '.join(especies)}")
+        # Obrigatório na tabela
+        if linha['sexo'] not in sexos:
+            raise ValueError("Sexo deve ser 'Macho' ou 'Fêmea'")
+
+        peso = _texto(registro, 'peso')
+        if peso:
+            try:
+                linha['peso'] = float(peso.replace(',', '.'))
+            except ValueError:
+                raise ValueError("Peso inválido")
+            if linha['peso'] <= 0:
+                raise ValueError("Peso deve ser maior que zero")
+
+        data_nascimento = _texto(registro, 'data_nascimento')
+        if data_nascimento:
+            try:
+                linha['data_nascimento'] = datetime.strptime(data_nascimento, '%Y-%m-%d').date()
+            except ValueError:
+                raise ValueError("Formato de data de nascimento inválido. Use YYYY-MM-DD")
+            if linha['data_nascimento'] > hoje:
+                raise ValueError("Data de nascimento não pode ser no futuro")
+        return linha
@@ -1,5 +1,8 @@
-from src.model.repositories.pet_repository import PetRepository
+from src.model.repositories.pet_repository import PetRepository, RELACOES
+from src.model.repositories.batch_loader import load_in_order, load_relations
 from src.model.repositories.cliente_repository import ClienteRepository
+from src.model.repositories.autocomplete_repository import AutocompleteRepository
+from src.model.repositories.unit_of_work import read_only
 from src.model.models import Pet
 from datetime import datetime
 
@@ -8,9 +11,35 @@ class PetService:
         self.pet_repository = PetRepository()
         self.cliente_repository = ClienteRepository()
 
+    @read_only
     def get_all_pets(self):
         return self.pet_repository.get_all()
 
+    @read_only
+    def search(self, search=None, status=None, especie=None, cliente_id=None, page=1, per_page=10):
+        """Busca paginada de pets com filtros aplicados no banco"""
+        return self.pet_repository.search(search=search, status=status, especie=especie,
+                                          cliente_id=cliente_id, page=page, per_page=per_page)
+
+    @read_only
+    def get_pets_page(self, after=None, limit=100, cliente_id=None, campos=None):
+        """Página de pets a partir da chave after (paginação por cursor)"""
+        return self.pet_repository.get_page(after=after, limit=limit, cliente_id=cliente_id, campos=campos)
+
+    @read_only
+    def get_pets_by_ids(self, ids):
+        """(pets na ordem de ids, ids não encontrados), em consultas IN"""
+        return load_in_order(Pet, ids)
+
+    @read_only
+    def get_relacionados(self, pets, include):
+        """Relações pedidas em ?include= ({relação: campos}), uma consulta em lote por relação"""
+        return load_relations(pets, RELACOES, include)
+
+    def autocomplete(self, termo, limit=10, cliente_id=None):
+        """Pets ativos cujo nome ou raça começam pelas palavras digitadas ou contêm o texto (índice em memória)"""
+        return AutocompleteRepository().search_pets(termo, limit=limit, cliente_id=cliente_id)
+
     def get_pet_by_id(self, pet_id):
         return self.pet_repository.get_by_id(pet_id)
 
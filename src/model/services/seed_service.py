@@ -0,0 +1,344 @@
+import math
+import random
+import unicodedata
+from bisect import bisect, bisect_right
+from datetime import date, timedelta
+from src.model.models import Agendamento, Cliente, Funcionario, Pet, Servico
+from src.model.repositories.seed_repository import SeedRepository
+
+# Escalas prontas; cada valor pode ser sobrescrito na linha de comando
+PERFIS = {
+    'demo': {'clientes': 200, 'pets_por_cliente': 1.5, 'funcionarios': 8, 'servicos': 12,
+             'agendamentos': 3000, 'anos': 1},
+    'producao': {'clientes': 100_000, 'pets_por_cliente': 1.5, 'funcionarios': 20, 'servicos': 40,
+                 'agendamentos': 2_000_000, 'anos': 3},
+}
+
+# Linhas por executemany (e por lista em memória)
+LOTE = 50_000
+
+NOMES = ['Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+         'Juliana', 'Lucas', 'Mariana', 'Mateus', 'Natália', 'Otávio', 'Patrícia', 'Rafael', 'Sofia', 'Thiago',
+         'Vanessa', 'Vinícius', 'Beatriz', 'Caio', 'Larissa', 'Gustavo', 'Camila', 'Pedro', 'Letícia', 'André',
+         'Fernanda', 'Rodrigo', 'Aline', 'Marcelo', 'Renata', 'Diego', 'Luana', 'Leonardo', 'Priscila', 'Samuel']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+              'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira',
+              'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado',
+              'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves', 'Santana', 'Teixeira', 'Araújo']
+RUAS = ['Rua das Flores', 'Av. Paulista', 'Rua Augusta', 'Rua XV de Novembro', 'Av. Brasil', 'Rua da Consolação',
+        'Rua Sete de Setembro', 'Av. Rebouças', 'Rua Bela Vista', 'Rua dos Pinheiros', 'Av. Ipiranga',
+        'Rua Oscar Freire', 'Rua Vergueiro', 'Av. Santo Amaro', 'Rua Haddock Lobo']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br', 'bol.com.br']
+NOMES_PETS = ['Rex', 'Mimi', 'Thor', 'Luna', 'Bob', 'Mel', 'Nina', 'Toby', 'Belinha', 'Fred', 'Pipoca', 'Max',
+              'Lola', 'Simba', 'Amora', 'Bidu', 'Pandora', 'Zeus', 'Jade', 'Paçoca', 'Tobias', 'Frida', 'Chico',
+              'Maya', 'Billy', 'Mia', 'Theo', 'Kiara', 'Marley', 'Pretinha', 'Bolinha', 'Lua', 'Nego', 'Safira']
+# Espécie: (peso na população, raças, cores, peso médio e desvio em kg)
+ESPECIES = {
+    'Cão': (60, ['SRD', 'Labrador', 'Shih Tzu', 'Poodle', 'Golden Retriever', 'Yorkshire', 'Bulldog Francês',
+                 'Pastor Alemão', 'Lhasa Apso', 'Pinscher', 'Spitz Alemão', 'Beagle'],
+            ['Preto', 'Branco', 'Caramelo', 'Marrom', 'Dourado', 'Tricolor', 'Cinza'], 14.0, 9.0),
+    'Gato': (34, ['SRD', 'Persa', 'Siamês', 'Maine Coon', 'Angorá', 'Sphynx', 'Ragdoll'],
+             ['Preto', 'Branco', 'Cinza', 'Laranja', 'Tigrado', 'Frajola', 'Escaminha'], 4.5, 1.2),
+    'Pássaro': (3, ['Calopsita', 'Periquito', 'Canário', 'Agapornis'],
+                ['Amarelo', 'Verde', 'Azul', 'Cinza'], 0.1, 0.03),
+    'Coelho': (2, ['Mini Lop', 'Lionhead', 'Holandês'], ['Branco', 'Cinza', 'Marrom'], 2.0, 0.5),
+    'Hamster': (1, ['Sírio', 'Anão Russo'], ['Dourado', 'Branco', 'Cinza'], 0.12, 0.03),
+}
+OBSERVACOES_PETS = ['Muito dócil', 'Agitado no banho', 'Alérgico a shampoo comum', 'Idoso, manusear com cuidado',
+                    'Morde quando assustado', 'Castrado', 'Usa coleira antipulgas']
+# Categoria: (cargo que atende, [(nome, preço base, duração em minutos)])
+CATALOGO = {
+    'Banho': ('Banhista', [('Banho Simples', 45, 60), ('Banho com Hidratação', 70, 75),
+                           ('Banho Terapêutico', 85, 75), ('Banho Antipulgas', 75, 60)]),
+    'Tosa': ('Tosador', [('Tosa Higiênica', 40, 45), ('Tosa na Máquina', 65, 75), ('Tosa na Tesoura', 90, 90),
+                         ('Tosa da Raça', 110, 120)]),
+    'Veterinária': ('Veterinário', [('Consulta Veterinária', 150, 30), ('Vacinação', 90, 15),
+                                    ('Retorno de Consulta', 60, 20), ('Exame de Sangue', 120, 20),
+                                    ('Microchipagem', 100, 15)]),
+    'Hospedagem': ('Cuidador', [('Day Care', 80, 480), ('Hotel (diária)', 120, 30)]),
+    'Outros': ('Atendente', [('Corte de Unhas', 25, 15), ('Limpeza de Ouvidos', 30, 15),
+                             ('Escovação de Dentes', 35, 20), ('Táxi Dog', 40, 60)]),
+}
+PORTES = ['Porte P', 'Porte M', 'Porte G']
+CARGOS = {'Veterinário': (7000, 12000), 'Tosador': (2500, 4000), 'Banhista': (1800, 2800),
+          'Atendente': (1700, 2600), 'Cuidador': (1800, 2700)}
+OBSERVACOES_AGENDAMENTOS = ['Cliente pediu perfume', 'Buscar às 17h', 'Pet com otite', 'Primeira vez na loja',
+                            'Trazer carteira de vacinação', 'Retorno pós-cirurgia', 'Pagamento no Pix']
+
+# Horários de atendimento (08:00 às 17:30, de 30 em 30 minutos) e procura relativa de cada um
+HORARIOS = [8 * 60 + 30 * i for i in range(20)]
+PROCURA_HORARIOS = [4, 7, 9, 10, 10, 9, 8, 6, 3, 3, 5, 7, 8, 8, 8, 7, 6, 5, 3, 2]
+# Procura por dia da semana (segunda = 0; domingo fechado)
+PROCURA_DIAS = [1.0, 0.9, 0.9, 1.0, 1.3, 1.7, 0.0]
+# Dias máximos entre a marcação (data_criacao) e o atendimento; em média, 5
+ANTECEDENCIA_MAXIMA = 60
+
+def _sem_acento(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode().lower().replace(' ', '')
+
+def _cpf(numero):
+    """CPF formatado e com dígitos verificadores válidos a partir de um número de 9 dígitos"""
+    digitos = [int(d) for d in f'{numero:09d}']
+    for tamanho in (9, 10):
+        soma = sum(d * p for d, p in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    texto = ''.join(map(str, digitos))
+    return f'{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}'
+
+def _telefone(rnd, prefixo, digitos):
+    numero = f'{prefixo}{rnd.randrange(10 ** (digitos - 1)):0{digitos - 1}d}'
+    return f'(11) {numero[:-4]}-{numero[-4:]}'
+
+def _data(dia):
+    return dia.isoformat()
+
+def _datahora(dia, minutos):
+    # Mesmo formato de texto que o SQLAlchemy grava no SQLite para DateTime
+    return f'{dia.isoformat()} {minutos // 60:02d}:{minutos % 60:02d}:00.000000'
+
+def _cumulativo(pesos):
+    total, acumulados = 0, []
+    for peso in pesos:
+        total += peso
+        acumulados.append(total)
+    return acumulados
+
+class SeedService:
+    """Gera uma base sintética determinística (mesma semente e parâmetros, mesmos dados)
+
+    Distribuições: pets por cliente ~ 1 + Poisson, espécies e raças com pesos
+    de mercado, serviços e clientes com procura de cauda longa (poucos
+    concentram boa parte dos agendamentos), agendamentos crescendo ao longo
+    do período, mais procurados no sábado, nenhum no domingo, e concentrados
+    no meio da manhã e da tarde. O passado fica quase todo concluído; o
+    próximo mês, agendado ou confirmado.
+
+    As colunas são sorteadas em bloco (random.choices com pesos acumulados)
+    e as datas montadas como texto a partir de tabelas pré-calculadas, para
+    gerar milhões de linhas em poucos segundos.
+    """
+
+    def __init__(self, seed=42, ate=None):
+        self.rnd = random.Random(seed)
+        self.ate = ate or date.today()
+        self.repository = SeedRepository()
+
+    def gerar(self, clientes, pets_por_cliente, funcionarios, servicos, agendamentos, anos, progresso=None):
+        """Recria o banco e gera os dados; retorna {tabela: linhas}"""
+        progresso = progresso or (lambda mensagem: None)
+        inicio = self.ate - timedelta(days=round(365 * anos))
+        self.repository.recriar_tabelas()
+
+        with self.repository.carga():
+            catalogo = self._servicos(servicos, inicio)
+            progresso(f'{len(catalogo)} serviços')
+            equipe = self._funcionarios(funcionarios, inicio)
+            progresso(f'{funcionarios} funcionários')
+            self._clientes(clientes, inicio)
+            progresso(f'{clientes} clientes')
+            donos, cadastros = self._pets(clientes, pets_por_cliente, inicio)
+            progresso(f'{len(donos)} pets')
+            with self.repository.sem_indices(Agendamento):
+                agendamentos = self._agendamentos(agendamentos, inicio, catalogo, equipe, donos, cadastros)
+                progresso(f'{agendamentos} agendamentos')
+        progresso('índices recriados')
+        self.repository.finalizar()
+        return {'servicos': len(catalogo), 'funcionarios': funcionarios, 'clientes': clientes,
+                'pets': len(donos), 'agendamentos': agendamentos}
+
+    def _dia_cadastro(self, inicio, indice, total):
+        """Dia de cadastro crescente com o id
+
+        Parte da base já existia um ano antes do período; o resto chega ao longo dele.
+        """
+        dias = (self.ate - inicio).days + 365
+        return inicio - timedelta(days=365) + timedelta(days=dias * indice // max(total, 1))
+
+    def _servicos(self, total, inicio):
+        """Catálogo: os serviços base de cada categoria e, acima disso, variações por porte"""
+        base = [(categoria, nome, preco, duracao) for categoria, (_, itens) in CATALOGO.items()
+                for nome, preco, duracao in itens]
+        catalogo = []
+        for i in range(total):
+            categoria, nome, preco, duracao = base[i % len(base)]
+            variacao = i // len(base)
+            if variacao:
+                nome = f'{nome} - {PORTES[(variacao - 1) % len(PORTES)]}'
+                preco = preco * (1 + 0.25 * variacao)
+            catalogo.append((i + 1, nome, f'{nome} ({categoria.lower()})', categoria, round(preco, 2), duracao,
+                             None, _datahora(inicio, 8 * 60), 1))
+        self.repository.inserir(Servico, ('id', 'nome', 'descricao', 'categoria', 'preco', 'duracao_estimada',
+                                          'observacoes', 'data_cadastro', 'ativo'), catalogo)
+        # (id, categoria, preço, duração) para os agendamentos
+        return [(linha[0], linha[3], linha[4], linha[5]) for linha in catalogo]
+
+    def _funcionarios(self, total, inicio):
+        """Funcionários com um cargo por categoria (veterinários e banhistas são a maioria)"""
+        rnd = self.rnd
+        cargos = _distribuir(['Banhista', 'Tosador', 'Veterinário', 'Atendente', 'Cuidador'], [4, 3, 3, 2, 1], total)
+        linhas = []
+        for i, cargo in enumerate(cargos):
+            nome, sobrenome = rnd.choice(NOMES), rnd.choice(SOBRENOMES)
+            minimo, maximo = CARGOS[cargo]
+            admissao = inicio - timedelta(days=rnd.randint(0, 5 * 365))
+            linhas.append((i + 1, f'{nome} {sobrenome}', _cpf(500_000_000 + i), _telefone(rnd, 3, 8),
+                           f'{_sem_acento(nome)}.{_sem_acento(sobrenome)}{i + 1}@petshop.com.br',
+                           f'{rnd.choice(RUAS)}, {rnd.randint(1, 3000)}', cargo,
+                           float(rnd.randrange(minimo, maximo, 50)), _data(admissao), None,
+                           _datahora(admissao, 8 * 60), 1))
+        self.repository.inserir(Funcionario, ('id', 'nome', 'cpf', 'telefone', 'email', 'endereco', 'cargo',
+                                              'salario', 'data_admissao', 'data_demissao', 'data_cadastro',
+                                              'ativo'), linhas)
+        # {cargo: [ids]} para atribuir cada serviço a quem o executa
+        equipe = {}
+        for linha in linhas:
+            equipe.setdefault(linha[6], []).append(linha[0])
+        return equipe
+
+    def _clientes(self, total, inicio):
+        rnd = self.rnd
+        colunas = ('id', 'nome', 'cpf', 'telefone', 'email', 'endereco', 'data_cadastro', 'ativo')
+        slugs = {nome: _sem_acento(nome) for nome in NOMES + SOBRENOMES}
+        linhas = []
+        for i in range(total):
+            nome, sobrenome = rnd.choice(NOMES), rnd.choice(SOBRENOMES)
+            email = (f'{slugs[nome]}.{slugs[sobrenome]}{i + 1}@{rnd.choice(DOMINIOS)}'
+                     if rnd.random() < 0.85 else None)
+            linhas.append((i + 1, f'{nome} {sobrenome}', _cpf(100_000_000 + i),
+                           _telefone(rnd, 9, 9), email,
+                           f'{rnd.choice(RUAS)}, {rnd.randint(1, 3000)}',
+                           _datahora(self._dia_cadastro(inicio, i, total), rnd.choice(HORARIOS)),
+                           1 if rnd.random() < 0.95 else 0))
+            if len(linhas) == LOTE:
+                self.repository.inserir(Cliente, colunas, linhas)
+                linhas = []
+        self.repository.inserir(Cliente, colunas, linhas)
+
+    def _pets(self, clientes, media, inicio):
+        """Pets de cada cliente (1 + Poisson(media - 1)), cadastrados com o dono
+
+        Retorna, por id - 1, o dono e o dia de cadastro (ordinal, crescente) de cada pet.
+        """
+        rnd = self.rnd
+        extras = max(media - 1, 0.0)
+        quantidades = [1 + k for k in range(8)] if media >= 1 else list(range(8))
+        lam = extras if media >= 1 else media
+        pesos_quantidade = _cumulativo([math.exp(-lam) * lam ** k / math.factorial(k) for k in range(8)])
+        especies = list(ESPECIES)
+        pesos_especies = _cumulativo([ESPECIES[especie][0] for especie in especies])
+        colunas = ('id', 'nome', 'especie', 'raca', 'cor', 'sexo', 'data_nascimento', 'peso', 'observacoes',
+                   'data_cadastro', 'ativo', 'cliente_id')
+        donos, cadastros, linhas = [], [], []
+        for cliente_id, quantidade in enumerate(
+                rnd.choices(quantidades, cum_weights=pesos_quantidade, k=clientes), 1):
+            cadastro = self._dia_cadastro(inicio, cliente_id - 1, clientes)
+            for especie in rnd.choices(especies, cum_weights=pesos_especies, k=quantidade):
+                _, racas, cores, peso_medio, desvio = ESPECIES[especie]
+                nascimento = cadastro - timedelta(days=rnd.randint(60, 12 * 365))
+                donos.append(cliente_id)
+                cadastros.append(cadastro.toordinal())
+                linhas.append((len(donos), rnd.choice(NOMES_PETS), especie, rnd.choice(racas), rnd.choice(cores),
+                               rnd.choice(('Macho', 'Fêmea')), _data(nascimento),
+                               round(max(rnd.gauss(peso_medio, desvio), peso_medio / 4), 2),
+                               rnd.choice(OBSERVACOES_PETS) if rnd.random() < 0.15 else None,
+                               _datahora(cadastro, rnd.choice(HORARIOS)), 1 if rnd.random() < 0.97 else 0,
+                               cliente_id))
+            if len(linhas) >= LOTE:
+                self.repository.inserir(Pet, colunas, linhas)
+                linhas = []
+        self.repository.inserir(Pet, colunas, linhas)
+        return donos, cadastros
+
+    def _agendamentos(self, total, inicio, catalogo, equipe, donos, cadastros):
+        """Agendamentos do início do período até 30 dias à frente, em ordem de data (ids crescentes)
+
+        Cada dia só sorteia pets já cadastrados naquela data. Retorna a quantidade gerada.
+        """
+        rnd = self.rnd
+        if not donos:
+            return 0
+        hoje, fim = self.ate, self.ate + timedelta(days=30)
+        dias = [inicio + timedelta(days=n) for n in range((fim - inicio).days + 1)]
+        periodo = max((hoje - inicio).days, 1)
+
+        # Procura por dia: dia da semana, crescimento de 60% a 100% no período,
+        # dezembro mais cheio e menos marcações quanto mais distante no futuro
+        def procura(dia):
+            peso = PROCURA_DIAS[dia.weekday()] * (0.6 + 0.4 * min((dia - inicio).days / periodo, 1.0))
+            if dia.month == 12:
+                peso *= 1.3
+            if dia > hoje:
+                peso *= 0.8 * (1 - (dia - hoje).days / 35)
+            return peso
+        por_dia = [0] * len(dias)
+        for indice in rnd.choices(range(len(dias)), cum_weights=_cumulativo(map(procura, dias)), k=total):
+            por_dia[indice] += 1
+
+        # Tabelas pré-calculadas: o laço por linha só indexa e monta texto.
+        # datas[ANTECEDENCIA_MAXIMA + n] é o texto do dia inicio + n (do mais
+        # antigo possível para data_criacao até o dia seguinte ao último)
+        datas = [(inicio + timedelta(days=n)).isoformat()
+                 for n in range(-ANTECEDENCIA_MAXIMA, len(dias) + 1)]
+        horas = [f'{minutos // 60:02d}:{minutos % 60:02d}:00.000000' for minutos in range(24 * 60)]
+        hoje_indice = ANTECEDENCIA_MAXIMA + (hoje - inicio).days
+        # Serviço sorteado: (id, preço, duração, {horário: (dias a somar, hora de data_fim)}, executores)
+        servicos = []
+        for servico_id, categoria, preco, duracao in catalogo:
+            fins = {minutos: divmod(minutos + duracao, 24 * 60) for minutos in HORARIOS}
+            servicos.append((servico_id, preco, duracao,
+                             {minutos: (dias_a_somar, horas[final]) for minutos, (dias_a_somar, final) in fins.items()},
+                             equipe.get(CATALOGO[categoria][0]) or [None]))
+        # Cauda longa: poucos serviços e pets (clientes frequentes) concentram a procura
+        pesos_servicos = _cumulativo(1 / (posicao + 1) ** 0.8 for posicao in range(len(catalogo)))
+        pesos_pets = _cumulativo(rnd.paretovariate(1.2) for _ in donos)
+        pesos_horarios = _cumulativo(PROCURA_HORARIOS)
+        pesos_antecedencia = _cumulativo(math.exp(-dias / 5) for dias in range(ANTECEDENCIA_MAXIMA + 1))
+        observacoes = OBSERVACOES_AGENDAMENTOS + [None]
+        pesos_observacoes = _cumulativo([0.08 / len(OBSERVACOES_AGENDAMENTOS)] * len(OBSERVACOES_AGENDAMENTOS)
+                                        + [0.92])
+        sorteio = rnd.random
+
+        colunas = ('id', 'data_agendamento', 'data_criacao', 'status', 'observacoes', 'valor_estimado',
+                   'tempo_estimado', 'data_fim', 'cliente_id', 'pet_id', 'servico_id', 'funcionario_id')
+        linhas, proximo_id = [], 1
+        for numero, (dia, quantidade) in enumerate(zip(dias, por_dia)):
+            if not quantidade:
+                continue
+            indice = ANTECEDENCIA_MAXIMA + numero
+            estados = (rnd.choices(('Concluído', 'Cancelado', 'Agendado'), cum_weights=(85, 97, 100), k=quantidade)
+                       if dia < hoje else
+                       rnd.choices(('Agendado', 'Confirmado', 'Cancelado'), cum_weights=(70, 97, 100), k=quantidade))
+            horarios = sorted(rnd.choices(HORARIOS, cum_weights=pesos_horarios, k=quantidade))
+            servicos_dia = rnd.choices(servicos, cum_weights=pesos_servicos, k=quantidade)
+            # Marcado com antecedência, mas nunca depois de hoje
+            criacoes = [datas[min(indice - dias, hoje_indice)] for dias in
+                        rnd.choices(range(ANTECEDENCIA_MAXIMA + 1), cum_weights=pesos_antecedencia, k=quantidade)]
+            observacoes_dia = rnd.choices(observacoes, cum_weights=pesos_observacoes, k=quantidade)
+            # Como rnd.choices, mas restrito ao prefixo dos pets cadastrados até o dia
+            disponiveis = max(bisect_right(cadastros, dia.toordinal()), 1)
+            limite = pesos_pets[disponiveis - 1]
+            pets_dia = [bisect(pesos_pets, sorteio() * limite, 0, disponiveis - 1) for _ in range(quantidade)]
+            data = datas[indice]
+            for status, minutos, servico, pet, criacao, observacao in zip(estados, horarios, servicos_dia, pets_dia,
+                                                                          criacoes, observacoes_dia):
+                servico_id, preco, duracao, fins, executores = servico
+                dias_a_somar, hora_fim = fins[minutos]
+                linhas.append((proximo_id, f'{data} {horas[minutos]}', f'{criacao} {horas[minutos - 60]}', status,
+                               observacao, preco, duracao, f'{datas[indice + dias_a_somar]} {hora_fim}',
+                               donos[pet], pet + 1, servico_id, executores[int(sorteio() * len(executores))]))
+                proximo_id += 1
+            if len(linhas) >= LOTE:
+                self.repository.inserir(Agendamento, colunas, linhas)
+                linhas = []
+        self.repository.inserir(Agendamento, colunas, linhas)
+        return proximo_id - 1
+
+def _distribuir(valores, pesos, total):
+    """total itens repartidos entre valores na proporção dos pesos, cada um com ao menos 1 (se couber)"""
+    soma = sum(pesos)
+    quantidades = [max(1, round(total * peso / soma)) for peso in pesos]
+    while sum(quantidades) > total and max(quantidades) > 1:
+        quantidades[quantidades.index(max(quantidades))] -= 1
+    while sum(quantidades) < total:
+        quantidades[0] += 1
+    return [valor for valor, quantidade in zip(valores, quantidades) for _ in range(quantidade)][:total]
@@ -1,16 +1,34 @@
 from src.model.repositories.servico_repository import ServicoRepository
+from src.model.repositories.unit_of_work import read_only
+from src.model.repositories.batch_loader import load_in_order
 from src.model.models import Servico
 
 class ServicoService:
     def __init__(self):
         self.servico_repository = ServicoRepository()
 
+    @read_only
     def get_all_servicos(self):
         return self.servico_repository.get_all()
 
+    @read_only
+    def search(self, search=None, categoria=None, status=None, page=1, per_page=10):
+        """Busca paginada de serviços com filtros aplicados no banco"""
+        return self.servico_repository.search(search=search, categoria=categoria, status=status,
+                                              page=page, per_page=per_page)
+
+    @read_only
+    def get_servicos_by_ids(self, ids):
+        """(serviços na ordem de ids, ids não encontrados), em consultas IN"""
+        return load_in_order(Servico, ids)
+
     def get_servico_by_id(self, servico_id):
         return self.servico_repository.get_by_id(servico_id)
 
+    def get_servico_detalhe(self, servico_id):
+        """Serviço com os agendamentos já carregados, para a página de visualização"""
+        return self.servico_repository.get_with_agendamentos(servico_id)
+
     def get_servico_by_nome(self, nome):
         return self.servico_repository.get_by_nome(nome)
 
@@ -101,23 +119,19 @@ class ServicoService:
             'Outros'
         ]
 
+    @read_only
     def get_servicos_estatisticas(self):
-        """Retorna estatísticas dos serviços"""
-        total_servicos = len(self.get_all_servicos())
-        servicos_ativos = len(self.get_active_servicos())
-        servicos_inativos = total_servicos - servicos_ativos
-        
-        # Agrupar por categoria
-        servicos = self.get_all_servicos()
+        """Retorna estatísticas dos serviços (uma única consulta agregada)"""
         categorias = {}
-        for servico in servicos:
-            if servico.categoria not in categorias:
-                categorias[servico.categoria] = 0
-            categorias[servico.categoria] += 1
+        total_servicos = servicos_ativos = 0
+        for row in self.servico_repository.count_by_categoria():
+            categorias[row.categoria] = row.total
+            total_servicos += row.total
+            servicos_ativos += row.ativos
 
         return {
             'total': total_servicos,
             'ativos': servicos_ativos,
-            'inativos': servicos_inativos,
+            'inativos': total_servicos - servicos_ativos,
             'por_categoria': categorias
         }
\ No newline at end of file
@@ -5,14 +5,28 @@ Script para testar o sistema ERP Pet Shop
 
 import sys
 import os
+import shutil
+import subprocess
+import tempfile
 from datetime import datetime, date
 
 # Adicionar o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Os testes gravam no banco: rodam sobre uma cópia de src/model/database/app.db
+# para não alterar o arquivo versionado
+_COPIA_BANCO = os.path.join(tempfile.mkdtemp(prefix='petshop_testes_'), 'app.db')
+shutil.copyfile(os.path.join(os.path.dirname(__file__), 'src', 'model', 'database', 'app.db'), _COPIA_BANCO)
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{_COPIA_BANCO}')
+
 from src.main import app
+from src.model.migrations import aplicar_migracoes, init_migrate
 from src.model.models import db, Cliente, Pet, Funcionario, Servico, Agendamento
 
+# Esquema completo (triggers, índice de busca...) vem das migrações, como em produção
+with app.app_context():
+    aplicar_migracoes()
+
 def test_models():
     """Testar os modelos do sistema"""
     
@@ -87,8 +101,735 @@ def test_api_routes():
         
         print("🎉 Todas as rotas estão funcionando!")
 
+def test_busca_paginada():
+    """Testar a busca paginada feita no banco"""
+    from src.model.services.cliente_service import ClienteService
+
+    with app.app_context():
+        print("\n📄 Testando busca paginada...")
+
+        pagination = ClienteService().search(page=1, per_page=2)
+        assert len(pagination.items) <= 2
+        assert pagination.total == Cliente.query.count()
+        print(f"✅ Página 1 de {pagination.pages} com {len(pagination.items)} clientes")
+
+        pagination = ClienteService().search(search="%", page=1, per_page=10)
+        assert pagination.total == 0
+        print("✅ Curingas do LIKE são tratados literalmente")
+
+def test_paginacao_cursor():
+    """Testar a paginação por cursor da API"""
+
+    with app.test_client() as client:
+        print("\n🔗 Testando paginação por cursor...")
+
+        with client.session_transaction() as sess:
+            sess['logged_in'] = True
+
+        ids = []
+        url = '/api/clientes?limit=1'
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            ids.extend(cliente['id'] for cliente in response.json)
+            link = response.headers.get('Link')
+            url = link[link.index('<') + 1:link.index('>')] if link else None
+
+        assert ids == sorted(set(ids))
+        print(f"✅ {len(ids)} clientes percorridos página a página")
+
+        response = client.get('/api/agendamentos?cursor=invalido')
+        assert response.status_code == 400
+        print("✅ Cursor inválido retorna 400")
+
+        for limit in (0, -1):
+            assert client.get(f'/api/busca?q=rex&limit={limit}').status_code == 400
+        print("✅ limit menor que 1 na busca retorna 400")
+
+def test_autocomplete_prefixo():
+    """Testar o índice de prefixos usado no autocomplete"""
+    from src.model.repositories.autocomplete_repository import PrefixIndex, tokenizar
+
+    print("\n🔤 Testando índice de autocomplete...")
+
+    indice = PrefixIndex()
+    indice.put(1, {'nome': 'João Silva'}, tokenizar('João Silva', '111.222.333-44'), 'joao silva\n111.222.333-44')
+    indice.put(2, {'nome': 'Joana Souza'}, tokenizar('Joana Souza'), 'joana souza')
+    indice.sort()
+
+    assert [d['nome'] for d in indice.search('jo')] == ['Joana Souza', 'João Silva']
+    assert [d['nome'] for d in indice.search('joao si')] == ['João Silva']
+    assert [d['nome'] for d in indice.search('222')] == ['João Silva']
+    print("✅ Busca por prefixo sem acentos")
+
+    assert [d['nome'] for d in indice.search('ouza')] == ['Joana Souza']
+    assert [d['nome'] for d in indice.search('22.33')] == ['João Silva']
+    indice.put(3, {'nome': 'Ana Assis'}, tokenizar('Ana Assis'), 'ana assis')
+    assert [d['nome'] for d in indice.search('si')] == ['João Silva', 'Ana Assis'], "prefixos vêm primeiro"
+    indice.remove(3)
+    print("✅ Trecho do meio do nome ou do CPF quando os prefixos não bastam")
+
+    indice.remove(1)
+    assert [d['nome'] for d in indice.search('jo')] == ['Joana Souza']
+    print("✅ Remoção incremental")
+
+    # Commits de outra thread (apply) durante as buscas
+    import threading
+    from src.model.repositories.autocomplete_repository import AutocompleteRepository
+    repositorio = AutocompleteRepository()
+    with app.app_context():
+        repositorio.search_clientes('zz')  # garante o índice construído
+    cliente = {'id': 10 ** 9, 'nome': 'Zózimo Concorrente', 'cpf': '999.999.999-99', 'telefone': '',
+               'email': None, 'ativo': True}
+    parar, erros = threading.Event(), []
+
+    def alterar():
+        while not parar.is_set():
+            repositorio.apply([('cliente', 'put', cliente)])
+            repositorio.apply([('cliente', 'delete', {'id': cliente['id']})])
+    escritor = threading.Thread(target=alterar)
+    escritor.start()
+    try:
+        for _ in range(3000):
+            try:
+                repositorio.search_clientes('zozimo conc')
+            except Exception as e:  # noqa: BLE001 - qualquer erro é uma leitura do índice pela metade
+                erros.append(e)
+                break
+    finally:
+        parar.set()
+        escritor.join()
+    assert not erros, erros
+    print("✅ Buscas consistentes durante commits concorrentes")
+
+def test_conflito_horario():
+    """Testar a detecção de sobreposição de horários do funcionário"""
+    from datetime import timedelta
+    from src.model.services.agendamento_service import AgendamentoService
+
+    with app.app_context():
+        print("\n⏰ Testando conflito de horários...")
+
+        # Dados próprios, descartados no rollback do fim (verificar_conflito só lê)
+        cliente = Cliente(nome='Cliente Conflito', cpf='000.111.222-33', telefone='(11) 90000-0000')
+        funcionario = Funcionario(nome='Funcionário Conflito', cpf='000.111.222-44', telefone='(11) 90000-0000',
+                                  cargo='Tosador', data_admissao=date(2024, 1, 1))
+        servico = Servico(nome='Tosa Conflito', categoria='Tosa', preco=50.0, duracao_estimada=90)
+        db.session.add_all([cliente, funcionario, servico])
+        db.session.flush()
+        pet = Pet(nome='Pet Conflito', especie='Cão', sexo='Macho', cliente_id=cliente.id)
+        db.session.add(pet)
+        db.session.flush()
+        inicio = datetime.now().replace(microsecond=0) + timedelta(days=400)
+        # Sem tempo_estimado: o término vem da duração do serviço, como no backfill em SQL
+        agendamento = Agendamento(data_agendamento=inicio, status='Agendado', cliente_id=cliente.id,
+                                  pet_id=pet.id, servico_id=servico.id, funcionario_id=funcionario.id)
+        db.session.add(agendamento)
+        db.session.flush()
+        try:
+            fim = agendamento.data_fim
+            assert fim == inicio + timedelta(minutes=90), fim
+            agendamento.status = 'Confirmado'
+            db.session.flush()
+            assert agendamento.data_fim == fim, "Salvar de novo não deve mudar o término"
+            print("✅ Término pela duração do serviço, estável entre gravações")
+
+            service = AgendamentoService()
+            try:
+                service.verificar_conflito(funcionario.id, inicio + (fim - inicio) / 2, 30)
+                assert False, "Sobreposição não detectada"
+            except ValueError:
+                print("✅ Sobreposição parcial detectada")
+
+            service.verificar_conflito(funcionario.id, fim, 30)
+            service.verificar_conflito(funcionario.id, inicio, 30, ignorar_id=agendamento.id)
+            print("✅ Horário seguinte e o próprio agendamento não conflitam")
+        finally:
+            db.session.rollback()
+            db.session.remove()
+
+def test_disponibilidade_mapa():
+    """Testar o mapa de slots usado na busca de horários livres"""
+    from src.model.repositories.disponibilidade_repository import SLOTS_POR_DIA, marcar_intervalo, slot_do_horario
+    from src.model.services.disponibilidade_service import inicios_livres
+
+    print("\n🗓️ Testando mapa de disponibilidade...")
+
+    dia = datetime(2030, 1, 7, 0, 0)
+    mapas = {}
+    marcar_intervalo(mapas, 1, dia.replace(hour=9, minute=10), dia.replace(hour=10, minute=40))
+    oito, meio_dia = slot_do_horario(dia.replace(hour=8)), slot_do_horario(dia.replace(hour=12))
+
+    livres = inicios_livres(mapas[(1, dia.date())], 4, oito, meio_dia)  # serviço de 1 hora
+    assert livres[0] == oito and slot_do_horario(dia.replace(hour=9)) not in livres
+    assert slot_do_horario(dia.replace(hour=10, minute=45)) in livres
+    assert livres[-1] == meio_dia - 4
+    print("✅ Horários ocupados e limites da grade respeitados")
+
+    marcar_intervalo(mapas, 2, dia.replace(hour=23), dia.replace(day=8, hour=1))
+    assert (2, dia.date()) in mapas and (2, dia.replace(day=8).date()) in mapas
+    print("✅ Agendamento que atravessa a meia-noite ocupa os dois dias")
+
+    # Só agendamentos ativos ocupam a grade, como em verificar_conflito
+    from src.model.repositories.disponibilidade_repository import DisponibilidadeRepository
+    with app.app_context():
+        cliente = Cliente(nome='Cliente Grade', cpf='000.111.222-55', telefone='(11) 90000-0000')
+        funcionario = Funcionario(nome='Funcionário Grade', cpf='000.111.222-66', telefone='(11) 90000-0000',
+                                  cargo='Tosador', data_admissao=date(2024, 1, 1))
+        servico = Servico(nome='Tosa Grade', categoria='Tosa', preco=50.0, duracao_estimada=60)
+        db.session.add_all([cliente, funcionario, servico])
+        db.session.flush()
+        pet = Pet(nome='Pet Grade', especie='Cão', sexo='Macho', cliente_id=cliente.id)
+        db.session.add(pet)
+        db.session.flush()
+        for hora, status in ((9, 'Concluído'), (11, 'Cancelado'), (14, 'Confirmado')):
+            db.session.add(Agendamento(data_agendamento=dia.replace(hour=hora), status=status, cliente_id=cliente.id,
+                                       pet_id=pet.id, servico_id=servico.id, funcionario_id=funcionario.id))
+        db.session.flush()
+        try:
+            mapa = DisponibilidadeRepository()._carregar([funcionario.id], dia.date(), dia.date())[
+                (funcionario.id, dia.date())]
+            ocupados = {slot // 4 for slot in range(SLOTS_POR_DIA) if mapa >> slot & 1}
+            assert ocupados == {14}, ocupados
+        finally:
+            db.session.rollback()
+            db.session.remove()
+    print("✅ Concluídos e cancelados não ocupam horário")
+
+def test_recorrencia():
+    """Testar a geração de datas de uma série recorrente"""
+    from datetime import datetime
+    from src.model.services.agendamento_service import gerar_recorrencia
+
+    print("\n🔁 Testando recorrência...")
+    inicio = datetime(2026, 1, 31, 10, 0)
+    mensal = gerar_recorrencia(inicio, 'mensal', ocorrencias=3)
+    assert [d.date().isoformat() for d in mensal] == ['2026-01-31', '2026-02-28', '2026-03-31']
+    semanal = gerar_recorrencia(inicio, 'semanal', intervalo=2, ate='2026-03-01')
+    assert len(semanal) == 3 and semanal[-1] == datetime(2026, 2, 28, 10, 0)
+    try:
+        gerar_recorrencia(inicio, 'diaria', ocorrencias=500)
+        assert False, "Limite de ocorrências não aplicado"
+    except ValueError:
+        pass
+    print("✅ Datas da série corretas")
+
+def test_leitura_importacao():
+    """Testar a leitura em fluxo dos arquivos de importação"""
+    import io
+    import json
+    from src.model.services import importacao_service
+    from src.model.services.importacao_service import ler_registros, formatar_cpf
+
+    print("\n📥 Testando leitura de importação...")
+    registros = [{'nome': f'Cliente {i}', 'cpf': f'{i:011d}'} for i in range(50)]
+    leitura_padrao = importacao_service.TAMANHO_LEITURA
+    importacao_service.TAMANHO_LEITURA = 7  # objetos divididos entre leituras
+    try:
+        lista = list(ler_registros(io.BytesIO(json.dumps(registros).encode()), 'json'))
+        ndjson = '\n'.join(json.dumps(r) for r in registros).encode()
+        linhas = list(ler_registros(io.BytesIO(ndjson), 'ndjson'))
+    finally:
+        importacao_service.TAMANHO_LEITURA = leitura_padrao
+    assert [r for _, r in lista] == registros and [r for _, r in linhas] == registros
+    assert lista[-1][0] == 50
+
+    csv_bytes = '\ufeffnome,cpf\nAna,12345678901\n'.encode()
+    assert list(ler_registros(io.BytesIO(csv_bytes), 'csv')) == [(1, {'nome': 'Ana', 'cpf': '12345678901'})]
+    assert formatar_cpf('12345678901') == '123.456.789-01'
+    print("✅ CSV, JSON e NDJSON lidos em fluxo")
+
+    # Cadastro e importação gravam o mesmo formato: só dígitos também é duplicado
+    from src.model.services.cliente_service import ClienteService
+    with app.app_context():
+        existente = Cliente(nome='Cliente Importado', cpf=formatar_cpf('00011122277'), telefone='(11) 90000-0000')
+        db.session.add(existente)
+        db.session.flush()
+        try:
+            assert ClienteService().get_cliente_by_cpf('00011122277').id == existente.id
+            try:
+                ClienteService().create_cliente('Duplicado', '00011122277', '(11) 90000-0000', None, None)
+                assert False, "CPF só com dígitos não detectado como duplicado"
+            except ValueError:
+                pass
+        finally:
+            db.session.rollback()
+            db.session.remove()
+    print("✅ CPF normalizado no cadastro, como na importação")
+
+    # Migração 0005: CPFs antigos só com dígitos passam ao formato novo; colisões abortam
+    import importlib.util
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import create_engine, text
+    caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations', 'versions', '0005_normalizar_cpf.py')
+    especificacao = importlib.util.spec_from_file_location('migracao_0005', caminho)
+    migracao = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(migracao)
+
+    def migrar(cpfs):
+        engine = create_engine('sqlite://')
+        with engine.begin() as conexao:
+            conexao.execute(text('CREATE TABLE clientes (id INTEGER PRIMARY KEY, cpf VARCHAR(14) UNIQUE)'))
+            conexao.execute(text('INSERT INTO clientes (cpf) VALUES (:cpf)'), [{'cpf': cpf} for cpf in cpfs])
+            with Operations.context(MigrationContext.configure(conexao)):
+                migracao.upgrade()
+            return conexao.execute(text('SELECT cpf FROM clientes ORDER BY id')).scalars().all()
+
+    assert migrar(['12345678901', '111.222.333-44', '1234']) == ['123.456.789-01', '111.222.333-44', '1234']
+    try:
+        migrar(['12345678901', '123.456.789-01'])
+        assert False, "Colisão de CPF não detectada na migração"
+    except RuntimeError as e:
+        assert 'clientes 1, 2' in str(e)
+    print("✅ Migração normaliza CPFs antigos e falha em colisões")
+
+def test_exportacao_stream():
+    """Testar a exportação em fluxo de agendamentos e pets"""
+    import json
+
+    with app.test_client() as client:
+        print("\n📤 Testando exportação...")
+        with client.session_transaction() as sessao:
+            sessao['logged_in'] = True
+
+        response = client.get('/api/export/agendamentos?formato=csv')
+        assert response.status_code == 200 and response.is_streamed
+        linhas = response.get_data(as_text=True).splitlines()
+        assert linhas[0].startswith('id,data_agendamento') and 'cliente,pet_id,pet' in linhas[0]
+        with app.app_context():
+            assert len(linhas) - 1 == Agendamento.query.count()
+
+        response = client.get('/api/export/pets?formato=ndjson')
+        pets = [json.loads(linha) for linha in response.get_data(as_text=True).splitlines()]
+        with app.app_context():
+            assert len(pets) == Pet.query.count()
+        assert all(pet['cliente'] and pet['cliente_cpf'] for pet in pets)
+
+        assert client.get('/api/export/clientes?formato=xml').status_code == 400
+        print("✅ CSV e NDJSON completos, com os nomes resolvidos")
+
+def test_unit_of_work():
+    """Testar o agrupamento de escritas em uma transação"""
+    from src.model.repositories.unit_of_work import unit_of_work
+    from src.model.services.cliente_service import ClienteService
+
+    with app.app_context():
+        print("\n🧾 Testando unit_of_work...")
+        service = ClienteService()
+        total = Cliente.query.count()
+        try:
+            with unit_of_work():
+                cliente = service.create_cliente('Cliente Transação', '000.000.000-91', '(11) 90000-0000', None, None)
+                assert cliente.id, "id disponível após o flush"
+                with unit_of_work():
+                    service.create_cliente('Cliente Transação 2', '000.000.000-92', '(11) 90000-0000', None, None)
+                raise RuntimeError('falha no meio da operação')
+        except RuntimeError:
+            pass
+        assert Cliente.query.count() == total, "Escritas do bloco deveriam ter sido desfeitas"
+        print("✅ Rollback de todas as escritas do bloco")
+
+def test_reativacao_cliente():
+    """Testar que reativar o cliente devolve apenas os pets desativados junto com ele"""
+    from src.model.services.cliente_service import ClienteService
+
+    with app.app_context():
+        print("\n🔁 Testando reativação de cliente...")
+        service = ClienteService()
+        cliente = service.create_cliente('Cliente Reativado', '000.000.000-93', '(11) 90000-0000', None, None)
+        ativo = Pet(nome='Ativo', especie='Cão', sexo='Macho', cliente_id=cliente.id)
+        ja_inativo = Pet(nome='Já Inativo', especie='Gato', sexo='Fêmea', cliente_id=cliente.id, ativo=False)
+        db.session.add_all([ativo, ja_inativo])
+        db.session.commit()
+        try:
+            service.deactivate_cliente(cliente.id)
+            assert not ativo.ativo and not ja_inativo.ativo
+            service.activate_cliente(cliente.id)
+            assert ativo.ativo and not ja_inativo.ativo
+            print("✅ activate_cliente reativa só os pets da cascata")
+
+            service.deactivate_cliente(cliente.id)
+            service.update_cliente(cliente.id, cliente.nome, cliente.cpf, cliente.telefone, None, None, True)
+            assert ativo.ativo and not ja_inativo.ativo
+            print("✅ Reativação pela edição tem o mesmo efeito")
+        finally:
+            db.session.delete(ativo)
+            db.session.delete(ja_inativo)
+            db.session.delete(cliente)
+            db.session.commit()
+
+def test_replica_leitura():
+    """Testar o roteamento de leituras para a réplica (dois arquivos SQLite)"""
+    import tempfile
+    from flask import Flask
+    from src.model.engine import init_engine, init_replica
+    from src.model.services.cliente_service import ClienteService
+
+    print("\n🪞 Testando réplica de leitura...")
+    with tempfile.TemporaryDirectory() as pasta:
+        app_replica = Flask(__name__)
+        app_replica.config.update(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(pasta, 'principal.db')}",
+            SQLALCHEMY_BINDS={'replica': f"sqlite:///{os.path.join(pasta, 'replica.db')}"},
+            SQLITE_PRAGMAS={'journal_mode': 'WAL'},
+            REPLICA_INTERVALO=0,
+        )
+        db.init_app(app_replica)
+        init_engine(app_replica, db)
+        init_migrate(app_replica, db)
+        service = ClienteService()
+        with app_replica.app_context():
+            db.create_all()
+            aplicar_migracoes()
+            service.create_cliente('Cliente Copiado', '000.000.000-01', '(11) 90000-0000', None, None)
+        replica = init_replica(app_replica, db)
+
+        with app_replica.app_context():
+            service.create_cliente('Cliente Novo', '000.000.000-02', '(11) 90000-0000', None, None)
+        with app_replica.app_context():
+            assert len(service.get_all_clientes()) == 1, "Listagem deveria vir da réplica"
+            assert Cliente.query.count() == 2, "Fora de @read_only a leitura vai para o principal"
+            service.create_cliente('Cliente Lido', '000.000.000-03', '(11) 90000-0000', None, None)
+            assert len(service.get_all_clientes()) == 3, "Depois de uma escrita a sessão lê do principal"
+        print("✅ Listagens na réplica, read-after-write no principal")
+
+        assert replica.atualizar() and not replica.atualizar(), "Só copia quando o principal mudou"
+        with app_replica.app_context():
+            assert len(service.get_all_clientes()) == 3
+        print("✅ Réplica atualizada pela API de backup")
+        with app_replica.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+
+def test_etag_condicional():
+    """Testar ETag fraca e 304 Not Modified com versões por tabela"""
+    print("\n🏷️ Testando GET condicional...")
+    with app.test_client() as c:
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        resposta = c.get('/api/servicos')
+        etag = resposta.headers['ETag']
+        assert etag.startswith('W/') and 'max-age' in resposta.headers['Cache-Control']
+        assert c.get('/api/servicos', headers={'If-None-Match': etag}).status_code == 304
+        assert c.get('/api/servicos?limit=1', headers={'If-None-Match': etag}).status_code == 200
+        print("✅ 304 enquanto a tabela não muda")
+
+        with app.app_context():
+            servico = Servico.query.first()
+            servico_id, observacoes = servico.id, servico.observacoes
+            servico.observacoes = 'Alterado no teste'
+            db.session.commit()
+        try:
+            assert c.get('/api/servicos', headers={'If-None-Match': etag}).status_code == 200
+            print("✅ Commit na tabela invalida a ETag")
+
+            # Escrita de outro processo: a versão está no banco, não na memória deste
+            etag = c.get('/api/servicos').headers['ETag']
+            subprocess.run([sys.executable, '-c', (
+                "from src.main import app\n"
+                "from src.model.models import db, Servico\n"
+                "with app.app_context():\n"
+                f"    db.session.get(Servico, {servico_id}).observacoes = 'Outro processo'\n"
+                "    db.session.commit()\n"
+            )], cwd=os.path.dirname(os.path.abspath(__file__)), check=True, capture_output=True)
+            assert c.get('/api/servicos', headers={'If-None-Match': etag}).status_code == 200
+            print("✅ Commit de outro processo também invalida a ETag")
+        finally:
+            with app.app_context():
+                db.session.get(Servico, servico_id).observacoes = observacoes
+                db.session.commit()
+
+def test_assets_compressao():
+    """Testar estáticos com hash (cache imutável) e compressão gzip"""
+    import gzip
+    from flask import url_for
+
+    print("\n🗜️ Testando assets e compressão...")
+    with app.test_request_context():
+        url = url_for('static', filename='css/style.css')
+    assert url != '/static/css/style.css', "url_for deveria gerar o nome com hash"
+    with app.test_client() as c:
+        resposta = c.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert resposta.headers['Content-Encoding'] == 'gzip'
+        assert 'immutable' in resposta.headers['Cache-Control']
+        with open(os.path.join(app.static_folder, 'css', 'style.css'), 'rb') as arquivo:
+            assert gzip.decompress(resposta.data) == arquivo.read()
+        print(f"✅ {url} pré-comprimido com cache imutável")
+
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        resposta = c.get('/dashboard', headers={'Accept-Encoding': 'gzip'})
+        assert resposta.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in resposta.headers['Vary']
+        assert 'Content-Encoding' not in c.get('/dashboard').headers
+        print("✅ Respostas de texto comprimidas conforme Accept-Encoding")
+
+def test_serializer_json():
+    """Testar serializers por modelo e o provider JSON (orjson e fallback)"""
+    import json
+    from src.controller import json_provider
+    from src.model.serializers import serialize
+
+    print("\n🧬 Testando serialização JSON...")
+    with app.app_context():
+        for model in (Cliente, Pet, Funcionario, Servico, Agendamento):
+            obj = model.query.first()
+            if obj is None:
+                continue
+            esperado = json.loads(json.dumps(obj.to_dict()))
+            assert app.json.loads(app.json.dumps(serialize(obj))) == esperado, model.__name__
+            orjson, json_provider.orjson = json_provider.orjson, None
+            try:
+                assert json.loads(app.json.dumps(serialize(obj))) == esperado, model.__name__
+            finally:
+                json_provider.orjson = orjson
+        print("✅ Mesmo JSON que to_dict(), com e sem orjson")
+
+def test_listagem_dto():
+    """Testar as páginas da API em DTOs (select Core) com o mesmo JSON de to_dict()"""
+    from src.model.dto import AgendamentoDTO, PetDTO
+    from src.model.repositories.agendamento_repository import AgendamentoRepository
+    from src.model.repositories.pet_repository import PetRepository
+
+    print("\n📄 Testando listagens em DTOs...")
+    with app.test_client() as c:
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        with app.app_context():
+            for repository, dto, model in ((AgendamentoRepository(), AgendamentoDTO, Agendamento),
+                                           (PetRepository(), PetDTO, Pet)):
+                itens, _ = repository.get_page(limit=5)
+                assert all(type(item) is dto for item in itens)
+                esperado = [db.session.get(model, item.id).to_dict() for item in itens]
+                url = '/api/agendamentos?limit=5' if model is Agendamento else '/api/pets?limit=5'
+                assert c.get(url).get_json() == esperado, model.__name__
+        print("✅ Páginas de agendamentos e pets sem objetos do ORM")
+
+def test_fields_include():
+    """Testar ?fields= (colunas no SELECT) e ?include= (uma consulta por relação) na API"""
+    from sqlalchemy import event
+
+    print("\n🧩 Testando fields e include...")
+    with app.test_client() as c:
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        with app.app_context():
+            consultas = []
+            contar = lambda conn, cursor, sql, *args: consultas.append(sql)
+            event.listen(db.engine, 'before_cursor_execute', contar)
+            try:
+                resposta = c.get('/api/agendamentos?limit=5&fields=status&include=cliente,pet&fields[cliente]=nome')
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', contar)
+            assert resposta.status_code == 200
+            selects = [sql for sql in consultas if sql.lstrip().upper().startswith('SELECT')]
+            assert len(selects) == 3, selects
+            assert 'observacoes' not in selects[0]
+            for item in resposta.get_json():
+                agendamento = db.session.get(Agendamento, item['id'])
+                assert set(item) == {'id', 'status', 'cliente', 'pet'}
+                assert item['cliente'] == {'id': agendamento.cliente_id, 'nome': agendamento.cliente.nome}
+                assert item['pet'] == agendamento.pet.to_dict()
+
+            assert c.get('/api/agendamentos?include=cliente,foo').status_code == 400
+            assert c.get('/api/pets?fields=nome,salario').status_code == 400
+            assert c.get('/api/pets?fields[cliente]=nome').status_code == 400
+        print("✅ Campos selecionados e relações embutidas em lote")
+
+def test_multi_get_ids():
+    """Testar ?ids= nas listagens: ordem dos ids, ids não encontrados e pets agrupados por cliente"""
+    from src.model.repositories import batch_loader
+
+    print("\n🔢 Testando busca por lista de ids...")
+    with app.test_client() as c:
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        with app.app_context():
+            ids = [pet.id for pet in Pet.query.order_by(Pet.id.desc()).limit(3)]
+            lote = batch_loader.LOTE_IDS
+            batch_loader.LOTE_IDS = 2
+            try:
+                dados = c.get(f"/api/pets?ids={','.join(map(str, ids + [999999, ids[0]]))}").get_json()
+            finally:
+                batch_loader.LOTE_IDS = lote
+            assert dados['itens'] == [db.session.get(Pet, pet_id).to_dict() for pet_id in ids]
+            assert dados['nao_encontrados'] == [999999]
+
+            cliente = Cliente.query.first()
+            dados = c.get(f'/api/clientes/pets?ids=999999,{cliente.id}').get_json()
+            ativos = [pet.to_dict() for pet in cliente.pets if pet.ativo]
+            assert dados['itens'] == [{'cliente_id': cliente.id, 'pets': sorted(ativos, key=lambda p: p['id'])}]
+            assert dados['nao_encontrados'] == [999999]
+
+            assert c.get('/api/servicos?ids=1,x').status_code == 400
+            assert c.get('/api/clientes/pets').status_code == 400
+        print("✅ Itens na ordem pedida, em lotes IN, com os ids ausentes informados")
+
+def test_metricas():
+    """Testar /metrics (formato Prometheus), contagem de SQL por endpoint e Server-Timing"""
+    import re
+    from flask import Flask
+    from src.controller.metrics import init_metrics
+
+    print("\n📈 Testando métricas...")
+    with app.test_client() as c:
+        assert not app.config.get('METRICS_TOKEN')
+        assert c.get('/metrics').status_code == 302  # sem token, /metrics exige login
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        c.get('/api/agendamentos?limit=5&include=cliente,pet')
+        texto = c.get('/metrics').get_data(as_text=True)
+        rotulos = '{endpoint="agendamento.get_agendamentos",method="GET"}'
+        assert '# TYPE petshop_http_request_duration_seconds histogram' in texto
+        assert re.search(r'petshop_http_requests_total\{endpoint="agendamento.get_agendamentos",method="GET",status="200"\} \d+', texto)
+        assert f'petshop_http_request_duration_seconds_bucket{rotulos[:-1]},le="+Inf"}}' in texto
+        consultas = float(re.search(re.escape(f'petshop_sql_statements_sum{rotulos}') + r' (\S+)', texto).group(1))
+        assert consultas >= 3, consultas
+        print("✅ Latência, SQL e tamanho da resposta por endpoint em /metrics")
+
+    teste = Flask(__name__)
+    teste.config.update(SERVER_TIMING=True, METRICS_TOKEN='segredo')
+    init_metrics(teste)
+    teste.add_url_rule('/ping', 'ping', lambda: 'ok')
+    with teste.test_client() as c:
+        assert c.get('/ping').headers['Server-Timing'].startswith('app;dur=')
+        assert c.get('/metrics').status_code == 401
+        resposta = c.get('/metrics', headers={'Authorization': 'Bearer segredo'})
+        assert 'petshop_http_requests_total{endpoint="ping",method="GET",status="200"} 1' in resposta.get_data(as_text=True)
+    print("✅ Server-Timing e token de /metrics")
+
+# Orçamento de comandos SQL por rota GET (com os dados de src/model/database/app.db). Uma rota
+# nova precisa entrar aqui; um aumento é uma regressão a justificar.
+ORCAMENTOS_ROTAS = {
+    '/agendamentos': 3, '/agendamentos?cliente_id=1': 3, '/agendamentos/1': 3, '/agendamentos/1/editar': 6, '/agendamentos/novo': 3,
+    '/agendamentos/api/estatisticas': 2,
+    '/api': 0, '/api/agendamentos': 1, '/api/agendamentos?include=cliente,pet,servico,funcionario': 5,
+    '/api/agendamentos/1': 1, '/api/agendamentos/cliente/1': 1, '/api/agendamentos/funcionario/1': 1,
+    '/api/busca?q=rex': 1, '/api/clientes': 1, '/api/clientes/1': 1, '/api/clientes/1/pets': 3,
+    '/api/clientes/pets?ids=1,2': 1, '/api/disponibilidade?servico_id=1': 3,
+    '/api/export/agendamentos': 1, '/api/export/clientes': 1, '/api/export/pets': 1,
+    '/api/funcionarios': 2, '/api/funcionarios/1': 1, '/api/pets': 1, '/api/pets?include=cliente': 2,
+    '/api/pets/1': 1, '/api/pets/especies': 0, '/api/pets/sexos': 0,
+    '/api/servicos': 2, '/api/servicos/1': 1, '/api/servicos/categoria/Banho': 2,
+    '/api/users': 1, '/api/users/1': 1,
+    '/clientes': 2, '/clientes/1': 3, '/clientes/1/editar': 3, '/clientes/buscar': 0, '/clientes/novo': 0,
+    '/dashboard': 8,
+    '/funcionarios': 2, '/funcionarios/1': 2, '/funcionarios/1/editar': 2, '/funcionarios/buscar': 0,
+    '/funcionarios/novo': 0,
+    '/login': 0, '/metrics': 0, '/register': 0,
+    '/pets': 2, '/pets/1': 2, '/pets/1/editar': 2, '/pets/buscar': 0, '/pets/novo': 1,
+    '/servicos': 2, '/servicos/1': 3, '/servicos/1/editar': 3, '/servicos/api/estatisticas': 1, '/servicos/novo': 0,
+}
+
+def test_seed_deterministico():
+    """Testar o gerador de dados sintéticos: mesma semente, mesmos dados, e dados consistentes"""
+    import tempfile
+    from flask import Flask
+    from sqlalchemy import text
+    from src.model.engine import init_engine
+    from src.model.services.seed_service import SeedService
+
+    print("\n🌱 Testando gerador de dados sintéticos...")
+    escala = dict(clientes=60, pets_por_cliente=1.5, funcionarios=5, servicos=25, agendamentos=800, anos=1)
+    with tempfile.TemporaryDirectory() as pasta:
+        app_seed = Flask(__name__)
+        app_seed.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(pasta, 'seed.db')}",
+                               SQLITE_PRAGMAS={'foreign_keys': 'ON'})
+        db.init_app(app_seed)
+        init_engine(app_seed, db)
+        init_migrate(app_seed, db)
+        with app_seed.app_context():
+            copias = []
+            for _ in range(2):
+                totais = SeedService(7, date(2026, 1, 15)).gerar(**escala)
+                copias.append([db.session.execute(text(f'SELECT * FROM {tabela} ORDER BY id')).all()
+                               for tabela in totais])
+                db.session.remove()
+            assert copias[0] == copias[1], "Mesma semente deveria gerar os mesmos dados"
+            assert totais['agendamentos'] == 800 and totais['clientes'] == 60
+            print(f"✅ Mesma semente, mesmos dados: {totais}")
+
+            consulta = lambda sql: db.session.execute(text(sql)).scalar()
+            assert not db.session.execute(text('PRAGMA foreign_key_check')).all()
+            assert consulta('PRAGMA foreign_keys') == 1, "A conexão da carga não deve voltar ao pool"
+            assert consulta("SELECT count(*) FROM agendamentos a JOIN pets p ON p.id = a.pet_id "
+                            "WHERE p.cliente_id != a.cliente_id") == 0
+            assert consulta("SELECT count(*) FROM agendamentos WHERE strftime('%w', data_agendamento) = '0'") == 0
+            assert consulta("SELECT count(*) FROM agendamentos WHERE data_fim <= data_agendamento "
+                            "OR data_criacao > data_agendamento") == 0
+            assert consulta('SELECT sum(total) FROM agendamentos_por_status') == 800
+            assert consulta("SELECT count(*) FROM agendamentos "
+                            "WHERE data_agendamento >= '2026-01-15' AND status = 'Concluído'") == 0
+            print("✅ Donos, domingos, datas e contadores consistentes")
+            for engine in db.engines.values():
+                engine.dispose()
+
+def test_orcamento_rotas():
+    """Testar o orçamento de SQL de cada rota GET e a ausência de carregamentos N+1"""
+    from src.model.query_budget import count_queries
+
+    print("\n🧮 Testando orçamento de consultas das rotas...")
+    sem_orcamento = ('static', 'serve', 'auth_views.logout')
+    with app.test_request_context():
+        cobertas = {app.url_map.bind('localhost').match(url.split('?')[0])[0] for url in ORCAMENTOS_ROTAS}
+    rotas = {regra.endpoint for regra in app.url_map.iter_rules() if 'GET' in regra.methods}
+    faltando = rotas - cobertas - set(sem_orcamento)
+    assert not faltando, f"Rotas GET sem orçamento em ORCAMENTOS_ROTAS: {sorted(faltando)}"
+
+    with app.test_client() as c:
+        with c.session_transaction() as sessao:
+            sessao['logged_in'] = True
+        for url, maximo in ORCAMENTOS_ROTAS.items():
+            with count_queries(url, maximo) as contagem:
+                resposta = c.get(url)
+                resposta.get_data()  # consome as respostas em fluxo (exportações)
+            assert resposta.status_code == 200, (url, resposta.status_code)
+            assert not contagem.problemas(), contagem.relatorio()
+    print(f"✅ {len(ORCAMENTOS_ROTAS)} rotas dentro do orçamento, sem N+1")
+
+    with app.app_context():
+        with count_queries('pets com dono', maximo=1) as contagem:
+            donos = [pet.dono.nome for pet in Pet.query.all()]
+        if len(set(donos)) >= 2:
+            assert contagem.repetidos().get('Pet.dono', 0) >= 2 and contagem.problemas()
+            assert 'Pet.dono' in contagem.relatorio()
+        db.session.remove()
+    print("✅ Carregamento preguiçoso em laço (pet.dono) detectado como N+1")
+
+    # text() e INSERT em lote também passam pelo do_orm_execute (sem lazy_loaded_from)
+    from sqlalchemy import insert, text
+    with app.app_context():
+        with count_queries('sql textual e em lote') as contagem:
+            db.session.execute(text('SELECT count(*) FROM clientes')).scalar()
+            linhas = [{'nome': f'Serviço em Lote {i}', 'categoria': 'Outros', 'preco': 10.0} for i in range(3)]
+            ids = db.session.execute(insert(Servico).returning(Servico.id), linhas).scalars().all()
+        db.session.rollback()
+        db.session.remove()
+    assert len(ids) == 3 and contagem.total >= 2 and not contagem.problemas(), contagem.relatorio()
+    print("✅ text() e INSERT ... RETURNING contados sem erro")
+
 if __name__ == '__main__':
     test_models()
     test_api_routes()
+    test_busca_paginada()
+    test_paginacao_cursor()
+    test_autocomplete_prefixo()
+    test_conflito_horario()
+    test_disponibilidade_mapa()
+    test_recorrencia()
+    test_leitura_importacao()
+    test_exportacao_stream()
+    test_unit_of_work()
+    test_reativacao_cliente()
+    test_replica_leitura()
+    test_etag_condicional()
+    test_assets_compressao()
+    test_serializer_json()
+    test_listagem_dto()
+    test_fields_include()
+    test_multi_get_ids()
+    test_metricas()
+    test_seed_deterministico()
+    test_orcamento_rotas()
     print("\n✨ Sistema ERP Pet Shop testado com sucesso! ✨")
 